@@ -0,0 +1,133 @@
+"""
+Micro-batching Scheduler
+
+Coalesces concurrent parse requests into a single nlp.pipe() call. When the
+Electron app imports a folder of web sources it fires many /extract calls
+at once; parsing them together amortizes spaCy's per-call overhead and
+keeps the event loop free while the model runs in a background thread.
+
+Key Features:
+- A lone request is parsed immediately (no added latency when idle)
+- Requests arriving while a batch runs are collected into the next one
+- Once several are waiting, waits up to window_ms for more, up to
+  max_batch_size
+- Lower priority values are parsed first (interactive before bulk)
+- One parse thread, so the model is never run concurrently from two threads
+- Batch statistics for GET /metrics
+
+@version 1.0
+"""
+
+import asyncio
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+
+class MicroBatcher:
+    """
+    Collects texts from concurrent callers and parses them with nlp.pipe.
+
+    Must be created and used from within a running event loop (the queue
+    and consumer task belong to that loop). In pre-fork mode each worker
+    creates its own after forking.
+
+    Args:
+        nlp: Loaded spaCy model
+        window_ms: How long to wait for more requests once a batch has
+            more than one item
+        max_batch_size: Largest batch passed to nlp.pipe
+    """
+
+    def __init__(self, nlp, window_ms: float = 10.0, max_batch_size: int = 32):
+        self.nlp = nlp
+        self.window_s = max(0.0, window_ms) / 1000
+        self.max_batch_size = max(1, max_batch_size)
+
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._seq = itertools.count()  # FIFO within a priority
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='nlp-batch')
+        self._task: Optional[asyncio.Task] = None
+
+        self.batches = 0
+        self.docs = 0
+        self.largest_batch = 0
+
+    async def parse(self, text: str, priority: int = 0):
+        """
+        Parse one text, sharing an nlp.pipe call with concurrent callers.
+
+        Args:
+            text: Text to parse
+            priority: Queue priority; lower values are batched first
+        """
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._consume())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((priority, next(self._seq), text, future))
+        return await future
+
+    async def _collect(self) -> list:
+        batch = [await self._queue.get()]
+
+        # Whatever queued up while the previous batch ran
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+
+        # Only wait when there is evidence of concurrency; a lone request
+        # goes straight through
+        if len(batch) > 1 and self.window_s:
+            deadline = asyncio.get_running_loop().time() + self.window_s
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+        return batch
+
+    async def _consume(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+
+            # Callers that gave up (disconnected, cancelled) don't need parsing
+            batch = [(text, future) for _, _, text, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            texts = [text for text, _ in batch]
+            try:
+                docs = await loop.run_in_executor(self._executor, self._pipe, texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.docs += len(docs)
+            self.largest_batch = max(self.largest_batch, len(docs))
+
+            for (_, future), doc in zip(batch, docs):
+                if not future.done():
+                    future.set_result(doc)
+
+    def _pipe(self, texts: list[str]) -> list:
+        return list(self.nlp.pipe(texts, batch_size=len(texts)))
+
+    def stats(self) -> dict:
+        """Batch counters for GET /metrics."""
+        return {
+            'batches': self.batches,
+            'docs': self.docs,
+            'avg_batch_size': round(self.docs / self.batches, 2) if self.batches else 0.0,
+            'largest_batch': self.largest_batch,
+            'queue_depth': self._queue.qsize(),
+            'window_ms': self.window_s * 1000,
+            'max_batch_size': self.max_batch_size,
+        }
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Worst-case Fuzzing Benchmark for the False-Positive Patterns
+
+Builds adversarial inputs (long runs of digits, separators, times,
+ranges and unit words, plus random mixes of those tokens), runs every
+pattern in FALSE_POSITIVE_PATTERNS and the date grading regexes over
+them at several sizes, and reports the worst cost per KB for each
+pattern and backend. A worst ms/KB that grows with input size means
+super-linear matching: one such page can stall an import.
+
+Usage:
+    python bench_regex.py
+    python bench_regex.py --sizes 1 16 128 --random-inputs 200
+    python bench_regex.py --backends python --budget-ms-per-kb 5
+
+Output (one row per pattern and backend):
+    pattern  backend  engine  worst ms/KB  growth  worst input  parity
+
+`growth` is worst ms/KB at the largest size divided by the smallest
+(~1 for linear patterns). `parity` counts inputs where the re2 backend
+found different spans than Python (must be 0).
+
+Exits 1 if --budget-ms-per-kb is given and any pattern exceeds it.
+
+@version 1.0
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+
+from false_positive_patterns import (
+    APPROXIMATE_PATTERN,
+    DAY_PATTERN,
+    FALSE_POSITIVE_PATTERNS,
+    MONTH_PATTERN,
+    SENTENCE_TERMINATORS,
+)
+from regex_backend import HAS_RE2, compile_pattern
+
+# Building blocks the patterns care about
+TOKENS = [
+    '1', '12', '123', '1234', '12345', ' ', '  ', '\n', ':', ',', '.', '-', '$', '%', '#',
+    'x', 'X', '×', ' to ', 'am', 'pm', 'a.m.', ' on ', 'Jan', 'employees', 'ft', 'sq ft',
+    'v', 'version', 'route', 'room', 'years old', 'USD', 'A-', 'é',
+]
+
+# Repeated structures that make backtracking patterns retry at every position
+SEEDS = {
+    'digits': '9',
+    'long_space': '1' + ' ' * 64,
+    'digit_space': '1 ',
+    'range': '1 to ',
+    'dash_range': '1 - 1 ',
+    'commas': '1,',
+    'decimal': '1.',
+    'times': '12:34 ',
+    'times_seconds_on': '12:34:56 on 1',
+    'time_range': '12:34 am - ',
+    'currency': '$,',
+    'measure': '1 1.1 ',
+    'dimensions': '1 x 1 x ',
+    'version': 'v1.',
+    'model': 'AB-1',
+    'percent': '1.1 %',
+}
+
+
+def make_input(unit: str, size: int) -> str:
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+def random_input(rng: random.Random, size: int) -> str:
+    parts = []
+    length = 0
+    while length < size:
+        token = rng.choice(TOKENS)
+        parts.append(token)
+        length += len(token)
+    return ''.join(parts)[:size]
+
+
+def time_finditer(pattern, text: str, repeat: int) -> float:
+    """Best-of-repeat seconds for a full finditer pass."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in pattern.finditer(text):
+            pass
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def spans(pattern, text: str) -> list[tuple[int, int]]:
+    return [(m.start(), m.end()) for m in pattern.finditer(text)]
+
+
+def build_inputs(sizes_kb: list[int], random_count: int, seed: int) -> dict[int, list[tuple[str, str]]]:
+    rng = random.Random(seed)
+    inputs = {}
+    for size_kb in sizes_kb:
+        size = size_kb * 1024
+        named = [(name, make_input(unit, size)) for name, unit in SEEDS.items()]
+        named += [(f'random#{i}', random_input(rng, size)) for i in range(random_count)]
+        inputs[size_kb] = named
+    return inputs
+
+
+def bench_pattern(name: str, compiled, inputs: dict, repeat: int) -> dict:
+    worst = {}
+    worst_input = ''
+    for size_kb, named in inputs.items():
+        worst[size_kb] = 0.0
+        for input_name, text in named:
+            ms_per_kb = time_finditer(compiled, text, repeat) * 1000 / size_kb
+            if ms_per_kb > worst[size_kb]:
+                worst[size_kb] = ms_per_kb
+                if size_kb == max(inputs):
+                    worst_input = input_name
+    sizes = sorted(worst)
+    smallest = worst[sizes[0]] or 1e-9
+    return {
+        'name': name,
+        'worst': max(worst.values()),
+        'growth': worst[sizes[-1]] / smallest,
+        'worst_input': worst_input,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fuzz the false-positive patterns for worst-case cost')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 8, 64], help='Input sizes in KB')
+    parser.add_argument('--random-inputs', type=int, default=50, help='Random token mixes per size')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repeats (best is kept)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--backends', nargs='+', choices=['python', 're2'],
+                        default=['python', 're2'] if HAS_RE2 else ['python'])
+    parser.add_argument('--budget-ms-per-kb', type=float, help='Fail if any pattern exceeds this')
+    args = parser.parse_args()
+
+    if 're2' in args.backends and not HAS_RE2:
+        parser.error("re2 backend needs google-re2: pip install google-re2")
+
+    inputs = build_inputs(sorted(args.sizes), args.random_inputs, args.seed)
+    parity_inputs = [text for named in inputs.values() for _, text in named]
+
+    rows = []
+    for pattern, reason in FALSE_POSITIVE_PATTERNS:
+        python = compile_pattern(pattern, re.IGNORECASE, 'python')
+        for backend in args.backends:
+            compiled = python if backend == 'python' else compile_pattern(pattern, re.IGNORECASE, 're2')
+            row = bench_pattern(reason, compiled, inputs, args.repeat)
+            row['backend'] = backend
+            row['engine'] = compiled.engine
+            row['parity'] = '-' if backend == 'python' else sum(
+                spans(compiled, text) != spans(python, text) for text in parity_inputs)
+            rows.append(row)
+            print(f"  {reason} [{backend}] done", file=sys.stderr, flush=True)
+
+    # Grading regexes run on dateparser's short matches, but check them anyway
+    for name, compiled in (('date_day', DAY_PATTERN), ('date_month', MONTH_PATTERN),
+                           ('date_approximate', APPROXIMATE_PATTERN),
+                           ('sentence_terminators', SENTENCE_TERMINATORS)):
+        row = bench_pattern(name, compiled, inputs, args.repeat)
+        row.update(backend='python', engine='python', parity='-')
+        rows.append(row)
+
+    print(f"\n{'pattern':<22} {'backend':<7} {'engine':<9} {'worst ms/KB':>11} {'growth':>7} "
+          f"{'worst input':<18} {'parity':>6}")
+    for row in rows:
+        print(f"{row['name']:<22} {row['backend']:<7} {row['engine']:<9} {row['worst']:>11.4f} "
+              f"{row['growth']:>7.2f} {row['worst_input']:<18} {row['parity']:>6}")
+
+    failed = False
+    if args.budget_ms_per_kb is not None:
+        over = [row for row in rows if row['worst'] > args.budget_ms_per_kb]
+        for row in over:
+            print(f"OVER BUDGET: {row['name']} [{row['backend']}] {row['worst']:.4f} ms/KB")
+        failed = bool(over)
+    if any(isinstance(row['parity'], int) and row['parity'] for row in rows):
+        print("PARITY MISMATCH: re2 results differ from Python")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Pre-fork Scaling Benchmark for the spaCy Extraction Service
+
+Starts the service with each requested worker count, drives /extract with
+parallel clients for a fixed time, and reports throughput, latency, how
+evenly requests were spread over the workers, and memory from
+GET /workers. Shows whether throughput scales with cores without N x the
+memory.
+
+Usage:
+    python bench_workers.py --workers 1 2 4 --seconds 30
+    python bench_workers.py --corpus ./corpus --concurrency 16
+
+Output (one row per worker count):
+    workers  req/s  speedup  p50 ms  p95 ms  spread  total RSS  total private
+
+`spread` is min/max requests per worker (1.0 = perfectly even).
+
+Stdlib only, so it runs outside the service's venv.
+
+@version 1.0
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+SAMPLE_TEXT = (
+    "The Hudson River State Hospital was built in 1871 and designed by architect "
+    "Frederick Clarke Withers. It opened on October 1, 1871 with 110 to 130 patients. "
+    "The main building was abandoned in 2003 after the state of New York closed it, "
+    "and Empire State Development sold the site in 2013."
+)
+
+
+def load_texts(corpus) -> list[str]:
+    if corpus is None:
+        return [SAMPLE_TEXT]
+    texts = [p.read_text(encoding='utf-8', errors='replace') for p in sorted(corpus.rglob('*.txt'))]
+    return [t for t in texts if t.strip()] or [SAMPLE_TEXT]
+
+
+def request(url: str, payload=None, timeout: float = 120.0) -> dict:
+    data = json.dumps(payload).encode('utf-8') if payload is not None else None
+    req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def wait_healthy(base_url: str, proc: subprocess.Popen, timeout: float) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"service exited with {proc.returncode}")
+        try:
+            request(base_url + '/health', timeout=2)
+            return
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.5)
+    raise RuntimeError("service did not become healthy")
+
+
+def drive(base_url: str, texts: list[str], concurrency: int, seconds: float) -> tuple[list[float], int]:
+    """Run /extract from `concurrency` threads; returns latencies (ms) and errors."""
+    latencies: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+    stop_at = time.time() + seconds
+
+    def client(offset: int):
+        nonlocal errors
+        i = offset
+        while time.time() < stop_at:
+            text = texts[i % len(texts)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                request(base_url + '/extract', {'text': text})
+                elapsed = (time.perf_counter() - start) * 1000
+                with lock:
+                    latencies.append(elapsed)
+            except (urllib.error.URLError, OSError, ValueError):
+                with lock:
+                    errors += 1
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors
+
+
+def run_one(args, workers: int, port: int, texts: list[str]) -> dict:
+    base_url = f'http://127.0.0.1:{port}'
+    proc = subprocess.Popen(
+        [sys.executable, str(args.service), '--port', str(port), '--workers', str(workers)],
+        cwd=args.service.parent,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_healthy(base_url, proc, args.startup_timeout)
+        # Warm every worker before timing
+        drive(base_url, texts, args.concurrency, 2.0)
+        before = {w['pid']: w['requests'] for w in request(base_url + '/workers')['workers']}
+
+        latencies, errors = drive(base_url, texts, args.concurrency, args.seconds)
+        stats = request(base_url + '/workers')
+
+        served = [w['requests'] - before.get(w['pid'], 0) for w in stats['workers']]
+        latencies.sort()
+        return {
+            'workers': workers,
+            'rps': len(latencies) / args.seconds,
+            'p50': statistics.median(latencies) if latencies else 0.0,
+            'p95': latencies[int(len(latencies) * 0.95)] if latencies else 0.0,
+            'spread': (min(served) / max(served)) if served and max(served) else 0.0,
+            'errors': errors,
+            'total_rss_mb': stats['total_rss_mb'],
+            'total_private_mb': stats.get('total_private_mb', 0),
+        }
+    finally:
+        try:
+            request(base_url + '/shutdown', {}, timeout=5)
+        except (urllib.error.URLError, OSError):
+            pass
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pre-fork worker scaling')
+    parser.add_argument('--service', type=Path, default=Path(__file__).resolve().parent / 'main.py',
+                        help='Service entry point')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help='Worker counts to try')
+    parser.add_argument('--concurrency', type=int, default=8, help='Parallel client threads')
+    parser.add_argument('--seconds', type=float, default=20.0, help='Measured seconds per worker count')
+    parser.add_argument('--corpus', type=Path, help='Directory of .txt documents (default: built-in sample)')
+    parser.add_argument('--port', type=int, default=8290, help='Port to run the service on')
+    parser.add_argument('--startup-timeout', type=float, default=180.0, help='Seconds to wait for model load')
+    args = parser.parse_args()
+
+    texts = load_texts(args.corpus)
+    results = []
+    for workers in args.workers:
+        print(f"Running with {workers} worker(s)...", flush=True)
+        results.append(run_one(args, workers, args.port, texts))
+
+    base = results[0]['rps'] or 1.0
+    print(f"\n{'workers':>7} {'req/s':>8} {'speedup':>7} {'p50 ms':>7} {'p95 ms':>7} "
+          f"{'spread':>6} {'errors':>6} {'RSS MB':>8} {'private MB':>10}")
+    for r in results:
+        print(f"{r['workers']:>7} {r['rps']:>8.1f} {r['rps'] / base:>7.2f} {r['p50']:>7.1f} "
+              f"{r['p95']:>7.1f} {r['spread']:>6.2f} {r['errors']:>6} {r['total_rss_mb']:>8.1f} "
+              f"{r['total_private_mb']:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
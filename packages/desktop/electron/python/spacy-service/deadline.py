@@ -0,0 +1,141 @@
+"""
+Request Deadlines and Cooperative Cancellation
+
+A pathological page can keep dateparser or the regex prefilter busy long
+after the Electron caller has given up. A Deadline is passed through the
+extraction stages, which check it between stages and between chunks and
+stop early, so the response can report a partial result instead of
+running to completion.
+
+Key Features:
+- Optional time budget per request (deadlineMs); no budget = never expires
+- Result status: 'complete', 'partial' or 'timed_out'
+- offload() runs a CPU stage in a thread; if the awaiting task is
+  cancelled (client gone) the deadline is cancelled too, so the stage
+  stops at its next check
+- cancel_on_disconnect() stops waiting for work once the client has gone
+
+Checks are cooperative: a single dateparser call or regex scan is not
+interrupted, only the work after it is skipped.
+
+@version 1.0
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+STATUS_COMPLETE = 'complete'
+STATUS_PARTIAL = 'partial'
+STATUS_TIMED_OUT = 'timed_out'
+
+# How often a waiting request checks whether its client is still there
+DISCONNECT_POLL_S = 0.25
+
+
+class ClientDisconnected(Exception):
+    """The HTTP client went away before the response was ready."""
+
+
+class Deadline:
+    """
+    Time budget and cancel flag for one request.
+
+    Args:
+        timeout_ms: Budget in milliseconds from now, or None for no limit
+    """
+
+    def __init__(self, timeout_ms: Optional[float] = None):
+        self.expires_at = time.monotonic() + timeout_ms / 1000 if timeout_ms is not None else None
+        self.hit = False
+        self.cancelled = False
+
+    @property
+    def enabled(self) -> bool:
+        """Whether this request has a time budget at all."""
+        return self.expires_at is not None
+
+    def expired(self) -> bool:
+        """Check the deadline; remembers that it was hit (see status())."""
+        if self.cancelled or (self.expires_at is not None and time.monotonic() >= self.expires_at):
+            self.hit = True
+        return self.hit
+
+    def remaining_s(self) -> Optional[float]:
+        """Seconds left, or None when there is no limit."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def cancel(self):
+        """Expire now; nobody is waiting for the result any more."""
+        self.cancelled = True
+
+    async def offload(self, fn: Callable[..., Any], *args) -> Any:
+        """
+        Run a blocking stage in a worker thread.
+
+        Keeps the event loop free (so disconnects are noticed) and cancels
+        the deadline if the awaiting task is cancelled, which the stage
+        sees at its next expired() check.
+        """
+        try:
+            return await asyncio.to_thread(fn, *args)
+        except asyncio.CancelledError:
+            self.cancel()
+            raise
+
+    async def run(self, work: Awaitable[Any]) -> Optional[Any]:
+        """
+        Await work within the remaining budget.
+
+        Returns:
+            The work's result, or None if the deadline passed first (the
+            work is cancelled)
+        """
+        if self.expires_at is None:
+            return await work
+        try:
+            return await asyncio.wait_for(work, self.remaining_s())
+        except asyncio.TimeoutError:
+            self.hit = True
+            return None
+
+    def status(self, started: bool = True) -> str:
+        """
+        Result status for the response.
+
+        Args:
+            started: Whether any extraction results were produced
+        """
+        if not self.hit:
+            return STATUS_COMPLETE
+        return STATUS_PARTIAL if started else STATUS_TIMED_OUT
+
+
+async def cancel_on_disconnect(request, work: Awaitable[Any], poll_s: float = DISCONNECT_POLL_S) -> Any:
+    """
+    Await work, cancelling it if the HTTP client disconnects first.
+
+    Args:
+        request: Starlette request of the caller
+        work: Awaitable producing the response
+
+    Returns:
+        The work's result
+
+    Raises:
+        ClientDisconnected: The client disconnected (work was cancelled)
+    """
+    task = asyncio.ensure_future(work)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_s)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                raise ClientDisconnected()
+    finally:
+        if not task.done():
+            task.cancel()
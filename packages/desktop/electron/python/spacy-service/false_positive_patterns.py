@@ -0,0 +1,123 @@
+"""
+False Positive Patterns for Date Pre-filtering
+
+Patterns masked out of the text BEFORE dateparser sees it (numeric
+ranges, measurements, counts, currency, times, ...), plus the small
+regexes extract_dates() uses to grade what dateparser found.
+Used by main.py; bench_regex.py fuzzes them for worst-case cost.
+
+@version 1.0
+"""
+
+import re
+
+from regex_backend import DEFAULT_BACKEND, compile_pattern
+
+# =============================================================================
+# FALSE POSITIVE PATTERNS (CRITICAL)
+# =============================================================================
+
+FALSE_POSITIVE_PATTERNS = [
+    # Numeric ranges (THE problem case: "110 to 130 employees")
+    (r'\b(\d{1,3})\s+to\s+(\d{1,3})\b', 'numeric_range'),
+
+    # Dashed ranges with unit context
+    (r'\b\d{1,3}\s*-\s*\d{1,3}(?=\s*(?:employees?|workers?|people|persons?|staff|members?|units?|rooms?|beds?|floors?|stories))', 'range_with_unit'),
+
+    # Formatted numbers with commas
+    (r'\b\d{1,3}(?:,\d{3})+\b', 'formatted_number'),
+
+    # Measurements - distance
+    (r'\b\d+(?:\.\d+)?\s*(?:feet|foot|ft|meters?|m|inches?|in|yards?|yd|miles?|mi|km|kilometers?)\b', 'measurement_distance'),
+
+    # Measurements - weight
+    (r'\b\d+(?:\.\d+)?\s*(?:pounds?|lbs?|ounces?|oz|kilograms?|kg|grams?|g|tons?)\b', 'measurement_weight'),
+
+    # Measurements - area
+    (r'\b\d+(?:\.\d+)?\s*(?:acres?|hectares?|ha|sqft|sq\s*ft|square\s*feet|square\s*meters?|sq\s*m)\b', 'measurement_area'),
+
+    # Counts - people
+    (r'\b\d+\s*(?:employees?|workers?|people|persons?|staff|members?|residents?|students?|patients?|visitors?)\b', 'count_people'),
+
+    # Counts - objects
+    (r'\b\d+\s*(?:units?|rooms?|beds?|floors?|stories|buildings?|houses?|apartments?|cars?|vehicles?)\b', 'count_objects'),
+
+    # Currency - dollar sign
+    (r'\$\s*[\d,]+(?:\.\d{2})?', 'currency_dollar'),
+
+    # Currency - words
+    (r'\b\d+(?:,\d{3})*\s*(?:dollars?|cents?|bucks?|USD|EUR|GBP)\b', 'currency_word'),
+
+    # Times (without date context)
+    (r'\b\d{1,2}:\d{2}(?::\d{2})?\s*(?:am|pm|AM|PM|a\.m\.|p\.m\.)?(?!\s*(?:on|,)\s*(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|\d{1,2}))', 'time'),
+
+    # Time ranges
+    (r'\b\d{1,2}:\d{2}\s*(?:am|pm|AM|PM|a\.m\.|p\.m\.)?\s*(?:to|-)\s*\d{1,2}(?::\d{2})?\s*(?:am|pm|AM|PM|a\.m\.|p\.m\.)?', 'time_range'),
+
+    # Phone numbers
+    (r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b', 'phone_number'),
+    (r'\(\d{3}\)\s*\d{3}[-.\s]?\d{4}', 'phone_number'),
+
+    # Route/Highway numbers
+    (r'\b(?:route|rt|rte|hwy|highway|interstate|i-|us-|sr-|state\s+route)\s*#?\s*\d+\b', 'route_number'),
+
+    # Building identifiers
+    (r'\b(?:room|rm|building|bldg|suite|ste|apt|apartment|unit|floor|fl|lot|parcel)\s*#?\s*\d+\b', 'building_id'),
+
+    # Percentages
+    (r'\b\d+(?:\.\d+)?\s*%', 'percentage'),
+
+    # Hashtags
+    (r'#\d+\b', 'hashtag'),
+
+    # Coordinates (high precision decimals)
+    (r'-?\d{1,3}\.\d{4,}', 'coordinate'),
+
+    # Age references
+    (r'\b\d+\s*(?:years?\s+old|year-old|-year-old|yo)\b', 'age'),
+
+    # Version numbers
+    (r'\bv(?:ersion)?\s*\d+(?:\.\d+)*\b', 'version'),
+
+    # Model numbers (alphanumeric)
+    (r'\b[A-Z]{1,3}-?\d{3,}\b', 'model_number'),
+
+    # ZIP codes (9-digit)
+    (r'\b\d{5}-\d{4}\b', 'zipcode'),
+
+    # Dimensions (LxWxH)
+    (r'\b\d+\s*[xX×]\s*\d+(?:\s*[xX×]\s*\d+)?\b', 'dimensions'),
+]
+
+# =============================================================================
+# DATE GRADING PATTERNS
+# =============================================================================
+
+# Run on dateparser's short raw matches, so always stdlib re
+DAY_PATTERN = re.compile(r'\b\d{1,2}(?:st|nd|rd|th)?\b')
+
+MONTH_PATTERN = re.compile(
+    r'\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec|january|february|march|april|june|july|august|september|october|november|december)\b'
+)
+
+APPROXIMATE_PATTERN = re.compile(
+    r'\b(circa|c\.|ca\.|around|about|approximately|roughly|late|early|mid)\b'
+)
+
+SENTENCE_TERMINATORS = re.compile(r'[.!?]\s+|[\n\r]{2,}')
+
+
+def compile_false_positive_patterns(backend: str = DEFAULT_BACKEND) -> list[tuple]:
+    """
+    Compile FALSE_POSITIVE_PATTERNS for a regex backend.
+
+    Args:
+        backend: 'python' or 're2' (see regex_backend.py)
+
+    Returns:
+        List of (compiled pattern, reason)
+    """
+    return [
+        (compile_pattern(pattern, re.IGNORECASE, backend), reason)
+        for pattern, reason in FALSE_POSITIVE_PATTERNS
+    ]
@@ -0,0 +1,232 @@
+"""
+Keyword Matchers
+
+Role, type and relationship inference asks "which is the first category
+(in table order) with any keyword occurring in this text?". With nested
+`any(kw in text ...)` loops that is one pass over the text per keyword,
+repeated for every entity mention. A KeywordMatcher compiles a keyword
+table once into an Aho-Corasick automaton and answers in a single scan.
+
+Key Features:
+- Plain substring semantics, same as `kw in text.lower()` ('inc' still
+  matches inside 'since')
+- First-match-wins priority: categories are ranked by table order
+- One scan per text; stops early once the top category is seen
+- rank_joined() for "context + ' ' + name" without rescanning the context
+- TokenWindowMatcher: the same answer for many token windows of a Doc at
+  once, from NumPy prefix sums over doc.to_array() lowercase hashes
+- Without pyahocorasick, falls back to per-category substring checks
+  (stdlib `in` is faster than any pure-Python multi-pattern scan)
+
+Install the optional automaton with: pip install pyahocorasick
+
+@version 1.0
+"""
+
+from typing import Optional
+
+import numpy as np
+from spacy.attrs import IS_PUNCT, IS_SPACE, LOWER, SPACY
+
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+# Default for rank_joined(left_rank=...): left has not been scanned yet
+NOT_SCANNED = object()
+
+
+class KeywordMatcher:
+    """
+    Multi-pattern matcher over an ordered {category: [keywords]} table.
+
+    The automaton reports every keyword occurrence, overlapping ones
+    included, each tagged with the best (lowest) category index using that
+    keyword; the lowest index seen is exactly the category the nested
+    any() loops would have returned.
+
+    Args:
+        table: Categories in priority order, each with lowercase keywords
+        use_automaton: Use pyahocorasick when installed
+    """
+
+    def __init__(self, table: dict[str, list[str]], use_automaton: bool = True):
+        self.categories = list(table)
+        self._keywords = [list(keywords) for keywords in table.values()]
+        self.longest = max((len(kw) for kws in self._keywords for kw in kws), default=0)
+        self._automaton = None
+
+        if use_automaton and HAS_AHOCORASICK and self.longest:
+            automaton = ahocorasick.Automaton()
+            for index, keywords in enumerate(self._keywords):
+                for keyword in keywords:
+                    if keyword not in automaton:
+                        automaton.add_word(keyword, index)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def rank(self, text: str) -> Optional[int]:
+        """
+        Priority index of the first category with a keyword in text.
+
+        Args:
+            text: Text to scan (lowercased here)
+
+        Returns:
+            Index into categories, or None when no keyword occurs
+        """
+        text = text.lower()
+        if self._automaton is None:
+            for index, keywords in enumerate(self._keywords):
+                if any(kw in text for kw in keywords):
+                    return index
+            return None
+
+        best = None
+        for _, index in self._automaton.iter(text):
+            if best is None or index < best:
+                best = index
+                if best == 0:
+                    break
+        return best
+
+    def rank_joined(self, left: str, right: str, sep: str = ' ', left_rank=NOT_SCANNED) -> Optional[int]:
+        """
+        rank(left + sep + right), reusing left's rank when already known.
+
+        Only the seam (the ends of left and right around sep) is scanned
+        in addition to right, so a long shared context is scanned once.
+        """
+        if left_rank is NOT_SCANNED:
+            left_rank = self.rank(left)
+        edge = max(self.longest - 1, 0)
+        seam = (left[-edge:] if edge else '') + sep + right[:edge]
+        ranks = [r for r in (left_rank, self.rank(right), self.rank(seam)) if r is not None]
+        return min(ranks) if ranks else None
+
+    def category(self, rank: Optional[int]) -> Optional[str]:
+        """Category name for a rank (None stays None)."""
+        return None if rank is None else self.categories[rank]
+
+    def first(self, text: str) -> Optional[str]:
+        """First category (table order) with a keyword in text."""
+        return self.category(self.rank(text))
+
+
+# =============================================================================
+# TOKEN WINDOWS
+# =============================================================================
+#
+# extract_people/extract_organizations look for keywords in a +/-10 token
+# window around every entity. Instead of building and scanning a string per
+# entity, each distinct lowercase token (by hash) is ranked once, and window
+# results come from prefix sums over the doc's token array.
+
+class TokenWindowMatcher:
+    """
+    First category with a keyword in doc[start:end].text, for many windows.
+
+    Same answer as KeywordMatcher.first(doc[start:end].text): a keyword
+    either lies inside one token (looked up per lowercase hash) or runs
+    across tokens glued together without whitespace ("can" + "not"),
+    which are found per glued run. Keywords must be alphanumeric, so they
+    never span whitespace or punctuation tokens.
+
+    Args:
+        table: Categories in priority order, each with lowercase keywords
+        max_cached_tokens: Token ranks kept before the cache is reset
+    """
+
+    def __init__(self, table: dict[str, list[str]], max_cached_tokens: int = 200_000):
+        for keywords in table.values():
+            for keyword in keywords:
+                if not keyword.isalnum():
+                    raise ValueError(f"Token window keywords must be alphanumeric, got '{keyword}'")
+        self.matcher = KeywordMatcher(table)
+        self.none_rank = len(self.matcher.categories)
+        self.max_cached_tokens = max_cached_tokens
+        self._token_ranks: dict[int, int] = {}
+
+    def _rank_tokens(self, doc, lower: np.ndarray) -> np.ndarray:
+        """Best category rank of each token on its own (none_rank if none)."""
+        unique, inverse = np.unique(lower, return_inverse=True)
+        if len(self._token_ranks) > self.max_cached_tokens:
+            self._token_ranks.clear()
+        ranks = np.empty(len(unique), dtype=np.int64)
+        for i, key in enumerate(unique.tolist()):
+            rank = self._token_ranks.get(key)
+            if rank is None:
+                found = self.matcher.rank(doc.vocab.strings[key])
+                rank = self._token_ranks[key] = self.none_rank if found is None else found
+            ranks[i] = rank
+        return ranks[inverse]
+
+    def _glued_matches(self, doc, glued: np.ndarray) -> list[tuple[int, int, int]]:
+        """(first_token, last_token, rank) of keywords running across glued tokens."""
+        matches = []
+        boundaries = np.flatnonzero(glued)
+        i = 0
+        while i < len(boundaries):
+            # Chain of consecutive glued boundaries: tokens first..last
+            first = last = int(boundaries[i])
+            while i < len(boundaries) and boundaries[i] == last:
+                last += 1
+                i += 1
+            texts = [doc[t].lower_ for t in range(first, last + 1)]
+            ends = np.cumsum([len(t) for t in texts])
+            run = ''.join(texts)
+            for rank, keywords in enumerate(self.matcher._keywords):
+                for keyword in keywords:
+                    pos = run.find(keyword)
+                    while pos != -1:
+                        start_tok = int(np.searchsorted(ends, pos, side='right'))
+                        end_tok = int(np.searchsorted(ends, pos + len(keyword) - 1, side='right'))
+                        if end_tok > start_tok:
+                            matches.append((first + start_tok, first + end_tok, rank))
+                        pos = run.find(keyword, pos + 1)
+        return matches
+
+    def window_ranks(self, doc, starts, ends) -> np.ndarray:
+        """
+        Category rank for each window doc[starts[i]:ends[i]].
+
+        Args:
+            doc: spaCy Doc
+            starts: Window start token indices
+            ends: Window end token indices (exclusive)
+
+        Returns:
+            int array, -1 where no keyword occurs
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        if len(doc) == 0 or len(starts) == 0:
+            return np.full(len(starts), -1, dtype=np.int64)
+
+        attrs = doc.to_array([LOWER, SPACY, IS_PUNCT, IS_SPACE])
+        lower = attrs[:, 0]
+        token_ranks = self._rank_tokens(doc, lower)
+
+        # Per category, how many tokens up to each index rank there
+        categories = np.arange(self.none_rank)[:, None]
+        counts = np.zeros((self.none_rank, len(doc) + 1), dtype=np.int64)
+        np.cumsum(token_ranks[None, :] == categories, axis=1, out=counts[:, 1:])
+        present = (counts[:, ends] - counts[:, starts]) > 0
+        ranks = np.where(present.any(axis=0), present.argmax(axis=0), self.none_rank)
+
+        # Boundary i is glued when token i has no trailing space and neither
+        # side is punctuation or whitespace
+        wordlike = (attrs[:, 2] == 0) & (attrs[:, 3] == 0)
+        glued = (attrs[:-1, 1] == 0) & wordlike[:-1] & wordlike[1:]
+        for first, last, rank in self._glued_matches(doc, glued):
+            inside = (starts <= first) & (ends > last)
+            ranks = np.where(inside, np.minimum(ranks, rank), ranks)
+
+        return np.where(ranks == self.none_rank, -1, ranks)
+
+    def categories(self, doc, starts, ends) -> list[Optional[str]]:
+        """Category name (or None) for each window, see window_ranks()."""
+        return [None if rank < 0 else self.matcher.categories[rank]
+                for rank in self.window_ranks(doc, starts, ends).tolist()]
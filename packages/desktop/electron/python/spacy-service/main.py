@@ -18,26 +18,81 @@ Install requirements:
 Run standalone:
     python main.py --port 8234
 
+Pre-fork mode (N workers sharing one copy of the model, see prefork.py):
+    python main.py --port 8234 --workers 4
+
+Worker recycling for long sessions (bounded memory growth):
+    python main.py --port 8234 --max-requests 5000 --max-rss-mb 1500
+
+Micro-batching of concurrent requests into one nlp.pipe call (see batcher.py):
+    python main.py --port 8234 --batch-window-ms 10 --max-batch-size 32
+
+Per-request time budgets: send "deadlineMs": 5000 and check the response
+"status" ('complete', 'partial' or 'timed_out'), see deadline.py.
+
+Linear-time matching for the false-positive patterns (see regex_backend.py):
+    python main.py --port 8234 --regex-backend re2
+
+Near-duplicate detection across documents (see near_duplicates.py); send
+"documentId" (and "reuseDuplicates": true to reuse the original's results):
+    python main.py --port 8234 --near-duplicate-index ~/.cache/near-duplicates.json
+
+Priority lanes (see scheduler.py); requests send "priority": "bulk" or an
+X-Priority: bulk header, the default is interactive:
+    python main.py --port 8234 --interactive-limit 8 --bulk-limit 4 --bulk-aging-s 5
+
+Document sessions (see sessions.py): POST /documents parses once, then
+/documents/{id}/preprocess, /llm-context, /entities and /dates reuse it:
+    python main.py --port 8234 --session-ttl-s 600 --session-max-mb 256
+
 @version 1.0
 """
 
 import argparse
+import asyncio
+import os
 import re
 import sys
 import time
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Literal, Optional
 
 import dateparser
 import dateparser.search  # Explicit import needed for search_dates
 import spacy
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Request
+from fastapi.responses import Response
 from pydantic import BaseModel
 
 # Import preprocessing modules
 from verb_patterns import find_verbs_in_text, get_verb_category, get_all_categories
-from preprocessor import preprocess_text, build_llm_context
+from preprocessor import (
+    build_llm_context,
+    build_llm_context_for_budget,
+    estimate_tokens,
+    normalize_name,
+    preprocess_text,
+    sentence_memo,
+)
+from false_positive_patterns import (
+    APPROXIMATE_PATTERN,
+    DAY_PATTERN,
+    FALSE_POSITIVE_PATTERNS,
+    MONTH_PATTERN,
+    SENTENCE_TERMINATORS,
+    compile_false_positive_patterns,
+)
+from regex_backend import BACKENDS, DEFAULT_BACKEND, HAS_RE2
+from batcher import MicroBatcher
+from singleflight import SingleFlight, make_key
+from scheduler import DEFAULT_LANE, LANES, PriorityScheduler
+from deadline import ClientDisconnected, Deadline, STATUS_COMPLETE, cancel_on_disconnect
+from near_duplicates import DEFAULT_THRESHOLD, NearDuplicateIndex, ResultCache, minhash_signature
+from keyword_matcher import TokenWindowMatcher
+from sessions import DEFAULT_MAX_BYTES, DEFAULT_MAX_SESSIONS, DEFAULT_TTL_S, Session, SessionStore
+import prefork
 
 # =============================================================================
 # MODELS
@@ -47,6 +102,15 @@ class ExtractionRequest(BaseModel):
     text: str
     articleDate: Optional[str] = None
     extractTypes: list[str] = ["dates", "people", "organizations", "locations"]
+    priority: Optional[Literal['interactive', 'bulk']] = None
+    deadlineMs: Optional[float] = None
+    documentId: Optional[str] = None
+    reuseDuplicates: bool = False
+
+class NearDuplicate(BaseModel):
+    documentId: str
+    similarity: float
+    reused: bool = False
 
 class ExtractedDate(BaseModel):
     rawText: str
@@ -86,12 +150,41 @@ class ExtractionResponse(BaseModel):
     locations: list[ExtractedLocation]
     maskedPatterns: list[MaskedPattern]
     processingTimeMs: float
+    status: str = STATUS_COMPLETE
+    nearDuplicateOf: Optional[NearDuplicate] = None
 
 class HealthResponse(BaseModel):
     status: str
     model: str
     version: str
 
+class MetricsResponse(BaseModel):
+    pid: int
+    batcher: Optional[dict]
+    singleflight: dict
+    scheduler: Optional[dict]
+    near_duplicates: dict
+    sentence_cache: dict
+    name_cache: dict
+    sessions: dict
+
+class WorkerStats(BaseModel):
+    pid: int
+    index: int
+    rss_mb: float
+    shared_mb: float
+    private_mb: float
+    requests: int
+    uptime_s: float
+
+class WorkersResponse(BaseModel):
+    mode: str
+    parent_pid: Optional[int]
+    current_pid: int
+    workers: list[WorkerStats]
+    total_rss_mb: float
+    total_private_mb: float
+
 
 # =============================================================================
 # PREPROCESSING MODELS
@@ -101,6 +194,12 @@ class PreprocessRequest(BaseModel):
     text: str
     articleDate: Optional[str] = None
     maxSentences: int = 20
+    maxTokens: Optional[int] = None
+    dedupeThreshold: Optional[float] = None
+    documentId: Optional[str] = None
+    reuseDuplicates: bool = False
+    priority: Optional[Literal['interactive', 'bulk']] = None
+    deadlineMs: Optional[float] = None
 
 
 class VerbMatch(BaseModel):
@@ -126,6 +225,7 @@ class PreprocessedSentence(BaseModel):
     has_date: bool
     has_person: bool
     has_org: bool
+    duplicate_of: Optional[int] = None
 
 
 class ProfileCandidate(BaseModel):
@@ -147,6 +247,7 @@ class DocumentStats(BaseModel):
     profile_relevant: int
     total_people: int
     total_organizations: int
+    duplicate_sentences: int = 0
 
 
 class PreprocessResponse(BaseModel):
@@ -155,85 +256,79 @@ class PreprocessResponse(BaseModel):
     timeline_candidates: list[PreprocessedSentence]
     profile_candidates: dict
     llm_context: str
+    llm_context_tokens: int
     article_date: Optional[str]
     processing_time_ms: float
+    status: str = STATUS_COMPLETE
+    near_duplicate_of: Optional[NearDuplicate] = None
 
 
-# =============================================================================
-# FALSE POSITIVE PATTERNS (CRITICAL)
-# =============================================================================
-
-FALSE_POSITIVE_PATTERNS = [
-    # Numeric ranges (THE problem case: "110 to 130 employees")
-    (r'\b(\d{1,3})\s+to\s+(\d{1,3})\b', 'numeric_range'),
-
-    # Dashed ranges with unit context
-    (r'\b\d{1,3}\s*-\s*\d{1,3}(?=\s*(?:employees?|workers?|people|persons?|staff|members?|units?|rooms?|beds?|floors?|stories))', 'range_with_unit'),
+class NearDuplicateRequest(BaseModel):
+    text: str
+    documentId: Optional[str] = None
+    threshold: Optional[float] = None
+    add: bool = False
 
-    # Formatted numbers with commas
-    (r'\b\d{1,3}(?:,\d{3})+\b', 'formatted_number'),
 
-    # Measurements - distance
-    (r'\b\d+(?:\.\d+)?\s*(?:feet|foot|ft|meters?|m|inches?|in|yards?|yd|miles?|mi|km|kilometers?)\b', 'measurement_distance'),
+class NearDuplicateResponse(BaseModel):
+    nearDuplicateOf: Optional[NearDuplicate]
+    indexedDocuments: int
 
-    # Measurements - weight
-    (r'\b\d+(?:\.\d+)?\s*(?:pounds?|lbs?|ounces?|oz|kilograms?|kg|grams?|g|tons?)\b', 'measurement_weight'),
 
-    # Measurements - area
-    (r'\b\d+(?:\.\d+)?\s*(?:acres?|hectares?|ha|sqft|sq\s*ft|square\s*feet|square\s*meters?|sq\s*m)\b', 'measurement_area'),
+class NormalizeNamesRequest(BaseModel):
+    names: list[str]
 
-    # Counts - people
-    (r'\b\d+\s*(?:employees?|workers?|people|persons?|staff|members?|residents?|students?|patients?|visitors?)\b', 'count_people'),
 
-    # Counts - objects
-    (r'\b\d+\s*(?:units?|rooms?|beds?|floors?|stories|buildings?|houses?|apartments?|cars?|vehicles?)\b', 'count_objects'),
+class NameGroup(BaseModel):
+    key: str
+    indices: list[int]
 
-    # Currency - dollar sign
-    (r'\$\s*[\d,]+(?:\.\d{2})?', 'currency_dollar'),
 
-    # Currency - words
-    (r'\b\d+(?:,\d{3})*\s*(?:dollars?|cents?|bucks?|USD|EUR|GBP)\b', 'currency_word'),
+class NormalizeNamesResponse(BaseModel):
+    normalized: list[str]
+    groups: list[NameGroup]
 
-    # Times (without date context)
-    (r'\b\d{1,2}:\d{2}(?::\d{2})?\s*(?:am|pm|AM|PM|a\.m\.|p\.m\.)?(?!\s*(?:on|,)\s*(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|\d{1,2}))', 'time'),
 
-    # Time ranges
-    (r'\b\d{1,2}:\d{2}\s*(?:am|pm|AM|PM|a\.m\.|p\.m\.)?\s*(?:to|-)\s*\d{1,2}(?::\d{2})?\s*(?:am|pm|AM|PM|a\.m\.|p\.m\.)?', 'time_range'),
+class DocumentRequest(BaseModel):
+    text: str
+    articleDate: Optional[str] = None
+    priority: Optional[Literal['interactive', 'bulk']] = None
 
-    # Phone numbers
-    (r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b', 'phone_number'),
-    (r'\(\d{3}\)\s*\d{3}[-.\s]?\d{4}', 'phone_number'),
 
-    # Route/Highway numbers
-    (r'\b(?:route|rt|rte|hwy|highway|interstate|i-|us-|sr-|state\s+route)\s*#?\s*\d+\b', 'route_number'),
+class DocumentResponse(BaseModel):
+    sessionId: str
+    tokens: int
+    sentences: int
+    expiresInS: float
+    processingTimeMs: float
 
-    # Building identifiers
-    (r'\b(?:room|rm|building|bldg|suite|ste|apt|apartment|unit|floor|fl|lot|parcel)\s*#?\s*\d+\b', 'building_id'),
 
-    # Percentages
-    (r'\b\d+(?:\.\d+)?\s*%', 'percentage'),
+class LlmContextResponse(BaseModel):
+    llm_context: str
+    llm_context_tokens: int
+    processing_time_ms: float
 
-    # Hashtags
-    (r'#\d+\b', 'hashtag'),
 
-    # Coordinates (high precision decimals)
-    (r'-?\d{1,3}\.\d{4,}', 'coordinate'),
+class EntitiesResponse(BaseModel):
+    people: list[ExtractedPerson]
+    organizations: list[ExtractedOrganization]
+    locations: list[ExtractedLocation]
+    processingTimeMs: float
 
-    # Age references
-    (r'\b\d+\s*(?:years?\s+old|year-old|-year-old|yo)\b', 'age'),
 
-    # Version numbers
-    (r'\bv(?:ersion)?\s*\d+(?:\.\d+)*\b', 'version'),
+class DatesResponse(BaseModel):
+    dates: list[ExtractedDate]
+    maskedPatterns: list[MaskedPattern]
+    processingTimeMs: float
 
-    # Model numbers (alphanumeric)
-    (r'\b[A-Z]{1,3}-?\d{3,}\b', 'model_number'),
 
-    # ZIP codes (9-digit)
-    (r'\b\d{5}-\d{4}\b', 'zipcode'),
+# =============================================================================
+# FALSE POSITIVE PATTERNS (CRITICAL, table in false_positive_patterns.py)
+# =============================================================================
 
-    # Dimensions (LxWxH)
-    (r'\b\d+\s*[xX×]\s*\d+(?:\s*[xX×]\s*\d+)?\b', 'dimensions'),
-]
+# Compiled once at import so pre-forked workers share them with the parent;
+# recompiled in main() for --regex-backend re2
+COMPILED_FALSE_POSITIVE_PATTERNS = compile_false_positive_patterns()
 
 # =============================================================================
 # CATEGORY KEYWORDS
@@ -271,11 +366,38 @@ CATEGORY_KEYWORDS = {
     ],
 }
 
+# Role/type hints around PERSON and ORG mentions, first match wins
+PERSON_ROLE_HINTS = {
+    'founder': ['built', 'founded', 'established'],
+    'owner': ['owned', 'owner', 'purchased'],
+    'architect': ['designed', 'architect'],
+    'employee': ['worked', 'employee'],
+}
+
+ORG_TYPE_HINTS = {
+    'company': ['company', 'corporation', 'inc', 'llc', 'factory', 'mill'],
+    'school': ['school', 'university', 'college', 'academy'],
+    'hospital': ['hospital', 'clinic', 'medical'],
+    'church': ['church', 'parish', 'cathedral'],
+    'government': ['government', 'city', 'county', 'state', 'federal'],
+}
+
+# Matched in a window of CONTEXT_WINDOW_TOKENS around each entity
+CONTEXT_WINDOW_TOKENS = 10
+PERSON_ROLE_MATCHER = TokenWindowMatcher(PERSON_ROLE_HINTS)
+ORG_TYPE_MATCHER = TokenWindowMatcher(ORG_TYPE_HINTS)
+
 # =============================================================================
 # SERVICE
 # =============================================================================
 
-app = FastAPI(title="spaCy Extraction Service")
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    if NEAR_DUPLICATE_SETTINGS['path']:
+        near_duplicate_index.save(NEAR_DUPLICATE_SETTINGS['path'])
+
+app = FastAPI(title="spaCy Extraction Service", lifespan=lifespan)
 
 # Load spaCy model at startup
 print("Loading spaCy model en_core_web_lg...")
@@ -294,13 +416,124 @@ DATEPARSER_SETTINGS = {
     'RETURN_AS_TIMEZONE_AWARE': False,
 }
 
-def prefilter_text(text: str) -> tuple[str, list[dict]]:
+# Micro-batcher settings (--batch-window-ms / --max-batch-size)
+BATCH_SETTINGS = {
+    'window_ms': 10.0,
+    'max_batch_size': 32,
+}
+
+# Created on first use inside each worker's event loop (never before fork)
+_batcher: Optional[MicroBatcher] = None
+
+def get_batcher() -> MicroBatcher:
+    """Get this process's micro-batcher, creating it in the running loop."""
+    global _batcher
+    if _batcher is None:
+        _batcher = MicroBatcher(nlp, **BATCH_SETTINGS)
+    return _batcher
+
+# De-duplicates identical in-flight /extract and /preprocess requests
+flights = SingleFlight()
+
+SCHEDULER_SETTINGS = {
+    'limits': {'interactive': 8, 'bulk': 4},
+    'max_active': 8,
+    'aging_s': 5.0,
+}
+
+_scheduler: Optional[PriorityScheduler] = None
+
+def get_scheduler() -> PriorityScheduler:
+    """Get this process's priority scheduler."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = PriorityScheduler(**SCHEDULER_SETTINGS)
+    return _scheduler
+
+# Cross-document near-duplicates (--near-duplicate-index / --near-duplicate-threshold).
+# Per process: in pre-fork mode each worker indexes what it serves, on top
+# of whatever was loaded before forking
+NEAR_DUPLICATE_SETTINGS = {
+    'path': None,
+}
+
+near_duplicate_index = NearDuplicateIndex()
+result_cache = ResultCache()
+
+# Parsed documents kept for repeated views (--session-ttl-s,
+# --session-max-mb, --max-sessions); one store per worker process
+sessions = SessionStore()
+
+# Request fields that don't change the result (left out of cache/flight keys)
+NON_RESULT_FIELDS = {'text', 'priority', 'deadlineMs', 'documentId', 'reuseDuplicates'}
+
+def _find_near_duplicate(text: str, document_id: Optional[str]):
+    signature = minhash_signature(text)
+    return signature, near_duplicate_index.query(signature, exclude=document_id)
+
+async def with_near_duplicates(request, endpoint: str, verdict_field: str, compute):
+    """
+    Run compute() for a request, adding the near-duplicate verdict.
+
+    Only requests with a documentId take part: they are checked against
+    the index, may reuse a near-duplicate's cached result
+    (reuseDuplicates), and their complete results are indexed and cached.
+    """
+    if not request.documentId:
+        return await compute()
+
+    options_key = make_key(endpoint, '', request.model_dump(exclude=NON_RESULT_FIELDS))
+    signature, match = await asyncio.to_thread(_find_near_duplicate, request.text, request.documentId)
+
+    if match is not None and request.reuseDuplicates:
+        cached = result_cache.get(match[0], options_key)
+        if cached is not None:
+            near_duplicate_index.add(request.documentId, signature)
+            result_cache.put(request.documentId, options_key, cached)
+            verdict = NearDuplicate(documentId=match[0], similarity=round(match[1], 3), reused=True)
+            return cached.model_copy(update={verdict_field: verdict})
+
+    response = await compute()
+    if response.status == STATUS_COMPLETE:
+        near_duplicate_index.add(request.documentId, signature)
+        result_cache.put(request.documentId, options_key, response)
+
+    if match is not None:
+        verdict = NearDuplicate(documentId=match[0], similarity=round(match[1], 3))
+        response = response.model_copy(update={verdict_field: verdict})
+    return response
+
+def resolve_lane(body_priority: Optional[str], header_priority: Optional[str]) -> str:
+    """Pick the request's lane: body field, then X-Priority header, then default."""
+    lane = body_priority or (header_priority or '').strip().lower() or DEFAULT_LANE
+    if lane not in LANES:
+        raise HTTPException(status_code=400, detail=f"priority must be one of: {', '.join(LANES)}")
+    return lane
+
+def warm_up():
+    """
+    Run one tiny request through every lazy-loading stage.
+
+    dateparser loads its locale data and spaCy some of its tables on first
+    use. Doing that here means pre-forked workers inherit them instead of
+    each loading a private copy on their first request.
+    """
+    text = "The mill was built in 1920 and closed on March 3, 1975."
+    masked_text, _ = prefilter_text(text)
+    extract_dates(text, masked_text)
+    preprocess_text(text, nlp)
+
+def prefilter_text(text: str, deadline: Optional[Deadline] = None) -> tuple[str, list[dict]]:
     """
     Mask false positive patterns before date extraction.
 
     This is CRITICAL for accuracy. By replacing patterns like "110 to 130"
     with mask characters, dateparser never sees them.
 
+    Args:
+        text: Raw text
+        deadline: Stops scanning further patterns once expired
+
     Returns:
         masked_text: Text with false positives replaced by █ characters
         masks: List of what was masked (for debugging/logging)
@@ -309,8 +542,10 @@ def prefilter_text(text: str) -> tuple[str, list[dict]]:
     all_matches = []
 
     # Collect all matches first
-    for pattern, reason in FALSE_POSITIVE_PATTERNS:
-        for match in re.finditer(pattern, text, re.IGNORECASE):
+    for pattern, reason in COMPILED_FALSE_POSITIVE_PATTERNS:
+        if deadline is not None and deadline.expired():
+            break
+        for match in pattern.finditer(text):
             all_matches.append({
                 'match': match,
                 'reason': reason,
@@ -350,7 +585,7 @@ def prefilter_text(text: str) -> tuple[str, list[dict]]:
 def extract_sentence(text: str, position: int) -> str:
     """Extract the sentence containing a position."""
     # Find sentence boundaries
-    terminators = re.compile(r'[.!?]\s+|[\n\r]{2,}')
+    terminators = SENTENCE_TERMINATORS
 
     sentence_start = 0
     for match in terminators.finditer(text):
@@ -409,16 +644,60 @@ def detect_category(text: str, date_position: int) -> tuple[str, float]:
 
     return best_category, min(best_score, 1.0)
 
-def extract_dates(text: str, masked_text: str, article_date: Optional[str] = None) -> list[ExtractedDate]:
-    """Extract dates using dateparser with pre-filtering."""
+# Paragraph chunk size for date search when a request has a deadline
+DATE_CHUNK_CHARS = 2000
+
+def _paragraph_chunks(text: str, size: int = DATE_CHUNK_CHARS) -> list[str]:
+    """Split text on blank lines into chunks of roughly `size` characters."""
+    chunks = []
+    current = ''
+    # Separators are kept with the preceding paragraph
+    parts = re.split(r'(\n\s*\n)', text)
+    for paragraph in (''.join(parts[i:i + 2]) for i in range(0, len(parts), 2)):
+        if current and len(current) + len(paragraph) > size:
+            chunks.append(current)
+            current = ''
+        current += paragraph
+    if current.strip():
+        chunks.append(current)
+    return chunks
+
+def _search_dates(masked_text: str, deadline: Optional[Deadline]) -> list:
+    """Run dateparser; in paragraph chunks checked against the deadline if there is one."""
+    if deadline is None or not deadline.enabled:
+        return dateparser.search.search_dates(
+            masked_text,
+            settings=DATEPARSER_SETTINGS,
+            languages=['en']
+        ) or []
+
+    found = []
+    for chunk in _paragraph_chunks(masked_text):
+        if deadline.expired():
+            break
+        found.extend(dateparser.search.search_dates(
+            chunk,
+            settings=DATEPARSER_SETTINGS,
+            languages=['en']
+        ) or [])
+    return found
+
+def extract_dates(
+    text: str,
+    masked_text: str,
+    article_date: Optional[str] = None,
+    deadline: Optional[Deadline] = None,
+) -> list[ExtractedDate]:
+    """
+    Extract dates using dateparser with pre-filtering.
+
+    With a deadline, the masked text is searched paragraph by paragraph
+    and the search stops once the deadline has passed.
+    """
     dates = []
 
     # Use the masked text for searching
-    found_dates = dateparser.search.search_dates(
-        masked_text,
-        settings=DATEPARSER_SETTINGS,
-        languages=['en']
-    )
+    found_dates = _search_dates(masked_text, deadline)
 
     if not found_dates:
         return dates
@@ -439,11 +718,8 @@ def extract_dates(text: str, masked_text: str, article_date: Optional[str] = Non
             continue
 
         # Determine precision
-        has_day = parsed_date.day != 1 or re.search(r'\b\d{1,2}(?:st|nd|rd|th)?\b', raw_text)
-        has_month = parsed_date.month != 1 or re.search(
-            r'\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec|january|february|march|april|june|july|august|september|october|november|december)\b',
-            raw_text.lower()
-        )
+        has_day = parsed_date.day != 1 or DAY_PATTERN.search(raw_text)
+        has_month = parsed_date.month != 1 or MONTH_PATTERN.search(raw_text.lower())
 
         if has_day and has_month:
             precision = 'exact'
@@ -456,10 +732,7 @@ def extract_dates(text: str, masked_text: str, article_date: Optional[str] = Non
             date_str = str(year)
 
         # Check for approximate indicators
-        is_approximate = bool(re.search(
-            r'\b(circa|c\.|ca\.|around|about|approximately|roughly|late|early|mid)\b',
-            raw_text.lower()
-        ))
+        is_approximate = bool(APPROXIMATE_PATTERN.search(raw_text.lower()))
         if is_approximate:
             precision = 'approximate'
 
@@ -498,13 +771,13 @@ def extract_dates(text: str, masked_text: str, article_date: Optional[str] = Non
 
     return dates
 
-def extract_people(doc) -> list[ExtractedPerson]:
-    """Extract people using spaCy NER."""
-    people = []
+def _first_mentions(doc, label: str) -> list[tuple[str, Any]]:
+    """(name, entity) for the first mention of each distinct name with a label."""
+    mentions = []
     seen_names = set()
 
     for ent in doc.ents:
-        if ent.label_ == 'PERSON':
+        if ent.label_ == label:
             name = ent.text.strip()
             name_lower = name.lower()
 
@@ -512,67 +785,49 @@ def extract_people(doc) -> list[ExtractedPerson]:
                 continue
 
             seen_names.add(name_lower)
+            mentions.append((name, ent))
 
-            # Try to determine role from context
-            context = doc[max(0, ent.start - 10):min(len(doc), ent.end + 10)].text.lower()
-            role = 'unknown'
+    return mentions
 
-            if any(w in context for w in ['built', 'founded', 'established']):
-                role = 'founder'
-            elif any(w in context for w in ['owned', 'owner', 'purchased']):
-                role = 'owner'
-            elif any(w in context for w in ['designed', 'architect']):
-                role = 'architect'
-            elif any(w in context for w in ['worked', 'employee']):
-                role = 'employee'
+def _context_categories(doc, mentions: list[tuple[str, Any]], matcher: TokenWindowMatcher) -> list[str]:
+    """Keyword category in the token window around each mention, all windows at once."""
+    starts = [max(0, ent.start - CONTEXT_WINDOW_TOKENS) for _, ent in mentions]
+    ends = [min(len(doc), ent.end + CONTEXT_WINDOW_TOKENS) for _, ent in mentions]
+    return [category or 'unknown' for category in matcher.categories(doc, starts, ends)]
 
-            people.append(ExtractedPerson(
-                name=name,
-                role=role,
-                mentions=[name],
-                confidence=0.8 if role != 'unknown' else 0.6,
-            ))
+def extract_people(doc) -> list[ExtractedPerson]:
+    """Extract people using spaCy NER."""
+    mentions = _first_mentions(doc, 'PERSON')
+
+    # Try to determine role from context
+    roles = _context_categories(doc, mentions, PERSON_ROLE_MATCHER)
 
-    return people
+    return [
+        ExtractedPerson(
+            name=name,
+            role=role,
+            mentions=[name],
+            confidence=0.8 if role != 'unknown' else 0.6,
+        )
+        for (name, _), role in zip(mentions, roles)
+    ]
 
 def extract_organizations(doc) -> list[ExtractedOrganization]:
     """Extract organizations using spaCy NER."""
-    orgs = []
-    seen_orgs = set()
+    mentions = _first_mentions(doc, 'ORG')
 
-    for ent in doc.ents:
-        if ent.label_ == 'ORG':
-            name = ent.text.strip()
-            name_lower = name.lower()
-
-            if name_lower in seen_orgs or len(name) < 2:
-                continue
-
-            seen_orgs.add(name_lower)
+    # Try to determine type from context
+    org_types = _context_categories(doc, mentions, ORG_TYPE_MATCHER)
 
-            # Try to determine type from context
-            context = doc[max(0, ent.start - 10):min(len(doc), ent.end + 10)].text.lower()
-            org_type = 'unknown'
-
-            if any(w in context for w in ['company', 'corporation', 'inc', 'llc', 'factory', 'mill']):
-                org_type = 'company'
-            elif any(w in context for w in ['school', 'university', 'college', 'academy']):
-                org_type = 'school'
-            elif any(w in context for w in ['hospital', 'clinic', 'medical']):
-                org_type = 'hospital'
-            elif any(w in context for w in ['church', 'parish', 'cathedral']):
-                org_type = 'church'
-            elif any(w in context for w in ['government', 'city', 'county', 'state', 'federal']):
-                org_type = 'government'
-
-            orgs.append(ExtractedOrganization(
-                name=name,
-                type=org_type,
-                mentions=[name],
-                confidence=0.8 if org_type != 'unknown' else 0.6,
-            ))
-
-    return orgs
+    return [
+        ExtractedOrganization(
+            name=name,
+            type=org_type,
+            mentions=[name],
+            confidence=0.8 if org_type != 'unknown' else 0.6,
+        )
+        for (name, _), org_type in zip(mentions, org_types)
+    ]
 
 def extract_locations(doc) -> list[ExtractedLocation]:
     """Extract location references using spaCy NER."""
@@ -605,6 +860,35 @@ def extract_locations(doc) -> list[ExtractedLocation]:
 
     return locs
 
+# Monitoring endpoints don't count as work (or toward --max-requests)
+UNCOUNTED_PATHS = {'/health', '/workers', '/metrics'}
+
+class WorkerStatsMiddleware:
+    """
+    Count requests and refresh RSS for this worker's /workers entry.
+
+    Plain ASGI rather than @app.middleware("http"): the latter wraps
+    `receive`, which hides client disconnects from the endpoints.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'] in UNCOUNTED_PATHS:
+            return await self.app(scope, receive, send)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            prefork.note_request()
+
+app.add_middleware(WorkerStatsMiddleware)
+
+@app.exception_handler(ClientDisconnected)
+async def client_disconnected(request, exc):
+    """Nobody is listening; 499 only shows up in the access log."""
+    return Response(status_code=499)
+
 @app.get("/health", response_model=HealthResponse)
 async def health():
     """Health check endpoint."""
@@ -615,37 +899,88 @@ async def health():
     )
 
 @app.post("/extract", response_model=ExtractionResponse)
-async def extract(request: ExtractionRequest):
+async def extract(
+    request: ExtractionRequest,
+    http_request: Request,
+    x_priority: Optional[str] = Header(None),
+):
     """Main extraction endpoint."""
-    start_time = time.time()
-
-    text = request.text
-    if not text or not text.strip():
+    if not request.text or not request.text.strip():
         raise HTTPException(status_code=400, detail="Text is required")
+    lane = resolve_lane(request.priority, x_priority)
+    deadline = Deadline(request.deadlineMs)
 
-    # Step 1: Pre-filter false positives
-    masked_text, masked_patterns = prefilter_text(text)
+    # Identical concurrent requests share one computation (run in the
+    # first caller's lane and deadline); it is cancelled only once every
+    # caller has disconnected
+    key = make_key('extract', request.text, request.model_dump(exclude=NON_RESULT_FIELDS - {'deadlineMs'}))
+    return await cancel_on_disconnect(http_request, with_near_duplicates(
+        request, 'extract', 'nearDuplicateOf',
+        lambda: flights.do(key, lambda: _extract(request, lane, deadline))))
 
-    # Step 2: Process with spaCy
-    doc = nlp(text)
 
-    # Step 3: Extract based on requested types
+async def _extract(request: ExtractionRequest, lane: str, deadline: Deadline) -> ExtractionResponse:
+    start_time = time.time()
+    try:
+        async with get_scheduler().slot(lane, timeout=deadline.remaining_s()):
+            return await _extract_text(request, lane, deadline, start_time)
+    except asyncio.TimeoutError:
+        deadline.hit = True
+        return ExtractionResponse(
+            dates=[], people=[], organizations=[], locations=[], maskedPatterns=[],
+            processingTimeMs=round((time.time() - start_time) * 1000, 2),
+            status=deadline.status(started=False),
+        )
+
+
+def _extract_entities(
+    request: ExtractionRequest,
+    masked_text: str,
+    doc,
+    deadline: Deadline,
+) -> tuple[list, list, list, list]:
+    """Run the requested extraction stages, checking the deadline between them."""
     dates = []
     people = []
     organizations = []
     locations = []
 
-    if 'dates' in request.extractTypes:
-        dates = extract_dates(text, masked_text, request.articleDate)
+    if 'dates' in request.extractTypes and not deadline.expired():
+        dates = extract_dates(request.text, masked_text, request.articleDate, deadline)
+
+    if doc is not None:
+        if 'people' in request.extractTypes and not deadline.expired():
+            people = extract_people(doc)
 
-    if 'people' in request.extractTypes:
-        people = extract_people(doc)
+        if 'organizations' in request.extractTypes and not deadline.expired():
+            organizations = extract_organizations(doc)
 
-    if 'organizations' in request.extractTypes:
-        organizations = extract_organizations(doc)
+        if 'locations' in request.extractTypes and not deadline.expired():
+            locations = extract_locations(doc)
 
-    if 'locations' in request.extractTypes:
-        locations = extract_locations(doc)
+    return dates, people, organizations, locations
+
+
+async def _extract_text(
+    request: ExtractionRequest,
+    lane: str,
+    deadline: Deadline,
+    start_time: float,
+) -> ExtractionResponse:
+    text = request.text
+
+    # CPU-bound stages run in threads so the loop keeps serving other
+    # requests and notices disconnects
+
+    # Step 1: Pre-filter false positives
+    masked_text, masked_patterns = await deadline.offload(prefilter_text, text, deadline)
+
+    # Step 2: Process with spaCy (batched with concurrent requests)
+    doc = await deadline.run(get_batcher().parse(text, priority=LANES.index(lane)))
+
+    # Step 3: Extract based on requested types
+    dates, people, organizations, locations = await deadline.offload(
+        _extract_entities, request, masked_text, doc, deadline)
 
     processing_time = (time.time() - start_time) * 1000
 
@@ -656,10 +991,15 @@ async def extract(request: ExtractionRequest):
         locations=locations,
         maskedPatterns=[MaskedPattern(**p) for p in masked_patterns],
         processingTimeMs=round(processing_time, 2),
+        status=deadline.status(started=doc is not None or bool(dates)),
     )
 
 @app.post("/preprocess", response_model=PreprocessResponse)
-async def preprocess(request: PreprocessRequest):
+async def preprocess(
+    request: PreprocessRequest,
+    http_request: Request,
+    x_priority: Optional[str] = Header(None),
+):
     """
     Preprocess text for LLM extraction.
 
@@ -667,52 +1007,115 @@ async def preprocess(request: PreprocessRequest):
     - Identifies timeline-relevant sentences (with verbs like built, closed, demolished)
     - Extracts named entities (people, organizations, locations, dates)
     - Classifies sentences by relevancy
+    - Optionally drops near-duplicate sentences (dedupeThreshold, cosine
+      similarity of static word vectors) from the context
     - Builds condensed context for LLM input
 
     This endpoint should be called BEFORE sending text to an LLM for extraction.
     """
+    if not request.text or not request.text.strip():
+        raise HTTPException(status_code=400, detail="Text is required")
+
+    lane = resolve_lane(request.priority, x_priority)
+    deadline = Deadline(request.deadlineMs)
+
+    key = make_key('preprocess', request.text, request.model_dump(exclude=NON_RESULT_FIELDS - {'deadlineMs'}))
+    return await cancel_on_disconnect(http_request, with_near_duplicates(
+        request, 'preprocess', 'near_duplicate_of',
+        lambda: flights.do(key, lambda: _preprocess(request, lane, deadline))))
+
+
+async def _preprocess(request: PreprocessRequest, lane: str, deadline: Deadline) -> PreprocessResponse:
     start_time = time.time()
+    try:
+        async with get_scheduler().slot(lane, timeout=deadline.remaining_s()):
+            return await _preprocess_text(request, lane, deadline, start_time)
+    except asyncio.TimeoutError:
+        deadline.hit = True
+        return _timed_out_preprocess(request, deadline, start_time)
+
+
+def _timed_out_preprocess(request: PreprocessRequest, deadline: Deadline, start_time: float) -> PreprocessResponse:
+    return PreprocessResponse(
+        document_stats=DocumentStats(
+            total_sentences=0, timeline_relevant=0, profile_relevant=0,
+            total_people=0, total_organizations=0,
+        ),
+        sentences=[],
+        timeline_candidates=[],
+        profile_candidates={'people': [], 'organizations': []},
+        llm_context='',
+        llm_context_tokens=0,
+        article_date=request.articleDate,
+        processing_time_ms=round((time.time() - start_time) * 1000, 2),
+        status=deadline.status(started=False),
+    )
 
+
+async def _preprocess_text(
+    request: PreprocessRequest,
+    lane: str,
+    deadline: Deadline,
+    start_time: float,
+) -> PreprocessResponse:
     text = request.text
-    if not text or not text.strip():
-        raise HTTPException(status_code=400, detail="Text is required")
 
-    # Preprocess the text
-    result = preprocess_text(text, nlp, request.articleDate)
+    # Preprocess the text (parse batched with concurrent requests)
+    doc = await deadline.run(get_batcher().parse(text, priority=LANES.index(lane)))
+    if doc is None:
+        return _timed_out_preprocess(request, deadline, start_time)
+    result = await deadline.offload(
+        preprocess_text, text, nlp, request.articleDate, doc, deadline, request.dedupeThreshold)
+
+    return _preprocess_response(
+        result, request.maxSentences, request.maxTokens, start_time, deadline.status())
+
+
+def _sentence_model(s: dict) -> PreprocessedSentence:
+    return PreprocessedSentence(
+        text=s['text'],
+        relevancy=s['relevancy'],
+        relevancy_type=s.get('relevancy_type'),
+        verbs=[VerbMatch(**v) for v in s['verbs']],
+        entities=[EntityMatch(**e) for e in s['entities']],
+        confidence=s['confidence'],
+        has_date=s['has_date'],
+        has_person=s['has_person'],
+        has_org=s['has_org'],
+        duplicate_of=s['duplicate_of']
+    )
+
+
+def _llm_context(result: dict, max_sentences: int, max_tokens: Optional[int]) -> tuple[str, int]:
+    """LLM context string and its token estimate (a token budget replaces the sentence cap)."""
+    if max_tokens is not None:
+        return build_llm_context_for_budget(result, max_tokens)
+    llm_context = build_llm_context(result, max_sentences)
+    return llm_context, estimate_tokens(llm_context)
+
 
+def _preprocess_response(
+    result: dict,
+    max_sentences: int,
+    max_tokens: Optional[int],
+    start_time: float,
+    status: str,
+) -> PreprocessResponse:
     # Build LLM context string
-    llm_context = build_llm_context(result, request.maxSentences)
+    llm_context, llm_context_tokens = _llm_context(result, max_sentences, max_tokens)
 
     processing_time = (time.time() - start_time) * 1000
 
     return PreprocessResponse(
         document_stats=DocumentStats(**result['document_stats']),
-        sentences=[PreprocessedSentence(
-            text=s['text'],
-            relevancy=s['relevancy'],
-            relevancy_type=s.get('relevancy_type'),
-            verbs=[VerbMatch(**v) for v in s['verbs']],
-            entities=[EntityMatch(**e) for e in s['entities']],
-            confidence=s['confidence'],
-            has_date=s['has_date'],
-            has_person=s['has_person'],
-            has_org=s['has_org']
-        ) for s in result['sentences']],
-        timeline_candidates=[PreprocessedSentence(
-            text=s['text'],
-            relevancy=s['relevancy'],
-            relevancy_type=s.get('relevancy_type'),
-            verbs=[VerbMatch(**v) for v in s['verbs']],
-            entities=[EntityMatch(**e) for e in s['entities']],
-            confidence=s['confidence'],
-            has_date=s['has_date'],
-            has_person=s['has_person'],
-            has_org=s['has_org']
-        ) for s in result['timeline_candidates']],
+        sentences=[_sentence_model(s) for s in result['sentences']],
+        timeline_candidates=[_sentence_model(s) for s in result['timeline_candidates']],
         profile_candidates=result['profile_candidates'],
         llm_context=llm_context,
+        llm_context_tokens=llm_context_tokens,
         article_date=result.get('article_date'),
-        processing_time_ms=round(processing_time, 2)
+        processing_time_ms=round(processing_time, 2),
+        status=status,
     )
 
 
@@ -722,23 +1125,302 @@ async def verb_categories():
     return {"categories": get_all_categories()}
 
 
+@app.post("/near-duplicates", response_model=NearDuplicateResponse)
+async def near_duplicates(request: NearDuplicateRequest):
+    """
+    Check a text against the near-duplicate index without extracting.
+
+    With add=true (and a documentId) the text is indexed as well.
+    """
+    if not request.text or not request.text.strip():
+        raise HTTPException(status_code=400, detail="Text is required")
+    if request.add and not request.documentId:
+        raise HTTPException(status_code=400, detail="documentId is required to add a document")
+
+    signature = await asyncio.to_thread(minhash_signature, request.text)
+    match = near_duplicate_index.query(signature, exclude=request.documentId, threshold=request.threshold)
+    if request.add:
+        near_duplicate_index.add(request.documentId, signature)
+
+    return NearDuplicateResponse(
+        nearDuplicateOf=NearDuplicate(documentId=match[0], similarity=round(match[1], 3)) if match else None,
+        indexedDocuments=len(near_duplicate_index),
+    )
+
+
+@app.delete("/near-duplicates/{document_id}")
+async def forget_near_duplicate(document_id: str):
+    """Remove a document from the near-duplicate index."""
+    near_duplicate_index.remove(document_id)
+    return {"status": "removed", "indexedDocuments": len(near_duplicate_index)}
+
+
+def _group_names(names: list[str]) -> NormalizeNamesResponse:
+    normalized = [normalize_name(name) for name in names]
+    by_key: dict[str, list[int]] = {}
+    for i, key in enumerate(normalized):
+        by_key.setdefault(key, []).append(i)
+    return NormalizeNamesResponse(
+        normalized=normalized,
+        groups=[NameGroup(key=key, indices=indices) for key, indices in by_key.items() if len(indices) > 1],
+    )
+
+
+@app.post("/normalize-names", response_model=NormalizeNamesResponse)
+async def normalize_names(request: NormalizeNamesRequest):
+    """
+    Normalize profile names the way /preprocess deduplicates them.
+
+    Returns the normalized key per input name (same order) and the groups
+    of input indices that share a key, i.e. the duplicates to merge.
+    """
+    return await asyncio.to_thread(_group_names, request.names)
+
+
+def _get_session(session_id: str) -> Session:
+    session = sessions.get(session_id)
+    if session is not None:
+        return session
+    owner = sessions.owner_pid(session_id)
+    if owner is not None and owner != os.getpid():
+        raise HTTPException(
+            status_code=404,
+            detail=f"Session {session_id} belongs to worker {owner}; sessions are per worker process",
+        )
+    raise HTTPException(status_code=404, detail=f"Session {session_id} not found or expired")
+
+
+def _session_masked(session: Session) -> tuple[str, list[dict]]:
+    return session.get_or_compute('masked', lambda: prefilter_text(session.text))
+
+
+def _session_preprocess(session: Session, dedupe_threshold: Optional[float]) -> dict:
+    return session.get_or_compute(('preprocess', dedupe_threshold), lambda: preprocess_text(
+        session.text, nlp, session.article_date, session.doc, dedupe_threshold=dedupe_threshold))
+
+
+@app.post("/documents", response_model=DocumentResponse)
+async def create_document(
+    request: DocumentRequest,
+    http_request: Request,
+    x_priority: Optional[str] = Header(None),
+):
+    """
+    Parse a document once and return a session handle for later views.
+
+    The handle is valid on this worker until it goes unused for the
+    session TTL or is evicted to stay within the session memory budget.
+    """
+    if not request.text or not request.text.strip():
+        raise HTTPException(status_code=400, detail="Text is required")
+    lane = resolve_lane(request.priority, x_priority)
+    start_time = time.time()
+
+    async def parse():
+        async with get_scheduler().slot(lane):
+            return await get_batcher().parse(request.text, priority=LANES.index(lane))
+
+    doc = await cancel_on_disconnect(http_request, parse())
+    session = sessions.create(request.text, doc, request.articleDate)
+
+    return DocumentResponse(
+        sessionId=session.id,
+        tokens=len(doc),
+        sentences=sum(1 for _ in doc.sents),
+        expiresInS=sessions.ttl_s,
+        processingTimeMs=round((time.time() - start_time) * 1000, 2),
+    )
+
+
+@app.get("/documents/{session_id}/preprocess", response_model=PreprocessResponse)
+async def document_preprocess(
+    session_id: str,
+    maxSentences: int = 20,
+    maxTokens: Optional[int] = None,
+    dedupeThreshold: Optional[float] = None,
+):
+    """/preprocess for a session's document, without reparsing."""
+    session = _get_session(session_id)
+    start_time = time.time()
+    result = await asyncio.to_thread(_session_preprocess, session, dedupeThreshold)
+    return _preprocess_response(result, maxSentences, maxTokens, start_time, STATUS_COMPLETE)
+
+
+@app.get("/documents/{session_id}/llm-context", response_model=LlmContextResponse)
+async def document_llm_context(
+    session_id: str,
+    maxSentences: int = 20,
+    maxTokens: Optional[int] = None,
+    dedupeThreshold: Optional[float] = None,
+):
+    """LLM context for a session's document with the given settings."""
+    session = _get_session(session_id)
+    start_time = time.time()
+    result = await asyncio.to_thread(_session_preprocess, session, dedupeThreshold)
+    llm_context, llm_context_tokens = _llm_context(result, maxSentences, maxTokens)
+    return LlmContextResponse(
+        llm_context=llm_context,
+        llm_context_tokens=llm_context_tokens,
+        processing_time_ms=round((time.time() - start_time) * 1000, 2),
+    )
+
+
+@app.get("/documents/{session_id}/entities", response_model=EntitiesResponse)
+async def document_entities(session_id: str):
+    """People, organizations and locations in a session's document."""
+    session = _get_session(session_id)
+    start_time = time.time()
+
+    def entities():
+        doc = session.doc
+        return (
+            session.get_or_compute('people', lambda: extract_people(doc)),
+            session.get_or_compute('organizations', lambda: extract_organizations(doc)),
+            session.get_or_compute('locations', lambda: extract_locations(doc)),
+        )
+
+    people, organizations, locations = await asyncio.to_thread(entities)
+    return EntitiesResponse(
+        people=people,
+        organizations=organizations,
+        locations=locations,
+        processingTimeMs=round((time.time() - start_time) * 1000, 2),
+    )
+
+
+@app.get("/documents/{session_id}/dates", response_model=DatesResponse)
+async def document_dates(session_id: str):
+    """Dates in a session's document, with the patterns masked before the search."""
+    session = _get_session(session_id)
+    start_time = time.time()
+
+    def dates():
+        masked_text, masked_patterns = _session_masked(session)
+        found = session.get_or_compute('dates', lambda: extract_dates(
+            session.text, masked_text, session.article_date))
+        return found, masked_patterns
+
+    found, masked_patterns = await asyncio.to_thread(dates)
+    return DatesResponse(
+        dates=found,
+        maskedPatterns=[MaskedPattern(**p) for p in masked_patterns],
+        processingTimeMs=round((time.time() - start_time) * 1000, 2),
+    )
+
+
+@app.delete("/documents/{session_id}")
+async def delete_document(session_id: str):
+    """Release a session before its TTL."""
+    if not sessions.delete(session_id):
+        raise HTTPException(status_code=404, detail=f"Session {session_id} not found or expired")
+    return {"status": "deleted", "sessions": len(sessions)}
+
+
+@app.get("/metrics", response_model=MetricsResponse)
+async def metrics():
+    """Scheduler metrics for this worker process."""
+    return MetricsResponse(
+        pid=os.getpid(),
+        batcher=_batcher.stats() if _batcher is not None else None,
+        singleflight=flights.stats(),
+        scheduler=_scheduler.stats() if _scheduler is not None else None,
+        near_duplicates={'index': near_duplicate_index.stats(), 'result_cache': result_cache.stats()},
+        sentence_cache=sentence_memo.stats(),
+        name_cache=normalize_name.cache_info()._asdict(),
+        sessions=sessions.stats(),
+    )
+
+
+@app.get("/workers", response_model=WorkersResponse)
+async def workers():
+    """Per-worker memory and request stats (all workers in pre-fork mode)."""
+    return WorkersResponse(**prefork.worker_snapshot())
+
+
 @app.post("/shutdown")
 async def shutdown():
     """Graceful shutdown endpoint."""
-    import asyncio
-    import signal
-
-    asyncio.get_event_loop().call_later(0.5, lambda: signal.raise_signal(signal.SIGTERM))
+    prefork.request_shutdown()
     return {"status": "shutting down"}
 
 def main():
     parser = argparse.ArgumentParser(description='spaCy Extraction Service')
     parser.add_argument('--port', type=int, default=8234, help='Port to run on')
     parser.add_argument('--host', type=str, default='127.0.0.1', help='Host to bind to')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes sharing the loaded model (0 = one per CPU)')
+    parser.add_argument('--max-requests', type=int, default=0,
+                        help='Recycle a worker after this many requests (0 = never; POSIX only)')
+    parser.add_argument('--max-requests-jitter', type=int, default=0,
+                        help='Random extra requests per worker so they do not recycle together')
+    parser.add_argument('--max-rss-mb', type=int, default=0,
+                        help='Recycle a worker once its private (non-shared) memory exceeds '
+                             'this many MB (0 = never; POSIX only)')
+    parser.add_argument('--batch-window-ms', type=float, default=BATCH_SETTINGS['window_ms'],
+                        help='How long to collect concurrent requests into one nlp.pipe call')
+    parser.add_argument('--max-batch-size', type=int, default=BATCH_SETTINGS['max_batch_size'],
+                        help='Largest number of texts parsed in one nlp.pipe call')
+    parser.add_argument('--regex-backend', choices=BACKENDS, default=DEFAULT_BACKEND,
+                        help='Engine for the false-positive patterns; re2 guarantees linear-time '
+                             'matching (pip install google-re2)')
+    parser.add_argument('--near-duplicate-index', type=str, default=None,
+                        help='JSON file the near-duplicate index is loaded from and saved to on shutdown')
+    parser.add_argument('--near-duplicate-threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Estimated Jaccard similarity for a near-duplicate verdict')
+    parser.add_argument('--interactive-limit', type=int, default=SCHEDULER_SETTINGS['limits']['interactive'],
+                        help='Concurrent interactive requests per worker')
+    parser.add_argument('--bulk-limit', type=int, default=SCHEDULER_SETTINGS['limits']['bulk'],
+                        help='Concurrent bulk requests per worker')
+    parser.add_argument('--max-active', type=int, default=SCHEDULER_SETTINGS['max_active'],
+                        help='Concurrent requests per worker across both lanes')
+    parser.add_argument('--bulk-aging-s', type=float, default=SCHEDULER_SETTINGS['aging_s'],
+                        help='Seconds a bulk request may wait before it is served ahead of interactive work')
+    parser.add_argument('--session-ttl-s', type=float, default=DEFAULT_TTL_S,
+                        help='Seconds an unused /documents session is kept')
+    parser.add_argument('--session-max-mb', type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024),
+                        help='Estimated memory for /documents sessions per worker before LRU eviction')
+    parser.add_argument('--max-sessions', type=int, default=DEFAULT_MAX_SESSIONS,
+                        help='Sessions per worker before LRU eviction')
+    parser.add_argument('--sentence-cache-size', type=int, default=sentence_memo.max_entries,
+                        help='Sentences whose analysis is memoized for reuse across documents (0 disables)')
     args = parser.parse_args()
 
-    print(f"Starting spaCy service on http://{args.host}:{args.port}")
-    uvicorn.run(app, host=args.host, port=args.port, log_level="info")
+    if args.regex_backend == 're2' and not HAS_RE2:
+        parser.error("--regex-backend re2 needs google-re2: pip install google-re2")
+    global COMPILED_FALSE_POSITIVE_PATTERNS
+    COMPILED_FALSE_POSITIVE_PATTERNS = compile_false_positive_patterns(args.regex_backend)
+
+    NEAR_DUPLICATE_SETTINGS['path'] = args.near_duplicate_index
+    near_duplicate_index.threshold = args.near_duplicate_threshold
+    if args.near_duplicate_index and os.path.exists(args.near_duplicate_index):
+        near_duplicate_index.load(args.near_duplicate_index)
+        print(f"Loaded {len(near_duplicate_index)} documents into the near-duplicate index")
+
+    sentence_memo.resize(args.sentence_cache_size)
+    sessions.ttl_s = args.session_ttl_s
+    sessions.max_bytes = int(args.session_max_mb * 1024 * 1024)
+    sessions.max_sessions = args.max_sessions
+
+    BATCH_SETTINGS['window_ms'] = args.batch_window_ms
+    BATCH_SETTINGS['max_batch_size'] = args.max_batch_size
+    SCHEDULER_SETTINGS['limits'] = {'interactive': args.interactive_limit, 'bulk': args.bulk_limit}
+    SCHEDULER_SETTINGS['max_active'] = args.max_active
+    SCHEDULER_SETTINGS['aging_s'] = args.bulk_aging_s
+
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    limits = prefork.WorkerLimits(
+        max_requests=args.max_requests,
+        max_rss_mb=args.max_rss_mb,
+        max_requests_jitter=args.max_requests_jitter,
+    )
+
+    if workers == 1 and not limits.enabled:
+        print(f"Starting spaCy service on http://{args.host}:{args.port}")
+        uvicorn.run(app, host=args.host, port=args.port, log_level="info")
+        return
+
+    warm_up()
+    prefork.serve_prefork(app, args.host, args.port, workers, log_level="info", limits=limits)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,283 @@
+"""
+Cross-document Near-duplicate Detection
+
+The same wire story is archived from many news sites as separate web
+sources, and every copy used to go through the full /extract +
+/preprocess + LLM path. Documents are fingerprinted with MinHash over
+word shingles and kept in an LSH index, so a new copy is recognised as a
+near-duplicate of one already seen and can reuse its cached results.
+
+Key Features:
+- MinHash signatures (numpy, no extra dependency) over word 5-grams
+- LSH banding for sub-linear candidate lookup, candidates verified by
+  estimated Jaccard similarity
+- Bounded index (least recently added documents evicted first)
+- Persistable as JSON; saves merge with what is already on disk so
+  pre-forked workers (each with their own index) don't drop each
+  other's documents
+- LRU cache of per-document results for reuse
+
+@version 1.0
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+NUM_PERM = 128
+BANDS = 16  # 16 bands x 8 rows: candidates from ~0.7 Jaccard upwards
+SHINGLE_WORDS = 5
+DEFAULT_THRESHOLD = 0.8
+MAX_DOCUMENTS = 50_000
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+WORD_PATTERN = re.compile(r'\w+')
+
+# Fixed seed: signatures must stay comparable across restarts and workers
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, MAX_HASH, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, MAX_HASH, size=NUM_PERM, dtype=np.uint64)
+
+
+def minhash_signature(text: str) -> np.ndarray:
+    """
+    MinHash signature of a text's lowercase word shingles.
+
+    Args:
+        text: Document text
+
+    Returns:
+        uint32 array of NUM_PERM values (all MAX_HASH for empty text)
+    """
+    words = WORD_PATTERN.findall(text.lower())
+    if not words:
+        return np.full(NUM_PERM, MAX_HASH, dtype=np.uint32)
+
+    size = min(SHINGLE_WORDS, len(words))
+    shingles = {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little') for s in shingles),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+
+    # (a * h + b) mod p for every permutation and shingle; a, h < 2**32 so
+    # nothing overflows uint64
+    permuted = (np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % MERSENNE_PRIME
+    return (permuted & MAX_HASH).min(axis=1).astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.mean(a == b))
+
+
+class NearDuplicateIndex:
+    """
+    MinHash LSH index of document signatures.
+
+    Thread-safe (CPU stages run in worker threads).
+
+    Args:
+        threshold: Estimated Jaccard similarity for a near-duplicate verdict
+        max_documents: Oldest documents are evicted beyond this
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, max_documents: int = MAX_DOCUMENTS):
+        self.threshold = threshold
+        self.max_documents = max_documents
+        self._signatures: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._buckets: dict[tuple[int, bytes], set[str]] = {}
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _band_keys(self, signature: np.ndarray) -> list[tuple[int, bytes]]:
+        rows = NUM_PERM // BANDS
+        return [(band, signature[band * rows:(band + 1) * rows].tobytes()) for band in range(BANDS)]
+
+    def add(self, document_id: str, signature: np.ndarray):
+        """Add or replace a document's signature."""
+        with self._lock:
+            self._remove(document_id)
+            self._signatures[document_id] = signature
+            for key in self._band_keys(signature):
+                self._buckets.setdefault(key, set()).add(document_id)
+            while len(self._signatures) > self.max_documents:
+                self._remove(next(iter(self._signatures)))
+
+    def remove(self, document_id: str):
+        """Forget a document."""
+        with self._lock:
+            self._remove(document_id)
+
+    def _remove(self, document_id: str):
+        signature = self._signatures.pop(document_id, None)
+        if signature is None:
+            return
+        for key in self._band_keys(signature):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(document_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def query(
+        self,
+        signature: np.ndarray,
+        exclude: Optional[str] = None,
+        threshold: Optional[float] = None,
+    ) -> Optional[tuple[str, float]]:
+        """
+        Find the most similar indexed document above the threshold.
+
+        Args:
+            signature: Signature of the new document
+            exclude: Document ID to ignore (the document itself)
+            threshold: Override the index threshold
+
+        Returns:
+            (document_id, similarity) or None
+        """
+        threshold = self.threshold if threshold is None else threshold
+        with self._lock:
+            self.queries += 1
+            candidates = set()
+            for key in self._band_keys(signature):
+                candidates.update(self._buckets.get(key, ()))
+            candidates.discard(exclude)
+
+            best = None
+            for document_id in candidates:
+                score = similarity(signature, self._signatures[document_id])
+                if score >= threshold and (best is None or score > best[1]):
+                    best = (document_id, score)
+            if best is not None:
+                self.hits += 1
+            return best
+
+    def save(self, path: str):
+        """
+        Write the index to a JSON file, merged with the file's contents.
+
+        Documents in this index win over same-ID entries on disk. Written
+        to a temporary file and renamed, under an advisory lock on POSIX.
+        """
+        with _file_lock(path):
+            merged = OrderedDict()
+            if os.path.exists(path):
+                merged.update(_read(path))
+            with self._lock:
+                for document_id, signature in self._signatures.items():
+                    merged.pop(document_id, None)
+                    merged[document_id] = signature
+            while len(merged) > self.max_documents:
+                merged.popitem(last=False)
+
+            payload = {
+                'num_perm': NUM_PERM,
+                'shingle_words': SHINGLE_WORDS,
+                'documents': {doc_id: sig.tolist() for doc_id, sig in merged.items()},
+            }
+            directory = os.path.dirname(os.path.abspath(path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.near-duplicates-')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, path)
+
+    def load(self, path: str):
+        """Add every document from a file written by save()."""
+        for document_id, signature in _read(path).items():
+            self.add(document_id, signature)
+
+    def stats(self) -> dict:
+        """Counters for GET /metrics."""
+        return {
+            'documents': len(self._signatures),
+            'queries': self.queries,
+            'near_duplicates_found': self.hits,
+            'threshold': self.threshold,
+        }
+
+
+def _read(path: str) -> OrderedDict:
+    with open(path, encoding='utf-8') as f:
+        payload = json.load(f)
+    if payload.get('num_perm') != NUM_PERM or payload.get('shingle_words') != SHINGLE_WORDS:
+        raise ValueError(f"{path} was written with different MinHash settings")
+    return OrderedDict(
+        (doc_id, np.array(sig, dtype=np.uint32)) for doc_id, sig in payload['documents'].items()
+    )
+
+
+class _file_lock:
+    def __init__(self, path: str):
+        self.lock_path = path + '.lock'
+        self.handle = None
+
+    def __enter__(self):
+        if HAS_FCNTL:
+            self.handle = open(self.lock_path, 'w')
+            fcntl.flock(self.handle, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self.handle is not None:
+            fcntl.flock(self.handle, fcntl.LOCK_UN)
+            self.handle.close()
+
+
+class ResultCache:
+    """
+    Bounded LRU of results per (document ID, endpoint, options).
+
+    Args:
+        max_entries: Least recently used entries are dropped beyond this
+    """
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, document_id: str, options_key: str) -> Optional[Any]:
+        with self._lock:
+            key = (document_id, options_key)
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def put(self, document_id: str, options_key: str, result: Any):
+        with self._lock:
+            key = (document_id, options_key)
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Counters for GET /metrics."""
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,627 @@
+"""
+Pre-fork Worker Supervisor
+
+Runs the FastAPI app in N forked worker processes. The parent process imports main.py (and with it the spaCy model,
+dateparser locale data and compiled pattern tables) exactly once, then forks.
+Model weights and vectors are shared copy-on-write between workers instead
+of being loaded N times.
+
+Key Features:
+- Parent binds the socket(s) and loads the model, children only serve
+- gc.freeze() before forking so the collector doesn't dirty shared pages
+- On Linux one SO_REUSEPORT socket per worker, so the kernel spreads
+  connections evenly. Elsewhere workers share one socket, and under load
+  the busiest worker tends to accept most connections (see bench_workers.py
+  to measure scaling)
+- Dead workers are re-forked from the warm parent (with backoff)
+- Workers exit when the parent dies (PR_SET_PDEATHSIG on Linux, a getppid()
+  watchdog elsewhere) instead of lingering on the port as orphans
+- Worker recycling: after max_requests or above max_rss_mb of private
+  memory a worker drains its in-flight requests and exits, and a fresh
+  fork takes its place
+- Shared worker table with per-worker RSS, private memory and request
+  counts (GET /workers)
+
+POSIX only: on platforms without os.fork the service runs single-process.
+
+@version 1.0
+"""
+
+import gc
+import mmap
+import os
+import random
+import signal
+import socket
+import struct
+import sys
+import threading
+import time
+from typing import Optional
+
+import uvicorn
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+# =============================================================================
+# WORKER TABLE
+# =============================================================================
+
+# pid, index, started_at, requests, rss_kb, shared_kb, private_kb
+_SLOT = struct.Struct('qqdqqqq')
+
+# Minimum seconds between respawns of the same slot (crash-loop guard)
+RESPAWN_BACKOFF_S = 1.0
+
+# Minimum seconds between memory refreshes triggered by requests
+MEMORY_REFRESH_S = 1.0
+
+# Seconds a recycling worker keeps its open connections after it stops
+# accepting, so requests on just-accepted connections still get read
+RECYCLE_GRACE_S = 0.5
+
+# A worker recycled sooner than this after being forked is churning (limits
+# set too low); the parent backs off before forking its replacement
+RECYCLE_MIN_LIFETIME_S = 5.0
+
+# Worker exit code for an intentional recycle; anything else is unexpected
+# and respawned with RESPAWN_BACKOFF_S
+RECYCLE_EXIT_CODE = 64
+
+# Seconds between a worker's checks that its parent is still alive
+PARENT_CHECK_S = 1.0
+
+# prctl option: signal to deliver when the parent process dies (Linux)
+PR_SET_PDEATHSIG = 1
+
+_STOP_SIGNALS = {signal.SIGTERM, signal.SIGINT}
+
+
+class WorkerTable:
+    """
+    Fixed-size table of worker stats in anonymous shared memory.
+
+    Created by the parent before forking, so every worker sees the same
+    pages. Each worker only writes its own slot; any worker can read all of
+    them to answer GET /workers. Reads are not locked - a torn read only
+    ever shows slightly stale stats.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._buf = mmap.mmap(-1, _SLOT.size * size)
+
+    def write(self, index: int, pid: int, started_at: float, requests: int,
+              memory: dict):
+        _SLOT.pack_into(self._buf, index * _SLOT.size,
+                        pid, index, started_at, requests,
+                        memory['rss_kb'], memory['shared_kb'], memory['private_kb'])
+
+    def read(self, index: int) -> dict:
+        pid, idx, started_at, requests, rss_kb, shared_kb, private_kb = _SLOT.unpack_from(
+            self._buf, index * _SLOT.size
+        )
+        return {
+            'pid': pid,
+            'index': idx,
+            'started_at': started_at,
+            'requests': requests,
+            'rss_kb': rss_kb,
+            'shared_kb': shared_kb,
+            'private_kb': private_kb,
+        }
+
+    def clear(self, index: int):
+        self.write(index, 0, 0.0, 0, {'rss_kb': 0, 'shared_kb': 0, 'private_kb': 0})
+
+
+# =============================================================================
+# MEMORY
+# =============================================================================
+
+def current_memory_kb() -> dict:
+    """
+    Get memory usage of the current process in kilobytes.
+
+    RSS counts copy-on-write pages still shared with the parent, so it
+    overstates what each worker really costs. Where the platform can tell
+    us, `private_kb` is the memory unique to this process.
+
+    Returns:
+        Dict with rss_kb, shared_kb and private_kb
+    """
+    # Linux: smaps_rollup separates shared from private pages
+    try:
+        fields = {}
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(':'):
+                    fields[parts[0][:-1]] = int(parts[1])
+        shared = fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0)
+        private = fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)
+        return {'rss_kb': fields.get('Rss', 0), 'shared_kb': shared, 'private_kb': private}
+    except (OSError, ValueError):
+        pass
+
+    if HAS_PSUTIL:
+        info = psutil.Process().memory_info()
+        rss = info.rss // 1024
+        shared = getattr(info, 'shared', 0) // 1024
+        return {'rss_kb': rss, 'shared_kb': shared, 'private_kb': rss - shared}
+
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, kilobytes on Linux
+        rss = peak // 1024 if sys.platform == 'darwin' else peak
+        return {'rss_kb': rss, 'shared_kb': 0, 'private_kb': rss}
+
+    return {'rss_kb': 0, 'shared_kb': 0, 'private_kb': 0}
+
+
+# =============================================================================
+# WORKER STATE
+# =============================================================================
+
+class WorkerLimits:
+    """
+    When a worker should be recycled.
+
+    spaCy's StringStore/vocab and dateparser's caches only ever grow, so a
+    long-lived worker's RSS climbs without bound. Replacing the worker with
+    a fresh fork of the parent resets it to the shared baseline.
+
+    The memory limit applies to the worker's private memory, not its full
+    RSS: RSS includes the copy-on-write pages of the model shared with the
+    parent (hundreds of MB for en_core_web_lg), which a fresh worker
+    already has on its first request.
+
+    Limits are soft. Requests already accepted when a limit is hit - and
+    further requests on open keep-alive connections during
+    RECYCLE_GRACE_S - are still served, so a worker can finish a few
+    requests past max_requests before it exits.
+
+    Args:
+        max_requests: Recycle after this many requests (0 = no limit)
+        max_rss_mb: Recycle once private memory exceeds this many MB
+            (0 = no limit)
+        max_requests_jitter: Random extra requests added per worker so
+            workers started together don't all recycle at once
+    """
+
+    def __init__(self, max_requests: int = 0, max_rss_mb: int = 0,
+                 max_requests_jitter: int = 0):
+        self.max_requests = max_requests
+        self.max_rss_mb = max_rss_mb
+        self.max_requests_jitter = max_requests_jitter
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_requests > 0 or self.max_rss_mb > 0
+
+
+class WorkerState:
+    """Per-process state: which slot we own and how much we've served."""
+
+    def __init__(self, table: WorkerTable, index: int,
+                 limits: Optional[WorkerLimits] = None):
+        self.table = table
+        self.index = index
+        self.pid = os.getpid()
+        self.started_at = time.time()
+        self.requests = 0
+        self.memory = current_memory_kb()
+        self.memory_at = time.time()
+        self.server: Optional[uvicorn.Server] = None
+        self.recycling = False
+
+        limits = limits or WorkerLimits()
+        self.max_requests = limits.max_requests
+        if self.max_requests and limits.max_requests_jitter:
+            self.max_requests += random.randint(0, limits.max_requests_jitter)
+        self.max_rss_kb = limits.max_rss_mb * 1024
+
+        self.publish()
+
+    def refresh_memory(self, force: bool = False):
+        now = time.time()
+        if force or now - self.memory_at >= MEMORY_REFRESH_S:
+            self.memory = current_memory_kb()
+            self.memory_at = now
+
+    def publish(self):
+        self.table.write(self.index, self.pid, self.started_at, self.requests,
+                         self.memory)
+
+    def recycle_reason(self) -> Optional[str]:
+        """Which limit this worker has hit, if any."""
+        if self.max_requests and self.requests >= self.max_requests:
+            return f"served {self.requests} requests"
+        if self.max_rss_kb and self.memory['private_kb'] > self.max_rss_kb:
+            return f"private memory {self.memory['private_kb'] // 1024} MB over limit"
+        return None
+
+    def check_memory_baseline(self):
+        """
+        Disable the memory limit if a fresh worker is already over it.
+
+        Called after the first request. If the limit is at or below what a
+        worker needs just to serve, every worker would recycle right away
+        and the parent would fork in a loop.
+        """
+        if self.max_rss_kb and self.memory['private_kb'] >= self.max_rss_kb:
+            print(f"WARNING: --max-rss-mb {self.max_rss_kb // 1024} is at or below worker "
+                  f"{self.index}'s baseline of {self.memory['private_kb'] // 1024} MB "
+                  f"private memory; memory-based recycling disabled for this worker",
+                  file=sys.stderr, flush=True)
+            self.max_rss_kb = 0
+
+    def recycle(self, reason: str):
+        """
+        Stop accepting and exit once in-flight requests have finished.
+
+        Accepting stops first by dropping the listener from the event loop
+        (closing the asyncio Server outright races with connections it has
+        accepted but not yet attached, which then get reset). should_exit
+        follows after a short grace period; uvicorn then closes the
+        listener and waits for in-flight requests before server.run()
+        returns. The parent keeps the socket open (new connections go to
+        the other workers or queue in its backlog) and forks a replacement
+        when we exit.
+
+        Dropping the listener relies on asyncio's selector event loop.
+        Under other loops (uvloop, Windows proactor) we skip the grace
+        period and go straight to uvicorn's own shutdown, which may reset
+        a connection accepted in the same instant.
+
+        Must be called from the worker's event loop.
+        """
+        import asyncio
+
+        if self.recycling or self.server is None:
+            return
+        self.recycling = True
+        print(f"Worker {self.index} (pid {self.pid}) recycling: {reason}", flush=True)
+
+        server = self.server
+        loop = asyncio.get_running_loop()
+        if not isinstance(loop, asyncio.SelectorEventLoop):
+            server.should_exit = True
+            return
+
+        for listener in server.servers:
+            for sock in listener.sockets:
+                loop.remove_reader(sock.fileno())
+
+        loop.call_later(RECYCLE_GRACE_S, lambda: setattr(server, 'should_exit', True))
+
+
+# Set in each forked worker; a lazily created single slot otherwise
+_worker: Optional[WorkerState] = None
+_table: Optional[WorkerTable] = None
+_parent_pid: Optional[int] = None
+
+
+def is_prefork_worker() -> bool:
+    """Whether this process is a worker forked by serve_prefork()."""
+    return _parent_pid is not None
+
+
+def _local_worker() -> WorkerState:
+    global _worker
+    if _worker is None:
+        _worker = WorkerState(WorkerTable(1), 0)
+    return _worker
+
+
+def note_request():
+    """Record a finished request, refresh RSS and recycle if over a limit."""
+    worker = _local_worker()
+    worker.requests += 1
+    worker.refresh_memory(force=worker.requests == 1)
+    worker.publish()
+
+    if worker.requests == 1:
+        worker.check_memory_baseline()
+
+    reason = worker.recycle_reason()
+    if reason:
+        worker.recycle(reason)
+
+
+def worker_snapshot() -> dict:
+    """
+    Get stats for every live worker.
+
+    Returns:
+        Dict with mode, parent pid and one entry per worker (RSS, shared and
+        private memory, requests served, uptime)
+    """
+    worker = _local_worker()
+    # Refresh our own slot so this worker's figures are current
+    worker.refresh_memory(force=True)
+    worker.publish()
+
+    table = _table if _table is not None else worker.table
+    now = time.time()
+    workers = []
+    for index in range(table.size):
+        slot = table.read(index)
+        if not slot['pid']:
+            continue
+        workers.append({
+            'pid': slot['pid'],
+            'index': slot['index'],
+            'rss_mb': round(slot['rss_kb'] / 1024, 1),
+            'shared_mb': round(slot['shared_kb'] / 1024, 1),
+            'private_mb': round(slot['private_kb'] / 1024, 1),
+            'requests': slot['requests'],
+            'uptime_s': round(now - slot['started_at'], 1),
+        })
+
+    return {
+        'mode': 'prefork' if is_prefork_worker() else 'single',
+        'parent_pid': _parent_pid,
+        'current_pid': os.getpid(),
+        'workers': workers,
+        'total_rss_mb': round(sum(w['rss_mb'] for w in workers), 1),
+        'total_private_mb': round(sum(w['private_mb'] for w in workers), 1),
+    }
+
+
+def request_shutdown(delay: float = 0.5):
+    """
+    Shut the whole service down, not just the worker handling the request.
+
+    In prefork mode the parent is signalled and takes the workers down with
+    it; otherwise SIGTERM is raised in this process as before.
+    """
+    import asyncio
+
+    target = _parent_pid if is_prefork_worker() else os.getpid()
+    asyncio.get_event_loop().call_later(delay, lambda: os.kill(target, signal.SIGTERM))
+
+
+# =============================================================================
+# SUPERVISOR
+# =============================================================================
+
+def _bind_sockets(host: str, port: int, count: int) -> list[socket.socket]:
+    """
+    Bind the listening socket(s), one entry per worker slot.
+
+    On Linux each slot gets its own SO_REUSEPORT socket and the kernel
+    hashes new connections evenly across them. Elsewhere every slot shares
+    one socket; SO_REUSEPORT doesn't balance on macOS/BSD, and with a
+    shared socket whichever worker wakes first accepts, which under load
+    tends to favour the busiest worker.
+    """
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    per_worker = sys.platform.startswith('linux') and hasattr(socket, 'SO_REUSEPORT')
+
+    sockets = []
+    for _ in range(count if per_worker else 1):
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if per_worker:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind((host, port))
+        # Port 0: the rest of the group must bind the port we were given
+        port = sock.getsockname()[1]
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        sockets.append(sock)
+
+    return sockets if per_worker else sockets * count
+
+
+def _set_parent_death_signal():
+    """Ask Linux to SIGTERM this process when its parent dies."""
+    if not sys.platform.startswith('linux'):
+        return
+    try:
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.prctl(PR_SET_PDEATHSIG, signal.SIGTERM)
+    except (OSError, AttributeError):
+        pass
+
+
+def _watch_parent(server: uvicorn.Server, parent_pid: int):
+    """
+    Stop the worker if the parent goes away.
+
+    Covers platforms without PR_SET_PDEATHSIG (macOS): an orphaned worker
+    is re-parented, so getppid() changes. Runs in a daemon thread;
+    uvicorn's main loop polls should_exit.
+    """
+    while not server.should_exit:
+        if os.getppid() != parent_pid:
+            print(f"Worker {os.getpid()}: parent {parent_pid} is gone, shutting down",
+                  file=sys.stderr, flush=True)
+            server.should_exit = True
+            return
+        time.sleep(PARENT_CHECK_S)
+
+
+def _run_worker(app, sockets: list[socket.socket], index: int, parent_pid: int,
+                log_level: str, limits: Optional[WorkerLimits]):
+    """
+    Body of a forked worker. Never returns.
+
+    Exit codes: RECYCLE_EXIT_CODE after an intentional recycle, 0 after a
+    normal shutdown, nonzero on crash or startup failure (uvicorn calls
+    sys.exit(3) when the app's startup fails).
+    """
+    global _worker, _parent_pid
+
+    _parent_pid = parent_pid
+    exit_code = 1
+    try:
+        # Drop the parent's handlers (uvicorn installs its own graceful
+        # ones), then unblock the signals the parent masked around fork()
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, _STOP_SIGNALS)
+
+        _set_parent_death_signal()
+        if os.getppid() != parent_pid:
+            # Parent died before prctl took effect
+            raise SystemExit(1)
+
+        sock = sockets[index]
+        for other in set(sockets) - {sock}:
+            other.close()
+
+        _worker = WorkerState(_table, index, limits)
+        config = uvicorn.Config(app, log_level=log_level)
+        server = uvicorn.Server(config)
+        _worker.server = server
+        threading.Thread(target=_watch_parent, args=(server, parent_pid), daemon=True).start()
+
+        server.run(sockets=[sock])
+
+        if not server.started:
+            print(f"Worker {index} (pid {os.getpid()}) failed to start", file=sys.stderr)
+            exit_code = 1
+        elif _worker.recycling:
+            exit_code = RECYCLE_EXIT_CODE
+        else:
+            exit_code = 0
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else 1
+    except BaseException as e:
+        print(f"Worker {index} (pid {os.getpid()}) crashed: {e!r}", file=sys.stderr)
+        exit_code = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(exit_code)
+
+
+def serve_prefork(app, host: str, port: int, workers: int, log_level: str = 'info',
+                  limits: Optional[WorkerLimits] = None):
+    """
+    Serve the app from `workers` forked processes.
+
+    Must be called after the model has been loaded (i.e. after importing
+    main.py) so the children inherit it. Blocks until SIGTERM/SIGINT, then
+    stops all workers gracefully. Also used with workers=1 when recycling
+    limits are set, since a worker can only be replaced by a supervisor.
+
+    The parent keeps every listening socket open for the life of the
+    service, so connections arriving while a slot's worker is being
+    replaced wait in that socket's backlog instead of being refused.
+
+    Args:
+        app: ASGI application to serve
+        host: Host to bind to
+        port: Port to bind to (0 picks a free port)
+        workers: Number of worker processes
+        log_level: uvicorn log level for the workers
+        limits: Optional recycling limits applied to every worker
+    """
+    global _table
+
+    if not hasattr(os, 'fork'):
+        print("Pre-fork mode needs os.fork; running a single process instead")
+        if limits is not None and limits.enabled:
+            print("WARNING: worker recycling (--max-requests / --max-rss-mb) is not "
+                  "available on this platform; limits ignored", file=sys.stderr)
+        uvicorn.run(app, host=host, port=port, log_level=log_level)
+        return
+
+    sockets = _bind_sockets(host, port, workers)
+    port = sockets[0].getsockname()[1]
+    _table = WorkerTable(workers)
+    parent_pid = os.getpid()
+
+    # Move everything loaded so far (model, vocab, pattern tables) into the
+    # permanent generation so collections in the workers don't touch it
+    gc.collect()
+    gc.freeze()
+
+    children: dict[int, int] = {}  # pid -> slot index
+    last_spawn: dict[int, float] = {}
+    stopping = False
+
+    def spawn(index: int, backoff: bool = False):
+        since = time.time() - last_spawn.get(index, 0.0)
+        if backoff and since < RESPAWN_BACKOFF_S:
+            time.sleep(RESPAWN_BACKOFF_S - since)
+        if stopping:
+            return
+        last_spawn[index] = time.time()
+
+        # Hold SIGTERM/SIGINT until the child is registered, otherwise
+        # stop() could run in between and never signal it
+        signal.pthread_sigmask(signal.SIG_BLOCK, _STOP_SIGNALS)
+        try:
+            pid = os.fork()
+            if pid == 0:
+                _run_worker(app, sockets, index, parent_pid, log_level, limits)
+            children[pid] = index
+        finally:
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, _STOP_SIGNALS)
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    mode = 'SO_REUSEPORT' if len(set(sockets)) > 1 else 'shared socket'
+    print(f"Pre-fork parent {parent_pid} starting {workers} workers ({mode}) "
+          f"on http://{host}:{port}", flush=True)
+    for index in range(workers):
+        spawn(index)
+
+    while children:
+        try:
+            pid, status = os.waitpid(-1, 0)
+        except InterruptedError:
+            continue
+        except ChildProcessError:
+            break
+
+        index = children.pop(pid, None)
+        if index is None:
+            continue
+        _table.clear(index)
+
+        if stopping:
+            continue
+
+        code = os.waitstatus_to_exitcode(status)
+        lifetime = time.time() - last_spawn.get(index, 0.0)
+        if code == RECYCLE_EXIT_CODE:
+            churning = lifetime < RECYCLE_MIN_LIFETIME_S
+            if churning:
+                print(f"WARNING: worker {index} recycled after {lifetime:.1f}s; recycling "
+                      f"limits look too low, backing off", file=sys.stderr, flush=True)
+            else:
+                print(f"Worker {index} (pid {pid}) recycled, forking a fresh one", flush=True)
+            spawn(index, backoff=churning)
+        else:
+            print(f"Worker {index} (pid {pid}) exited with {code}, respawning", flush=True)
+            spawn(index, backoff=True)
+
+    for sock in set(sockets):
+        sock.close()
+    print("Pre-fork parent stopped", flush=True)
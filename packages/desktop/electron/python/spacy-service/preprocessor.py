@@ -7,19 +7,30 @@ to create structured context packages for LLM extraction.
 Key Features:
 - Sentence-level relevancy classification
 - Verb detection with category mapping
-- Entity extraction with type inference
+- Entity extraction with type inference (keyword tables compiled into
+  single-scan matchers, see keyword_matcher.py)
 - Profile candidate identification
-- Context building for LLM prompts
+- Memoized per-sentence analysis for boilerplate shared across pages
+- Near-duplicate sentence removal using the model's static word vectors
+- Context building for LLM prompts (sentence cap or token budget)
 
 @version 1.0
 """
 
 import re
+from functools import lru_cache
 from typing import Optional
 
+import numpy as np
 import spacy
+from spacy.attrs import IS_PUNCT, IS_STOP, LOWER, ORTH
 
 from verb_patterns import find_verbs_in_text, calculate_verb_relevancy
+from sentence_cache import SentenceMemo
+from keyword_matcher import NOT_SCANNED, KeywordMatcher
+
+# Per-sentence analysis shared across documents (see sentence_cache.py)
+sentence_memo = SentenceMemo()
 
 # =============================================================================
 # ROLE/TYPE INFERENCE KEYWORDS
@@ -54,11 +65,18 @@ COMPANY_RELATIONSHIP_KEYWORDS: dict[str, list[str]] = {
     'demolisher': ['demolished', 'razed', 'torn down']
 }
 
+PERSON_ROLE_MATCHER = KeywordMatcher(PERSON_ROLE_KEYWORDS)
+ORG_TYPE_MATCHER = KeywordMatcher(ORG_TYPE_KEYWORDS)
+COMPANY_RELATIONSHIP_MATCHER = KeywordMatcher(COMPANY_RELATIONSHIP_KEYWORDS)
+
 
 def preprocess_text(
     text: str,
     nlp,
-    article_date: Optional[str] = None
+    article_date: Optional[str] = None,
+    doc=None,
+    deadline=None,
+    dedupe_threshold: Optional[float] = None
 ) -> dict:
     """
     Preprocess text for LLM extraction.
@@ -73,13 +91,22 @@ def preprocess_text(
         text: Raw text to preprocess
         nlp: Loaded spaCy model
         article_date: Optional article date for context
+        doc: Already-parsed Doc for `text` (e.g. from the micro-batcher);
+            parsed with `nlp` if omitted
+        deadline: Optional deadline.Deadline; checked before each sentence,
+            remaining sentences are skipped once it has passed
+        dedupe_threshold: Cosine similarity above which a sentence is
+            marked as a duplicate of a higher-priority one (duplicate_of)
+            and left out of the LLM context; None disables
 
     Returns:
         Structured preprocessing result
     """
-    doc = nlp(text)
+    if doc is None:
+        doc = nlp(text)
 
     sentences = []
+    sentence_spans = []  # (start, end) token offsets, parallel to sentences
     timeline_candidates = []
     profile_candidates = {'people': [], 'organizations': []}
 
@@ -88,10 +115,15 @@ def preprocess_text(
     seen_orgs = {}
 
     for sent in doc.sents:
+        if deadline is not None and deadline.expired():
+            break
+
         sent_text = sent.text.strip()
         if not sent_text or len(sent_text) < 10:
             continue
 
+        memo = sentence_memo.entry(sent_text)
+
         # Get entities in this sentence
         entities = []
         has_date = False
@@ -112,16 +144,17 @@ def preprocess_text(
                     has_date = True
                 elif ent.label_ == 'PERSON':
                     has_person = True
-                    _track_person(seen_people, ent.text, sent_text)
+                    _track_person(seen_people, ent.text, sent_text, memo)
                 elif ent.label_ == 'ORG':
                     has_org = True
-                    _track_org(seen_orgs, ent.text, sent_text)
+                    _track_org(seen_orgs, ent.text, sent_text, memo)
 
         # Find verbs in sentence
-        verbs = find_verbs_in_text(sent_text)
+        verbs = _memoized(memo, 'verbs', lambda: find_verbs_in_text(sent_text))
 
         # Calculate relevancy
-        relevancy, confidence = calculate_verb_relevancy(verbs, has_date)
+        relevancy, confidence = _memoized(
+            memo, ('relevancy', has_date), lambda: calculate_verb_relevancy(verbs, has_date))
 
         # Override for profile-only sentences
         if relevancy == 'context' and (has_person or has_org):
@@ -137,14 +170,19 @@ def preprocess_text(
             'confidence': round(confidence, 2),
             'has_date': has_date,
             'has_person': has_person,
-            'has_org': has_org
+            'has_org': has_org,
+            'duplicate_of': None
         }
         sentences.append(sentence_data)
+        sentence_spans.append((sent.start, sent.end))
 
         # Track timeline candidates
         if relevancy in ('timeline', 'timeline_possible'):
             timeline_candidates.append(sentence_data)
 
+    if dedupe_threshold is not None:
+        mark_duplicate_sentences(doc, sentences, sentence_spans, dedupe_threshold)
+
     # Build profile candidates from tracked entities
     profile_candidates['people'] = _build_people_profiles(seen_people)
     profile_candidates['organizations'] = _build_org_profiles(seen_orgs)
@@ -155,7 +193,8 @@ def preprocess_text(
         'timeline_relevant': len([s for s in sentences if s['relevancy'] in ('timeline', 'timeline_possible')]),
         'profile_relevant': len([s for s in sentences if s['relevancy'] == 'profile']),
         'total_people': len(profile_candidates['people']),
-        'total_organizations': len(profile_candidates['organizations'])
+        'total_organizations': len(profile_candidates['organizations']),
+        'duplicate_sentences': len([s for s in sentences if s['duplicate_of'] is not None])
     }
 
     return {
@@ -167,9 +206,100 @@ def preprocess_text(
     }
 
 
-def _track_person(seen: dict, name: str, context: str):
+# Keep order when deciding which of two near-duplicates survives
+RELEVANCY_PRIORITY = {'timeline': 0, 'timeline_possible': 1, 'profile': 2, 'context': 3}
+
+
+def sentence_vectors(doc, spans: list[tuple[int, int]]) -> np.ndarray:
+    """
+    Mean static word vector per sentence, in one vectorized pass.
+
+    Punctuation, stop words and out-of-vocabulary tokens are left out.
+
+    Args:
+        doc: Parsed Doc
+        spans: (start, end) token offsets of the sentences
+
+    Returns:
+        Array of shape (len(spans), vector width); all-zero rows for
+        sentences with no usable tokens
+    """
+    vectors = doc.vocab.vectors
+    width = vectors.shape[1]
+    if not spans or not len(doc):
+        return np.zeros((len(spans), width), dtype='float32')
+
+    attrs = doc.to_array([ORTH, LOWER, IS_PUNCT, IS_STOP])
+    rows = vectors.find(keys=attrs[:, 0])
+    missing = rows < 0
+    if missing.any():
+        rows[missing] = vectors.find(keys=attrs[missing, 1])
+
+    usable = (rows >= 0) & (attrs[:, 2] == 0) & (attrs[:, 3] == 0)
+    # One spare zero row so a sentence ending at the last token is a valid index
+    token_vectors = np.zeros((len(doc) + 1, width), dtype='float32')
+    token_vectors[:-1][usable] = vectors.data[rows[usable]]
+    token_counts = np.append(usable, False).astype('float32')
+
+    # Sentences are disjoint, non-empty and ordered, so reduceat over
+    # [start0, end0, start1, end1, ...] leaves each sentence's sum at the
+    # even positions
+    bounds = np.array([offset for span in spans for offset in span], dtype='int64')
+    sums = np.add.reduceat(token_vectors, bounds, axis=0)[::2]
+    counts = np.add.reduceat(token_counts, bounds)[::2]
+    return sums / np.maximum(counts, 1)[:, None]
+
+
+def mark_duplicate_sentences(doc, sentences: list[dict], spans: list[tuple[int, int]], threshold: float):
+    """
+    Set duplicate_of on sentences that repeat a higher-priority sentence.
+
+    Sentences are visited by relevancy, confidence, then position; each is
+    kept unless its vector's cosine similarity to an already kept sentence
+    exceeds threshold, in which case duplicate_of is that sentence's index
+    in `sentences`.
+
+    Args:
+        doc: Parsed Doc the sentences came from
+        sentences: preprocess_text sentence dicts (updated in place)
+        spans: (start, end) token offsets, parallel to sentences
+        threshold: Cosine similarity cut-off (e.g. 0.92)
+    """
+    if not sentences or doc.vocab.vectors.shape[0] == 0 or doc.vocab.vectors.mode != 'default':
+        return
+
+    matrix = sentence_vectors(doc, spans)
+    norms = np.linalg.norm(matrix, axis=1)
+    unit = matrix / np.where(norms > 0, norms, 1)[:, None]
+
+    order = sorted(
+        range(len(sentences)),
+        key=lambda i: (RELEVANCY_PRIORITY.get(sentences[i]['relevancy'], 4), -sentences[i]['confidence'], i)
+    )
+
+    kept = np.empty(len(sentences), dtype='int64')
+    kept_count = 0
+    for i in order:
+        if norms[i] > 0 and kept_count:
+            similarity = unit[kept[:kept_count]] @ unit[i]
+            best = int(np.argmax(similarity))
+            if similarity[best] > threshold:
+                sentences[i]['duplicate_of'] = int(kept[best])
+                continue
+        kept[kept_count] = i
+        kept_count += 1
+
+
+def _memoized(memo: dict, key, compute):
+    """Get memo[key], computing and storing it on first use."""
+    if key not in memo:
+        memo[key] = compute()
+    return memo[key]
+
+
+def _track_person(seen: dict, name: str, context: str, memo: Optional[dict] = None):
     """Track a person entity with their contexts."""
-    name_key = _normalize_name(name)
+    name_key = normalize_name(name)
 
     if name_key not in seen:
         seen[name_key] = {
@@ -180,15 +310,15 @@ def _track_person(seen: dict, name: str, context: str):
 
     seen[name_key]['contexts'].append(context)
 
-    # Infer role from context
-    role = _infer_person_role(context, name)
+    # Infer role from context (depends on the sentence only)
+    role = _memoized(memo if memo is not None else {}, 'person_role', lambda: _infer_person_role(context, name))
     if role:
         seen[name_key]['roles'].add(role)
 
 
-def _track_org(seen: dict, name: str, context: str):
+def _track_org(seen: dict, name: str, context: str, memo: Optional[dict] = None):
     """Track an organization entity with their contexts."""
-    name_key = _normalize_name(name)
+    name_key = normalize_name(name)
 
     if name_key not in seen:
         seen[name_key] = {
@@ -200,22 +330,33 @@ def _track_org(seen: dict, name: str, context: str):
 
     seen[name_key]['contexts'].append(context)
 
-    # Infer type and relationship
-    org_type = _infer_org_type(context, name)
+    # Infer type (sentence + name) and relationship (sentence only); the
+    # sentence is scanned for type keywords once for all orgs in it
+    memo = memo if memo is not None else {}
+    context_rank = _memoized(memo, 'org_type_context_rank', lambda: ORG_TYPE_MATCHER.rank(context))
+    org_type = _memoized(memo, ('org_type', name), lambda: _infer_org_type(context, name, context_rank))
     if org_type:
         seen[name_key]['types'].add(org_type)
 
-    relationship = _infer_org_relationship(context)
+    relationship = _memoized(memo, 'org_relationship', lambda: _infer_org_relationship(context))
     if relationship:
         seen[name_key]['relationships'].add(relationship)
 
 
-def _normalize_name(name: str) -> str:
+# Names repeat within and across documents; memoized per worker process
+NAME_CACHE_SIZE = 50_000
+
+NAME_TITLE_PATTERN = re.compile(r'\b(mr|mrs|ms|dr|jr|sr|i{1,3}|iv|v)\b\.?', re.IGNORECASE)
+NAME_INITIAL_PATTERN = re.compile(r'\b[a-z]\.\s*', re.IGNORECASE)
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def normalize_name(name: str) -> str:
     """Normalize a name for deduplication."""
     # Remove titles
-    name = re.sub(r'\b(mr|mrs|ms|dr|jr|sr|i{1,3}|iv|v)\b\.?', '', name, flags=re.IGNORECASE)
+    name = NAME_TITLE_PATTERN.sub('', name)
     # Remove middle initials
-    name = re.sub(r'\b[a-z]\.\s*', '', name, flags=re.IGNORECASE)
+    name = NAME_INITIAL_PATTERN.sub('', name)
     # Handle "Last, First" format
     if ',' in name:
         parts = name.split(',', 1)
@@ -228,35 +369,22 @@ def _normalize_name(name: str) -> str:
 
 def _infer_person_role(context: str, name: str) -> Optional[str]:
     """Infer a person's role from context."""
-    context_lower = context.lower()
-
-    for role, keywords in PERSON_ROLE_KEYWORDS.items():
-        if any(kw in context_lower for kw in keywords):
-            return role
-
-    return None
+    return PERSON_ROLE_MATCHER.first(context)
 
 
-def _infer_org_type(context: str, name: str) -> Optional[str]:
-    """Infer an organization's type from context and name."""
-    combined = f"{context} {name}".lower()
-
-    for org_type, keywords in ORG_TYPE_KEYWORDS.items():
-        if any(kw in combined for kw in keywords):
-            return org_type
+def _infer_org_type(context: str, name: str, context_rank=NOT_SCANNED) -> Optional[str]:
+    """
+    Infer an organization's type from context and name.
 
-    return None
+    Matches keywords in f"{context} {name}"; pass context_rank
+    (ORG_TYPE_MATCHER.rank(context)) to skip rescanning the context.
+    """
+    return ORG_TYPE_MATCHER.category(ORG_TYPE_MATCHER.rank_joined(context, name, left_rank=context_rank))
 
 
 def _infer_org_relationship(context: str) -> Optional[str]:
     """Infer an organization's relationship to the location."""
-    context_lower = context.lower()
-
-    for relationship, keywords in COMPANY_RELATIONSHIP_KEYWORDS.items():
-        if any(kw in context_lower for kw in keywords):
-            return relationship
-
-    return None
+    return COMPANY_RELATIONSHIP_MATCHER.first(context)
 
 
 def _build_people_profiles(seen: dict) -> list[dict]:
@@ -317,18 +445,95 @@ def build_llm_context(preprocessing_result: dict, max_sentences: int = 20) -> st
 
     # Add timeline candidates first
     timeline = preprocessing_result.get('timeline_candidates', [])
-    for sent in timeline[:max_sentences // 2]:
-        verb_info = ', '.join([f"{v['text']}({v['category']})" for v in sent['verbs']])
-        lines.append(f"[TIMELINE: {verb_info}] {sent['text']}")
+    for sent in [s for s in timeline if s.get('duplicate_of') is None][:max_sentences // 2]:
+        lines.append(_timeline_line(sent))
 
     # Add remaining relevant sentences
     remaining = max_sentences - len(lines)
-    other_sentences = [
+    for sent in _context_sentences(preprocessing_result)[:remaining]:
+        lines.append(_context_line(sent))
+
+    return '\n'.join(lines)
+
+
+def build_llm_context_for_budget(preprocessing_result: dict, max_tokens: int) -> tuple[str, int]:
+    """
+    Build the LLM context within a token budget instead of a sentence cap.
+
+    Sentences are considered by priority (timeline first, then context)
+    and confidence; each one that still fits is taken, so one long
+    sentence doesn't crowd out several short ones. The packed lines keep
+    the usual layout: timeline lines, then context lines, each in
+    document order.
+
+    Args:
+        preprocessing_result: Output from preprocess_text
+        max_tokens: Token budget (see estimate_tokens)
+
+    Returns:
+        (context string, estimated tokens used)
+    """
+    candidates = []
+    timeline = [s for s in preprocessing_result.get('timeline_candidates', []) if s.get('duplicate_of') is None]
+    for order, sent in enumerate(timeline):
+        candidates.append((0, -sent['confidence'], order, _timeline_line(sent)))
+    for order, sent in enumerate(_context_sentences(preprocessing_result)):
+        candidates.append((1, -sent['confidence'], order, _context_line(sent)))
+    candidates.sort()
+
+    chosen = []
+    used = 0
+    for priority, _, order, line in candidates:
+        cost = estimate_tokens(line)
+        if used + cost <= max_tokens:
+            chosen.append((priority, order, line))
+            used += cost
+
+    chosen.sort()
+    return '\n'.join(line for _, _, line in chosen), used
+
+
+def _timeline_line(sent: dict) -> str:
+    verb_info = ', '.join([f"{v['text']}({v['category']})" for v in sent['verbs']])
+    return f"[TIMELINE: {verb_info}] {sent['text']}"
+
+
+def _context_line(sent: dict) -> str:
+    return f"[CONTEXT] {sent['text']}"
+
+
+def _context_sentences(preprocessing_result: dict) -> list[dict]:
+    return [
         s for s in preprocessing_result.get('sentences', [])
-        if s['relevancy'] == 'profile' or (s['relevancy'] == 'context' and s['confidence'] > 0.5)
+        if s.get('duplicate_of') is None
+        and (s['relevancy'] == 'profile' or (s['relevancy'] == 'context' and s['confidence'] > 0.5))
     ]
 
-    for sent in other_sentences[:remaining]:
-        lines.append(f"[CONTEXT] {sent['text']}")
 
-    return '\n'.join(lines)
+# =============================================================================
+# TOKEN ESTIMATE
+# =============================================================================
+
+# Roughly how BPE tokenizers split English: words, digit groups of up to
+# three, and each punctuation mark
+TOKEN_PIECE_PATTERN = re.compile(r'[^\W\d_]+|\d{1,3}|[^\w\s]|_')
+
+# Long words cost an extra token per this many characters
+CHARS_PER_WORD_TOKEN = 6
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Fast local estimate of how many LLM tokens text will use.
+
+    Close to common BPE tokenizers on English prose, without loading
+    one. Additive over lines, so per-line costs sum to the cost of the
+    joined context.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count
+    """
+    return sum(1 + (len(piece) - 1) // CHARS_PER_WORD_TOKEN for piece in TOKEN_PIECE_PATTERN.findall(text))
@@ -0,0 +1,265 @@
+"""
+Regex Backends
+
+Lets the false-positive pattern table run on RE2, whose matching time is
+linear in the input, instead of Python's backtracking `re`. Scraped pages
+full of digits and punctuation can make backtracking patterns crawl; with
+RE2 one bad page cannot stall an import.
+
+Key Features:
+- 'python' (default, stdlib re) and 're2' (optional google-re2) backends
+- Same finditer() / match span interface for both
+- RE2 has no lookarounds, so a trailing lookahead is split off:
+  - (?=X) becomes a consumed group, the match ends where X starts
+  - (?!X) is checked afterwards with an anchored Python match of X; when
+    it rejects a match, the original pattern is tried anchored at that
+    start so results stay identical to Python's backtracking
+- Patterns RE2 cannot express at all stay on Python (see LinearPattern.engine)
+- Same results as Python on non-ASCII text (see ascii_shadow)
+
+Install the optional backend with: pip install google-re2
+
+@version 1.0
+"""
+
+import re
+import threading
+from typing import Iterator, Optional
+
+try:
+    import re2
+    HAS_RE2 = True
+except ImportError:
+    HAS_RE2 = False
+
+BACKENDS = ('python', 're2')
+DEFAULT_BACKEND = 'python'
+
+LOOKAROUND_PATTERN = re.compile(r'\(\?(?:=|!|<=|<!)')
+
+# =============================================================================
+# ASCII SHADOW TEXT
+# =============================================================================
+#
+# Python's \b, \w, \d, \s and IGNORECASE are Unicode-aware; RE2's are ASCII.
+# Rather than translate every class, RE2 runs over an ASCII "shadow" of the
+# text: same length, every character replaced by an ASCII character that
+# Python's classes treat the same way. Offsets carry over unchanged, and
+# as bytes the shadow is searched without re-encoding on every call.
+
+# Non-ASCII characters used literally by patterns get private stand-ins
+LITERAL_STAND_INS = {'×': '\x01'}
+
+# ASCII characters that must not be left as themselves: Python's \s
+# includes \v and \x1c-\x1f (RE2's doesn't), and the stand-in codes
+SPECIAL_ASCII = re.compile(r'[\x01-\x08\x0b\x1c-\x1f]')
+
+ASCII_LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+
+
+def _shadow_char(char: str) -> str:
+    if char in LITERAL_STAND_INS:
+        return LITERAL_STAND_INS[char]
+    if char.isascii() and not SPECIAL_ASCII.match(char):
+        return char
+    if re.match(r'\s', char):
+        return '\t'
+    if '\x01' <= char <= '\x08':
+        return '\x7f'
+    # e.g. KELVIN SIGN matches 'k' under re.IGNORECASE
+    for letter in ASCII_LETTERS:
+        if re.fullmatch(letter, char, re.IGNORECASE):
+            return letter
+    if re.match(r'\d', char):
+        return '0'
+    if re.match(r'\w', char):
+        return '_'
+    return '\x7f'
+
+
+class _ShadowTable(dict):
+    """str.translate() table, filled in as new characters are seen."""
+
+    def __missing__(self, code: int) -> str:
+        value = self[code] = _shadow_char(chr(code))
+        return value
+
+
+_SHADOW_TABLE = _ShadowTable()
+_last_shadow = threading.local()
+
+
+def ascii_shadow(text: str) -> bytes:
+    """
+    ASCII stand-in for text, same length, for RE2 (see section comment).
+
+    The last result per thread is reused, since every pattern in the
+    table runs over the same text in turn.
+    """
+    if getattr(_last_shadow, 'text', None) is text:
+        return _last_shadow.shadow
+    if text.isascii() and not SPECIAL_ASCII.search(text):
+        shadow = text.encode('ascii')
+    else:
+        shadow = text.translate(_SHADOW_TABLE).encode('ascii')
+    _last_shadow.text = text
+    _last_shadow.shadow = shadow
+    return shadow
+
+
+def _shadow_pattern(pattern: str) -> str:
+    for char, stand_in in LITERAL_STAND_INS.items():
+        pattern = pattern.replace(char, '\\x%02x' % ord(stand_in))
+    return pattern
+
+
+# =============================================================================
+# PATTERNS
+# =============================================================================
+
+class Span:
+    """Minimal match object: what the pattern table's callers use."""
+
+    __slots__ = ('_start', '_end', '_text')
+
+    def __init__(self, text: str, start: int, end: int):
+        self._text = text
+        self._start = start
+        self._end = end
+
+    def start(self) -> int:
+        return self._start
+
+    def end(self) -> int:
+        return self._end
+
+    def span(self) -> tuple[int, int]:
+        return self._start, self._end
+
+    def group(self) -> str:
+        return self._text[self._start:self._end]
+
+
+def split_trailing_lookahead(pattern: str) -> tuple[str, Optional[str], bool]:
+    """
+    Split a top-level lookahead off the end of a pattern.
+
+    Args:
+        pattern: Regex source
+
+    Returns:
+        (body, lookahead, negative); lookahead is None when the pattern
+        doesn't end in (?=...) or (?!...)
+    """
+    stack = []
+    last_group = None
+    i = 0
+    in_class = False
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            i += 2
+            continue
+        if in_class:
+            if char == ']':
+                in_class = False
+        elif char == '[':
+            in_class = True
+            # A ']' straight after '[' or '[^' is literal
+            if pattern[i + 1:i + 2] == '^':
+                i += 1
+            if pattern[i + 1:i + 2] == ']':
+                i += 1
+        elif char == '(':
+            stack.append(i)
+        elif char == ')' and stack:
+            start = stack.pop()
+            if not stack:
+                last_group = (start, i)
+        i += 1
+
+    if last_group is None or last_group[1] != len(pattern) - 1:
+        return pattern, None, False
+    start, end = last_group
+    opener = pattern[start:start + 3]
+    if opener not in ('(?=', '(?!'):
+        return pattern, None, False
+    return pattern[:start], pattern[start + 3:end], opener == '(?!'
+
+
+class LinearPattern:
+    """
+    A pattern compiled for the requested backend.
+
+    Args:
+        pattern: Regex source (Python syntax)
+        flags: re flags; only re.IGNORECASE is carried over to RE2
+        backend: 'python' or 're2'
+
+    Attributes:
+        engine: Backend actually used ('python', 're2', or 're2+check'
+            when a negative lookahead is verified in Python)
+    """
+
+    def __init__(self, pattern: str, flags: int = 0, backend: str = DEFAULT_BACKEND):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown regex backend '{backend}', expected one of {', '.join(BACKENDS)}")
+        if backend == 're2' and not HAS_RE2:
+            raise ImportError("The re2 regex backend needs google-re2: pip install google-re2")
+
+        self.pattern = pattern
+        self._python = re.compile(pattern, flags)
+        self._re2 = None
+        self._reject = None
+        self.engine = 'python'
+
+        if backend != 're2':
+            return
+
+        body, lookahead, negative = split_trailing_lookahead(pattern)
+        if LOOKAROUND_PATTERN.search(body) or (lookahead and LOOKAROUND_PATTERN.search(lookahead)):
+            return  # Not expressible in RE2; stays on Python
+
+        prefix = '(?i)' if flags & re.IGNORECASE else ''
+        body = _shadow_pattern(body)
+        if lookahead is None:
+            self._re2 = re2.compile(f'{prefix}({body})')
+            self.engine = 're2'
+        elif negative:
+            self._re2 = re2.compile(f'{prefix}({body})')
+            self._reject = re.compile(lookahead, flags)
+            self.engine = 're2+check'
+        else:
+            self._re2 = re2.compile(f'{prefix}({body})(?:{_shadow_pattern(lookahead)})')
+            self.engine = 're2'
+
+    def finditer(self, text: str) -> Iterator:
+        """Non-overlapping matches, left to right, like re.finditer."""
+        if self._re2 is None:
+            yield from self._python.finditer(text)
+            return
+
+        shadow = ascii_shadow(text)
+        pos = 0
+        while pos <= len(text):
+            match = self._re2.search(shadow, pos)
+            if match is None:
+                return
+            start, end = match.span(1)
+
+            if self._reject is not None and self._reject.match(text, end):
+                # Python would have backtracked to a shorter match here, or
+                # moved on; ask it directly, anchored at this start
+                anchored = self._python.match(text, start)
+                if anchored is None:
+                    pos = start + 1
+                    continue
+                start, end = anchored.span()
+
+            yield Span(text, start, end)
+            pos = end if end > start else end + 1
+
+
+def compile_pattern(pattern: str, flags: int = 0, backend: str = DEFAULT_BACKEND) -> LinearPattern:
+    """Compile a pattern for the given backend (see LinearPattern)."""
+    return LinearPattern(pattern, flags, backend)
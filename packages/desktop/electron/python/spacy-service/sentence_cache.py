@@ -0,0 +1,81 @@
+"""
+Sentence Memo Cache
+
+Pages from one archive site share disclaimers, captions and footers, and
+preprocess_text() used to re-analyze those sentences on every page. The
+per-sentence results that don't depend on the rest of the document
+(verbs, relevancy, inferred roles, types and relationships) are memoized
+here, keyed by a hash of the sentence text.
+
+Key Features:
+- Bounded LRU (least recently used sentences evicted first)
+- Entries are plain dicts filled in lazily by the caller, so only what a
+  sentence actually needed is computed and stored
+- Thread-safe (preprocessing runs in worker threads)
+- Hit rate for GET /metrics
+
+@version 1.0
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+class SentenceMemo:
+    """
+    LRU of per-sentence analysis.
+
+    Args:
+        max_entries: Sentences kept; 0 disables the cache (every lookup
+            returns a fresh, unstored entry)
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def entry(self, sentence: str) -> dict:
+        """
+        Memo entry for a sentence, created empty on a miss.
+
+        Callers store results under their own keys; values must be treated
+        as read-only since other documents share them.
+        """
+        if self.max_entries <= 0:
+            return {}
+        key = hashlib.blake2b(sentence.encode('utf-8'), digest_size=16).digest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+            entry = self._entries[key] = {}
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return entry
+
+    def resize(self, max_entries: int):
+        """Change the bound, evicting as needed."""
+        with self._lock:
+            self.max_entries = max_entries
+            while len(self._entries) > max(max_entries, 0):
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Counters for GET /metrics."""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+        }
@@ -0,0 +1,160 @@
+"""
+Document Sessions
+
+The Electron UI often asks for several views of one article (extraction,
+preprocess with different maxSentences, the LLM context again after a
+settings change), and every request used to reparse the text. A session
+holds the parsed Doc and the tables derived from it, so later views of
+the same document are served without reparsing.
+
+Key Features:
+- Handles expire after ttl_s without access
+- Memory bounded: least recently used sessions are evicted once the
+  estimated size of all sessions exceeds max_bytes (or max_sessions)
+- Derived tables (masked text, dates, entities, preprocess results) are
+  computed on first use and kept with the session
+- Sessions live in one worker process: in pre-fork mode a handle is only
+  valid on the worker that created it (the ID names that worker's pid)
+
+@version 1.0
+"""
+
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+DEFAULT_TTL_S = 600.0
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_SESSIONS = 200
+
+# Rough Doc footprint per token (token structs, lexeme pointers, spans);
+# vectors live in the shared vocab and are not counted
+BYTES_PER_TOKEN = 400
+
+
+class Session:
+    """One parsed document and its derived tables."""
+
+    def __init__(self, session_id: str, text: str, doc, article_date: Optional[str] = None):
+        self.id = session_id
+        self.text = text
+        self.doc = doc
+        self.article_date = article_date
+        self.created_at = time.monotonic()
+        self.last_access = self.created_at
+        self.derived: dict[Any, Any] = {}
+        tensor = getattr(doc, 'tensor', None)
+        # Text is counted twice: the string itself and derived copies
+        # (masked text, sentence texts)
+        self.size_bytes = (
+            len(text) * 2 * 2
+            + len(doc) * BYTES_PER_TOKEN
+            + (tensor.nbytes if tensor is not None else 0)
+        )
+
+    def get_or_compute(self, key, compute: Callable[[], Any]) -> Any:
+        """Derived table for key, computed and kept on first use."""
+        if key not in self.derived:
+            self.derived[key] = compute()
+        return self.derived[key]
+
+
+class SessionStore:
+    """
+    Sessions of one worker process, in least recently used order.
+
+    Used from the event loop only; derived tables may be computed in
+    worker threads via Session.get_or_compute.
+
+    Args:
+        ttl_s: Seconds without access before a session expires
+        max_bytes: Estimated total size before LRU eviction
+        max_sessions: Session count before LRU eviction
+    """
+
+    def __init__(
+        self,
+        ttl_s: float = DEFAULT_TTL_S,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+    ):
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self.max_sessions = max_sessions
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
+        self.total_bytes = 0
+        self.created = 0
+        self.hits = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def create(self, text: str, doc, article_date: Optional[str] = None) -> Session:
+        """Store a parsed document and return its session."""
+        self._expire()
+        session = Session(f"{os.getpid()}-{uuid.uuid4().hex}", text, doc, article_date)
+        self._sessions[session.id] = session
+        self.total_bytes += session.size_bytes
+        self.created += 1
+
+        while len(self._sessions) > 1 and (
+            self.total_bytes > self.max_bytes or len(self._sessions) > self.max_sessions
+        ):
+            self._drop(next(iter(self._sessions)))
+            self.evicted += 1
+        return session
+
+    def get(self, session_id: str) -> Optional[Session]:
+        """Session by ID (refreshing its TTL), or None if unknown or expired."""
+        self._expire()
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        session.last_access = time.monotonic()
+        self._sessions.move_to_end(session_id)
+        self.hits += 1
+        return session
+
+    def delete(self, session_id: str) -> bool:
+        """Drop a session; False if it didn't exist."""
+        if session_id not in self._sessions:
+            return False
+        self._drop(session_id)
+        return True
+
+    def owner_pid(self, session_id: str) -> Optional[int]:
+        """Worker pid encoded in a session ID, if it has one."""
+        pid, _, _ = session_id.partition('-')
+        return int(pid) if pid.isdigit() else None
+
+    def _drop(self, session_id: str):
+        session = self._sessions.pop(session_id)
+        self.total_bytes -= session.size_bytes
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.ttl_s
+        # Oldest access first, so stop at the first live session
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.last_access > cutoff:
+                break
+            self._drop(session_id)
+            self.expired += 1
+
+    def stats(self) -> dict:
+        """Counters for GET /metrics."""
+        return {
+            'sessions': len(self._sessions),
+            'estimated_mb': round(self.total_bytes / (1024 * 1024), 2),
+            'max_mb': round(self.max_bytes / (1024 * 1024), 2),
+            'max_sessions': self.max_sessions,
+            'ttl_s': self.ttl_s,
+            'created': self.created,
+            'hits': self.hits,
+            'expired': self.expired,
+            'evicted': self.evicted,
+        }
@@ -0,0 +1,98 @@
+"""
+Single-flight De-duplication
+
+UI retries and double-triggered imports often send the same text to
+/extract or /preprocess while the first call is still running. Identical
+concurrent requests attach to the one in-flight computation and all get
+its result instead of each burning a full parse.
+
+Key Features:
+- Keyed by a hash of endpoint + text + options (see make_key)
+- Only de-duplicates in-flight work; nothing is cached after completion
+- The shared computation is cancelled only when every caller has gone
+- Leader / coalesced counters for GET /metrics
+
+@version 1.0
+"""
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable
+
+
+def make_key(endpoint: str, text: str, options: dict) -> str:
+    """
+    Build the de-duplication key for a request.
+
+    Args:
+        endpoint: Endpoint name, so /extract and /preprocess never share
+        text: Request text
+        options: Every other request field that affects the result
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    h = hashlib.sha256()
+    h.update(endpoint.encode('utf-8'))
+    h.update(b'\0')
+    h.update(json.dumps(options, sort_keys=True, default=str).encode('utf-8'))
+    h.update(b'\0')
+    h.update(text.encode('utf-8'))
+    return h.hexdigest()
+
+
+class _Flight:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Runs at most one computation per key at a time."""
+
+    def __init__(self):
+        self._flights: dict[str, _Flight] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn() for this key, or join the run already in flight.
+
+        Args:
+            key: De-duplication key (see make_key)
+            fn: Zero-argument coroutine function doing the work
+
+        Returns:
+            The shared result (exceptions are shared too)
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            # shield: one caller being cancelled mustn't cancel the others' result
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+
+    def _forget(self, key: str, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self) -> dict:
+        """Counters for GET /metrics."""
+        return {
+            'in_flight': len(self._flights),
+            'computed': self.leaders,
+            'coalesced': self.coalesced,
+        }
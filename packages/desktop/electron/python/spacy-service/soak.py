@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Soak Test Harness for the spaCy Extraction Service
+
+Replays a corpus of documents against a running service for hours and
+records the RSS curve from GET /workers, to check that memory growth stays
+bounded (see --max-requests / --max-rss-mb in main.py).
+
+Corpus: a directory of .txt files, or .json files with a "text" or
+"content" field (extract-text.py output works as-is).
+
+Usage:
+    python main.py --port 8234 --workers 2 --max-rss-mb 1500 &
+    python soak.py --corpus ./corpus --hours 6 --csv soak.csv
+
+Output:
+    CSV with one row per sample (elapsed, requests, errors, RSS totals,
+    worker pids) and a summary with start/peak/end RSS, growth rate in MB
+    per hour, and how many worker recycles were observed.
+
+Stdlib only, so it runs outside the service's venv.
+
+@version 1.0
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+
+def load_corpus(path: Path) -> list[str]:
+    """Load document texts from a directory of .txt / .json files."""
+    texts = []
+    for file in sorted(path.rglob('*')):
+        if file.suffix == '.txt':
+            texts.append(file.read_text(encoding='utf-8', errors='replace'))
+        elif file.suffix == '.json':
+            try:
+                data = json.loads(file.read_text(encoding='utf-8'))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            text = data.get('text') or data.get('content') if isinstance(data, dict) else None
+            if text:
+                texts.append(text)
+    return [t for t in texts if t.strip()]
+
+
+def post_json(url: str, payload: dict, timeout: float) -> dict:
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json'},
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def get_json(url: str, timeout: float) -> dict:
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+class Replayer:
+    """Cycles through the corpus from several threads until stopped."""
+
+    def __init__(self, base_url: str, texts: list[str], timeout: float):
+        self.base_url = base_url
+        self.jobs = itertools.cycle(itertools.product(texts, ('/extract', '/preprocess')))
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.stop = threading.Event()
+        self.requests = 0
+        self.errors = 0
+
+    def run(self):
+        while not self.stop.is_set():
+            with self.lock:
+                text, endpoint = next(self.jobs)
+            try:
+                post_json(self.base_url + endpoint, {'text': text}, self.timeout)
+                ok = True
+            except (urllib.error.URLError, OSError, ValueError):
+                ok = False
+            with self.lock:
+                self.requests += 1
+                if not ok:
+                    self.errors += 1
+
+
+def growth_mb_per_hour(samples: list[dict]) -> float:
+    """Least-squares slope of total RSS over time, in MB per hour."""
+    points = [(s['elapsed_s'] / 3600, s['total_rss_mb']) for s in samples if s['total_rss_mb']]
+    if len(points) < 2:
+        return 0.0
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if not var_x:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Soak test the spaCy extraction service')
+    parser.add_argument('--url', default='http://127.0.0.1:8234', help='Service base URL')
+    parser.add_argument('--corpus', type=Path, required=True, help='Directory of .txt/.json documents')
+    parser.add_argument('--hours', type=float, default=1.0, help='How long to run')
+    parser.add_argument('--concurrency', type=int, default=4, help='Parallel client threads')
+    parser.add_argument('--interval', type=float, default=30.0, help='Seconds between RSS samples')
+    parser.add_argument('--timeout', type=float, default=120.0, help='Per-request timeout in seconds')
+    parser.add_argument('--csv', type=Path, help='Write the RSS curve to this CSV file')
+    args = parser.parse_args()
+
+    texts = load_corpus(args.corpus)
+    if not texts:
+        print(f"No documents found in {args.corpus}", file=sys.stderr)
+        sys.exit(1)
+
+    base_url = args.url.rstrip('/')
+    replayer = Replayer(base_url, texts, args.timeout)
+    threads = [threading.Thread(target=replayer.run, daemon=True) for _ in range(args.concurrency)]
+
+    print(f"Soak test: {len(texts)} documents, {args.concurrency} threads, {args.hours}h against {base_url}")
+    start = time.time()
+    deadline = start + args.hours * 3600
+    for thread in threads:
+        thread.start()
+
+    samples = []
+    seen_pids: set[int] = set()
+    writer = None
+    csv_file = open(args.csv, 'w', newline='') if args.csv else None
+    try:
+        while True:
+            try:
+                stats = get_json(base_url + '/workers', args.timeout)
+            except (urllib.error.URLError, OSError, ValueError) as e:
+                print(f"  /workers unavailable: {e}", file=sys.stderr)
+                stats = {'workers': [], 'total_rss_mb': 0, 'total_private_mb': 0}
+
+            pids = [w['pid'] for w in stats['workers']]
+            seen_pids.update(pids)
+            with replayer.lock:
+                requests, errors = replayer.requests, replayer.errors
+
+            sample = {
+                'elapsed_s': round(time.time() - start, 1),
+                'requests': requests,
+                'errors': errors,
+                'total_rss_mb': stats['total_rss_mb'],
+                'total_private_mb': stats.get('total_private_mb', 0),
+                'max_worker_rss_mb': max((w['rss_mb'] for w in stats['workers']), default=0),
+                'workers': len(pids),
+                'pids': ' '.join(str(p) for p in sorted(pids)),
+            }
+            samples.append(sample)
+            print(f"  {sample['elapsed_s']:>9}s  req={requests:<8} err={errors:<5} "
+                  f"rss={sample['total_rss_mb']:>8} MB  private={sample['total_private_mb']:>8} MB")
+
+            if csv_file:
+                if writer is None:
+                    writer = csv.DictWriter(csv_file, fieldnames=list(sample))
+                    writer.writeheader()
+                writer.writerow(sample)
+                csv_file.flush()
+
+            if time.time() >= deadline:
+                break
+            time.sleep(min(args.interval, max(0.0, deadline - time.time())))
+    except KeyboardInterrupt:
+        print("Interrupted, summarizing")
+    finally:
+        replayer.stop.set()
+        if csv_file:
+            csv_file.close()
+
+    rss = [s['total_rss_mb'] for s in samples if s['total_rss_mb']]
+    live_workers = samples[-1]['workers'] if samples else 0
+    print("\nSummary")
+    print(f"  requests:     {replayer.requests} ({replayer.errors} errors)")
+    if rss:
+        print(f"  RSS start:    {rss[0]} MB")
+        print(f"  RSS peak:     {max(rss)} MB")
+        print(f"  RSS end:      {rss[-1]} MB")
+    print(f"  growth:       {growth_mb_per_hour(samples):.1f} MB/hour")
+    print(f"  recycles:     {max(0, len(seen_pids) - live_workers)} (distinct worker pids seen)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Tests for the micro-batching scheduler (batcher.py)."""
+
+import asyncio
+import threading
+import time
+
+import spacy
+
+from batcher import MicroBatcher
+
+
+class SlowNlp:
+    """Wraps a blank pipeline and records how texts were batched."""
+
+    def __init__(self, delay: float = 0.05):
+        self.nlp = spacy.blank('en')
+        self.delay = delay
+        self.calls: list[int] = []
+        self.threads: set[str] = set()
+
+    def pipe(self, texts, batch_size=None):
+        texts = list(texts)
+        self.calls.append(len(texts))
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        return list(self.nlp.pipe(texts))
+
+
+def test_lone_request_is_not_delayed_by_the_window():
+    nlp = SlowNlp(delay=0)
+
+    async def run():
+        batcher = MicroBatcher(nlp, window_ms=500)
+        start = time.perf_counter()
+        doc = await batcher.parse('The mill was built in 1920.')
+        return doc, time.perf_counter() - start, batcher.stats()
+
+    doc, elapsed, stats = asyncio.run(run())
+    assert doc.text == 'The mill was built in 1920.'
+    assert elapsed < 0.25
+    assert stats['batches'] == 1 and stats['largest_batch'] == 1
+
+
+def test_concurrent_requests_share_pipe_calls():
+    nlp = SlowNlp()
+    texts = [f'Document number {i} was closed.' for i in range(20)]
+
+    async def run():
+        batcher = MicroBatcher(nlp, window_ms=5, max_batch_size=8)
+        docs = await asyncio.gather(*(batcher.parse(t) for t in texts))
+        return docs, batcher.stats()
+
+    docs, stats = asyncio.run(run())
+    # Every caller gets its own text back
+    assert [d.text for d in docs] == texts
+    assert stats['docs'] == 20
+    assert stats['batches'] < 20
+    assert max(nlp.calls) <= 8
+    # All parsing happened on the single batch thread
+    assert len(nlp.threads) == 1
+
+
+def test_pipe_errors_reach_every_caller():
+    class Broken:
+        def pipe(self, texts, batch_size=None):
+            raise ValueError('model failed')
+
+    async def run():
+        batcher = MicroBatcher(Broken())
+        return await asyncio.gather(batcher.parse('a'), batcher.parse('b'), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in results)
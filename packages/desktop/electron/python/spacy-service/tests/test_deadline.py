@@ -0,0 +1,84 @@
+"""Tests for request deadlines and cooperative cancellation."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from deadline import ClientDisconnected, Deadline, STATUS_COMPLETE, STATUS_PARTIAL, STATUS_TIMED_OUT, cancel_on_disconnect
+
+
+def test_no_budget_never_expires():
+    deadline = Deadline()
+    assert not deadline.enabled
+    assert not deadline.expired()
+    assert deadline.remaining_s() is None
+    assert deadline.status() == STATUS_COMPLETE
+
+
+def test_status_after_expiry():
+    deadline = Deadline(1)
+    time.sleep(0.01)
+    assert deadline.expired()
+    assert deadline.status(started=True) == STATUS_PARTIAL
+    assert deadline.status(started=False) == STATUS_TIMED_OUT
+
+
+def test_run_gives_up_at_deadline():
+    async def scenario():
+        deadline = Deadline(20)
+        assert await deadline.run(asyncio.sleep(5, 'late')) is None
+        assert deadline.status(started=False) == STATUS_TIMED_OUT
+
+        assert await Deadline(1000).run(asyncio.sleep(0, 'ok')) == 'ok'
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_offload_stops_stage():
+    stopped = threading.Event()
+
+    def stage(deadline):
+        while not deadline.expired():
+            time.sleep(0.005)
+        stopped.set()
+
+    async def scenario():
+        deadline = Deadline()
+        task = asyncio.ensure_future(deadline.offload(stage, deadline))
+        await asyncio.sleep(0.02)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert deadline.cancelled
+
+    asyncio.run(scenario())
+    assert stopped.wait(1)
+
+
+class _FakeRequest:
+    def __init__(self, disconnect_after: float):
+        self.at = time.monotonic() + disconnect_after
+
+    async def is_disconnected(self):
+        return time.monotonic() >= self.at
+
+
+def test_disconnect_cancels_work():
+    async def scenario():
+        cancelled = asyncio.Event()
+
+        async def work():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(ClientDisconnected):
+            await cancel_on_disconnect(_FakeRequest(0.01), work(), poll_s=0.01)
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+        assert await cancel_on_disconnect(_FakeRequest(10), asyncio.sleep(0, 'done'), poll_s=0.01) == 'done'
+
+    asyncio.run(scenario())
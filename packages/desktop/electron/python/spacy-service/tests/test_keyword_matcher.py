@@ -0,0 +1,81 @@
+"""Tests for the single-scan keyword matchers."""
+
+import random
+
+import pytest
+
+from keyword_matcher import HAS_AHOCORASICK, KeywordMatcher
+from preprocessor import COMPANY_RELATIONSHIP_KEYWORDS, ORG_TYPE_KEYWORDS, PERSON_ROLE_KEYWORDS
+
+
+def _nested_any(table, text):
+    text = text.lower()
+    for category, keywords in table.items():
+        if any(kw in text for kw in keywords):
+            return category
+    return None
+
+
+def test_automaton_used_when_installed():
+    assert (KeywordMatcher({'a': ['x']})._automaton is not None) == HAS_AHOCORASICK
+
+
+def test_priority_follows_table_order_not_position():
+    matcher = KeywordMatcher({'first': ['zebra'], 'second': ['apple']})
+    assert matcher.first('An apple and a zebra') == 'first'
+    assert matcher.first('An apple') == 'second'
+    assert matcher.first('Nothing here') is None
+
+
+def test_substring_semantics_are_kept():
+    matcher = KeywordMatcher(ORG_TYPE_KEYWORDS)
+    assert matcher.first('Open ever since 1900') == 'company'  # 'inc' in 'since'
+
+
+def test_overlapping_keywords_at_one_position():
+    matcher = KeywordMatcher({'a': ['owned by x'], 'b': ['own']})
+    assert matcher.first('owned by y') == 'b'
+    assert matcher.first('owned by x') == 'a'
+
+
+@pytest.mark.parametrize('use_automaton', [True, False])
+def test_matches_nested_any_on_random_text(use_automaton):
+    rng = random.Random(0)
+    words = [kw for table in (PERSON_ROLE_KEYWORDS, ORG_TYPE_KEYWORDS, COMPANY_RELATIONSHIP_KEYWORDS)
+             for kws in table.values() for kw in kws] + ['the', 'River', 'Mill', 'x', 'since', 'Fort']
+    for _ in range(500):
+        text = ' '.join(rng.choice(words) for _ in range(rng.randint(0, 4)))
+        name = ' '.join(rng.choice(words) for _ in range(rng.randint(0, 2)))
+        for table in (PERSON_ROLE_KEYWORDS, ORG_TYPE_KEYWORDS, COMPANY_RELATIONSHIP_KEYWORDS):
+            matcher = KeywordMatcher(table, use_automaton=use_automaton)
+            assert matcher.first(text) == _nested_any(table, text)
+            joined = matcher.rank_joined(text, name, left_rank=matcher.rank(text))
+            assert matcher.category(joined) == _nested_any(table, f'{text} {name}')
+
+
+def test_token_windows_match_window_text_scan():
+    import spacy
+
+    from keyword_matcher import TokenWindowMatcher
+
+    nlp = spacy.blank('en')
+    table = {'a': ['cannot', 'gonna', 'owned'], 'b': ['state', 'inc', 'mill'], 'c': ['built']}
+    windows = TokenWindowMatcher(table)
+    text_matcher = KeywordMatcher(table)
+    words = ['Since', 'cannot', 'gonna', 'statement', "Mill's", 'co-llc', '1920s', 'state-owned',
+             'un-built', 'the', 'river', ',', '.', '  ', '\n', 'INC.', 'owned']
+    rng = random.Random(1)
+    for _ in range(200):
+        text = ''.join(rng.choice(words) + rng.choice(['', ' ', ' ']) for _ in range(rng.randint(1, 30)))
+        doc = nlp(text)
+        starts = [rng.randint(0, len(doc)) for _ in range(10)]
+        ends = [rng.randint(start, len(doc)) for start in starts]
+        expected = [text_matcher.first(doc[s:e].text) for s, e in zip(starts, ends)]
+        assert windows.categories(doc, starts, ends) == expected
+
+
+def test_token_window_keywords_must_be_alphanumeric():
+    from keyword_matcher import TokenWindowMatcher
+
+    with pytest.raises(ValueError):
+        TokenWindowMatcher({'a': ['air force']})
@@ -0,0 +1,55 @@
+"""Tests for LLM context packing."""
+
+from preprocessor import build_llm_context, build_llm_context_for_budget, estimate_tokens
+
+
+def _sentence(text, relevancy='timeline', confidence=0.9, verbs=None):
+    return {
+        'text': text,
+        'relevancy': relevancy,
+        'confidence': confidence,
+        'verbs': verbs if verbs is not None else [{'text': 'built', 'category': 'build_date'}],
+    }
+
+
+def _result(timeline, context):
+    return {'timeline_candidates': timeline, 'sentences': timeline + context}
+
+
+def test_estimate_tokens():
+    assert estimate_tokens('') == 0
+    assert estimate_tokens('built in 1871.') == 5
+    assert estimate_tokens('1234567') == 3
+    assert estimate_tokens('a\nb') == estimate_tokens('a') + estimate_tokens('b')
+
+
+def test_budget_skips_long_sentence_for_short_ones():
+    long = _sentence('The mill was built ' + 'and expanded ' * 40 + 'in 1920.', confidence=0.95)
+    short = [_sentence(f'Wing {i} was built in 19{i}0.', confidence=0.8) for i in range(3)]
+    result = _result([long] + short, [])
+
+    context, used = build_llm_context_for_budget(result, max_tokens=60)
+    assert 'expanded' not in context
+    assert all(s['text'] in context for s in short)
+    assert used == estimate_tokens(context) <= 60
+
+
+def test_budget_orders_by_priority_then_document_order():
+    timeline = [_sentence('It closed in 1975.', confidence=0.7), _sentence('It was built in 1920.', confidence=0.95)]
+    context = [_sentence('John Smith owned it.', relevancy='profile', confidence=0.75, verbs=[])]
+    result = _result(timeline, context)
+
+    packed, used = build_llm_context_for_budget(result, max_tokens=1000)
+    lines = packed.split('\n')
+    assert lines[0].endswith('It closed in 1975.')
+    assert lines[1].endswith('It was built in 1920.')
+    assert lines[2] == '[CONTEXT] John Smith owned it.'
+
+    # Tight budget keeps the most confident timeline sentence
+    packed, _ = build_llm_context_for_budget(result, max_tokens=estimate_tokens(lines[1]))
+    assert packed == lines[1]
+
+
+def test_sentence_cap_unchanged():
+    timeline = [_sentence(f'Built in 19{i}0.') for i in range(4)]
+    assert len(build_llm_context(_result(timeline, []), max_sentences=4).split('\n')) == 2
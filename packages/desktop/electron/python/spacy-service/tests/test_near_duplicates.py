@@ -0,0 +1,72 @@
+"""Tests for cross-document near-duplicate detection."""
+
+import json
+
+from near_duplicates import NearDuplicateIndex, ResultCache, minhash_signature, similarity
+
+STORY = (
+    'The old Hudson River mill was built in 1871 and closed in 1975 after the company '
+    'moved production south. Developers bought the site in 2013 and plan to convert the '
+    'main building into apartments, keeping the original brick facade and clock tower. '
+)
+SYNDICATED = 'Local News Network. ' + STORY + 'Copyright 2024, all rights reserved.'
+OTHER = (
+    'A fire destroyed the county hospital annex on Tuesday night. No patients were hurt, '
+    'officials said, and the main building reopened the next morning for regular visits.'
+)
+
+
+def test_signature_similarity():
+    story = minhash_signature(STORY)
+    assert similarity(story, minhash_signature(STORY)) == 1.0
+    assert similarity(story, minhash_signature(SYNDICATED)) > 0.7
+    assert similarity(story, minhash_signature(OTHER)) < 0.2
+
+
+def test_query_finds_copy_and_excludes_self():
+    index = NearDuplicateIndex(threshold=0.7)
+    index.add('original', minhash_signature(STORY))
+    index.add('other', minhash_signature(OTHER))
+
+    match = index.query(minhash_signature(SYNDICATED))
+    assert match is not None and match[0] == 'original'
+    assert index.query(minhash_signature(STORY), exclude='original') is None
+
+
+def test_eviction_and_remove():
+    index = NearDuplicateIndex(max_documents=2)
+    for name, text in (('a', STORY), ('b', OTHER), ('c', SYNDICATED)):
+        index.add(name, minhash_signature(text))
+    assert len(index) == 2
+    assert index.query(minhash_signature(OTHER))[0] == 'b'
+    index.remove('b')
+    assert index.query(minhash_signature(OTHER)) is None
+
+
+def test_save_merges_with_file(tmp_path):
+    path = str(tmp_path / 'index.json')
+    first = NearDuplicateIndex()
+    first.add('a', minhash_signature(STORY))
+    first.save(path)
+
+    second = NearDuplicateIndex()
+    second.add('b', minhash_signature(OTHER))
+    second.save(path)
+
+    with open(path) as f:
+        assert sorted(json.load(f)['documents']) == ['a', 'b']
+
+    loaded = NearDuplicateIndex()
+    loaded.load(path)
+    assert loaded.query(minhash_signature(STORY))[0] == 'a'
+
+
+def test_result_cache_is_lru():
+    cache = ResultCache(max_entries=2)
+    cache.put('a', 'opts', 1)
+    cache.put('b', 'opts', 2)
+    assert cache.get('a', 'opts') == 1
+    cache.put('c', 'opts', 3)
+    assert cache.get('b', 'opts') is None
+    assert cache.get('a', 'other-opts') is None
+    assert cache.stats() == {'entries': 2, 'hits': 1, 'misses': 2}
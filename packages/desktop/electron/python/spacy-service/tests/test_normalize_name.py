@@ -0,0 +1,17 @@
+"""Tests for memoized name normalization."""
+
+from preprocessor import normalize_name
+
+
+def test_titles_initials_and_last_first_are_normalized():
+    assert normalize_name('Dr. John Q. Smith') == 'john smith'
+    assert normalize_name('Smith, John') == 'john smith'
+    assert normalize_name('  Mary   JONES Jr. ') == 'mary jones'
+
+
+def test_repeated_names_hit_the_cache():
+    normalize_name.cache_clear()
+    for _ in range(3):
+        normalize_name('Mrs. Ada Lovelace')
+    info = normalize_name.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (2, 1, 1)
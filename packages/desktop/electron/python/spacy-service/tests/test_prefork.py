@@ -0,0 +1,253 @@
+"""
+Tests for the pre-fork supervisor (prefork.py).
+
+Each test runs serve_prefork() in a subprocess against a stub FastAPI app
+(no spaCy model needed) and talks to it over HTTP. POSIX only.
+"""
+
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import textwrap
+import time
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+import prefork
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'fork'), reason='pre-fork mode needs os.fork')
+
+STUB_APP = textwrap.dedent('''
+    import os
+    import sys
+    from contextlib import asynccontextmanager
+
+    from fastapi import FastAPI
+
+    import prefork
+
+    FAIL_STARTUP = os.environ.get('STUB_FAIL_STARTUP') == '1'
+
+    @asynccontextmanager
+    async def lifespan(app):
+        if FAIL_STARTUP:
+            raise RuntimeError('startup failed')
+        yield
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.middleware('http')
+    async def count(request, call_next):
+        if request.url.path == '/workers':
+            return await call_next(request)
+        try:
+            return await call_next(request)
+        finally:
+            prefork.note_request()
+
+    @app.get('/pid')
+    async def pid():
+        return {'pid': os.getpid()}
+
+    @app.get('/crash')
+    async def crash():
+        os._exit(1)
+
+    @app.get('/workers')
+    async def workers():
+        return prefork.worker_snapshot()
+
+    if __name__ == '__main__':
+        port, workers, max_requests = (int(a) for a in sys.argv[1:4])
+        limits = prefork.WorkerLimits(max_requests=max_requests)
+        prefork.serve_prefork(app, '127.0.0.1', port, workers, log_level='warning', limits=limits)
+''')
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _get(port: int, path: str) -> dict:
+    with urllib.request.urlopen(f'http://127.0.0.1:{port}{path}', timeout=10) as response:
+        return json.loads(response.read())
+
+
+def _wait_for_workers(port: int, count: int, timeout: float = 15.0) -> dict:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            snapshot = _get(port, '/workers')
+            if len(snapshot['workers']) == count:
+                return snapshot
+        except OSError:
+            pass
+        time.sleep(0.1)
+    raise AssertionError(f'{count} workers did not come up')
+
+
+@pytest.fixture
+def serve(tmp_path):
+    """Start the stub app under serve_prefork; yields a launcher."""
+    script = tmp_path / 'stub_app.py'
+    script.write_text(STUB_APP)
+    procs = []
+
+    def launch(workers: int, max_requests: int = 0, env: dict = None):
+        port = _free_port()
+        proc = subprocess.Popen(
+            [sys.executable, str(script), str(port), str(workers), str(max_requests)],
+            cwd=tmp_path,
+            env={**os.environ, 'PYTHONPATH': str(SERVICE_DIR), **(env or {})},
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+        )
+        procs.append(proc)
+        return proc, port
+
+    yield launch
+
+    for proc in procs:
+        if proc.poll() is None:
+            proc.send_signal(signal.SIGTERM)
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+def test_worker_table_round_trip():
+    table = prefork.WorkerTable(2)
+    memory = {'rss_kb': 2048, 'shared_kb': 1024, 'private_kb': 1024}
+    table.write(1, 4242, 100.0, 7, memory)
+
+    assert table.read(1) == {
+        'pid': 4242, 'index': 1, 'started_at': 100.0, 'requests': 7,
+        'rss_kb': 2048, 'shared_kb': 1024, 'private_kb': 1024,
+    }
+    assert table.read(0)['pid'] == 0
+
+    table.clear(1)
+    assert table.read(1)['pid'] == 0
+
+
+def test_recycle_reason_limits_and_jitter():
+    worker = prefork.WorkerState(prefork.WorkerTable(1), 0,
+                                 prefork.WorkerLimits(max_requests=5, max_requests_jitter=3))
+    assert 5 <= worker.max_requests <= 8
+
+    worker.requests = worker.max_requests - 1
+    assert worker.recycle_reason() is None
+    worker.requests += 1
+    assert 'requests' in worker.recycle_reason()
+
+    worker = prefork.WorkerState(prefork.WorkerTable(1), 0, prefork.WorkerLimits(max_rss_mb=100))
+    worker.memory = {'rss_kb': 900 * 1024, 'shared_kb': 850 * 1024, 'private_kb': 50 * 1024}
+    assert worker.recycle_reason() is None  # shared model pages don't count
+    worker.memory['private_kb'] = 150 * 1024
+    assert 'private memory' in worker.recycle_reason()
+
+
+def test_memory_limit_below_baseline_is_disabled():
+    worker = prefork.WorkerState(prefork.WorkerTable(1), 0, prefork.WorkerLimits(max_rss_mb=10))
+    worker.memory = {'rss_kb': 500 * 1024, 'shared_kb': 480 * 1024, 'private_kb': 20 * 1024}
+    worker.check_memory_baseline()
+    assert worker.max_rss_kb == 0
+    assert worker.recycle_reason() is None
+
+
+def test_workers_snapshot(serve):
+    proc, port = serve(workers=2)
+    snapshot = _wait_for_workers(port, 2)
+
+    assert snapshot['mode'] == 'prefork'
+    assert snapshot['parent_pid'] == proc.pid
+    assert sorted(w['index'] for w in snapshot['workers']) == [0, 1]
+    assert len({w['pid'] for w in snapshot['workers']}) == 2
+    assert all(w['rss_mb'] > 0 for w in snapshot['workers'])
+
+
+def test_respawn_after_crash(serve):
+    proc, port = serve(workers=1)
+    before = _wait_for_workers(port, 1)['workers'][0]['pid']
+
+    with pytest.raises(OSError):
+        _get(port, '/crash')
+
+    deadline = time.time() + 15
+    after = before
+    while after == before and time.time() < deadline:
+        try:
+            after = _get(port, '/pid')['pid']
+        except OSError:
+            time.sleep(0.2)
+    assert after != before
+    assert proc.poll() is None
+
+
+def test_recycle_after_max_requests(serve):
+    proc, port = serve(workers=2, max_requests=5)
+    _wait_for_workers(port, 2)
+
+    pids = set()
+    errors = 0
+    for _ in range(60):
+        try:
+            pids.add(_get(port, '/pid')['pid'])
+        except OSError:
+            errors += 1
+
+    assert errors == 0
+    # 60 requests at ~5 per worker lifetime means many fresh workers
+    assert len(pids) > 4
+    assert proc.poll() is None
+
+
+def test_startup_failure_backs_off(serve):
+    proc, port = serve(workers=2, env={'STUB_FAIL_STARTUP': '1'})
+    time.sleep(3)
+    proc.send_signal(signal.SIGTERM)
+    output, _ = proc.communicate(timeout=15)
+
+    respawns = output.count('respawning')
+    assert 'recycled' not in output
+    # RESPAWN_BACKOFF_S per slot: roughly 3 per worker in 3 seconds, not dozens
+    assert 0 < respawns <= 10
+
+
+def test_workers_exit_when_parent_is_killed(serve):
+    proc, port = serve(workers=2)
+    pids = [w['pid'] for w in _wait_for_workers(port, 2)['workers']]
+
+    proc.kill()
+    proc.wait()
+
+    deadline = time.time() + 10
+    alive = pids
+    while alive and time.time() < deadline:
+        alive = [pid for pid in alive if _pid_alive(pid)]
+        time.sleep(0.2)
+    assert not alive
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # Reaped by init but possibly still a zombie
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            return f.read().split()[2] != 'Z'
+    except OSError:
+        return True
@@ -0,0 +1,55 @@
+"""Tests for the regex backends."""
+
+import re
+
+import pytest
+
+from false_positive_patterns import FALSE_POSITIVE_PATTERNS, compile_false_positive_patterns
+from regex_backend import HAS_RE2, LinearPattern, split_trailing_lookahead
+
+needs_re2 = pytest.mark.skipif(not HAS_RE2, reason='google-re2 not installed')
+
+TRICKY_TEXTS = [
+    'Open 10:30:15 on Jan 3, closed 9:45 pm, 11:00, on 12 and 7:15 on Mon',
+    '110 to 130 employees, 5-10 workers, 3 × 4 × 5 ft, 12x12',
+    'KELVIN 12 KM, ١٢ rooms, 5é feet, café 3 rooms, ſ 4 ft',
+    '#12é v1.2.3 AB-1234 $1,000.00 45 USD 12345-6789 -73.98765 40%',
+    'tab\x0b5 rooms\x1c6 beds\x01 7 \x01 8 feet',
+]
+
+
+def test_split_trailing_lookahead():
+    assert split_trailing_lookahead(r'\d+(?=\s*ft)') == (r'\d+', r'\s*ft', False)
+    assert split_trailing_lookahead(r'\d+(?!\s*(?:on|,))') == (r'\d+', r'\s*(?:on|,)', True)
+    assert split_trailing_lookahead(r'\d+(?:\s*ft)') == (r'\d+(?:\s*ft)', None, False)
+    assert split_trailing_lookahead(r'[)(]\d+') == (r'[)(]\d+', None, False)
+    assert split_trailing_lookahead(r'(?=a)b') == (r'(?=a)b', None, False)
+
+
+def test_python_backend_is_plain_re():
+    pattern = LinearPattern(r'\d+', re.IGNORECASE, 'python')
+    assert pattern.engine == 'python'
+    assert [m.group() for m in pattern.finditer('a 12 b 3')] == ['12', '3']
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        LinearPattern(r'\d', 0, 'pcre')
+
+
+@needs_re2
+def test_re2_matches_python_on_tricky_text():
+    python = compile_false_positive_patterns('python')
+    linear = compile_false_positive_patterns('re2')
+    for (py, reason), (r2, _) in zip(python, linear):
+        assert r2.engine.startswith('re2'), reason
+        for text in TRICKY_TEXTS:
+            assert [m.span() for m in r2.finditer(text)] == [m.span() for m in py.finditer(text)], (reason, text)
+
+
+@needs_re2
+def test_negative_lookahead_falls_back_to_shorter_match():
+    pattern, _ = next(p for p in FALSE_POSITIVE_PATTERNS if p[1] == 'time')
+    linear = LinearPattern(pattern, re.IGNORECASE, 're2')
+    assert linear.engine == 're2+check'
+    assert [m.group() for m in linear.finditer('10:30:15 on Jan 3')] == ['10:30']
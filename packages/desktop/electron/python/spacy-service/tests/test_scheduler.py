@@ -0,0 +1,100 @@
+"""Tests for the priority lanes scheduler."""
+
+import asyncio
+
+import pytest
+
+from scheduler import PriorityScheduler
+
+
+async def _hold(scheduler, lane, order, name, release):
+    async with scheduler.slot(lane):
+        order.append(name)
+        await release.wait()
+
+
+def test_interactive_admitted_before_waiting_bulk():
+    async def scenario():
+        scheduler = PriorityScheduler({'interactive': 1, 'bulk': 1}, max_active=1, aging_s=60)
+        order = []
+        gate = asyncio.Event()
+        release = asyncio.Event()
+
+        blocker = asyncio.ensure_future(_hold(scheduler, 'bulk', order, 'first', gate))
+        await asyncio.sleep(0)
+        tasks = [asyncio.ensure_future(_hold(scheduler, 'bulk', order, f'bulk{i}', release)) for i in range(3)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.ensure_future(_hold(scheduler, 'interactive', order, 'click', release)))
+        await asyncio.sleep(0)
+
+        lanes = scheduler.stats()['lanes']
+        assert lanes['bulk']['queue_depth'] == 3
+        assert lanes['interactive']['queue_depth'] == 1
+
+        gate.set()
+        release.set()
+        await asyncio.gather(blocker, *tasks)
+        assert order[:2] == ['first', 'click']
+
+    asyncio.run(scenario())
+
+
+def test_aged_bulk_goes_ahead_of_interactive():
+    async def scenario():
+        scheduler = PriorityScheduler({'interactive': 1, 'bulk': 1}, max_active=1, aging_s=0.02)
+        order = []
+        gate = asyncio.Event()
+        release = asyncio.Event()
+
+        blocker = asyncio.ensure_future(_hold(scheduler, 'interactive', order, 'first', gate))
+        await asyncio.sleep(0)
+        bulk = asyncio.ensure_future(_hold(scheduler, 'bulk', order, 'old-bulk', release))
+        await asyncio.sleep(0.05)
+        click = asyncio.ensure_future(_hold(scheduler, 'interactive', order, 'click', release))
+        await asyncio.sleep(0)
+
+        gate.set()
+        release.set()
+        await asyncio.gather(blocker, bulk, click)
+        assert order == ['first', 'old-bulk', 'click']
+        assert scheduler.stats()['lanes']['bulk']['admitted_by_aging'] == 1
+
+    asyncio.run(scenario())
+
+
+def test_lane_limits_and_cancelled_waiters():
+    async def scenario():
+        scheduler = PriorityScheduler({'interactive': 4, 'bulk': 1}, max_active=4, aging_s=60)
+        order = []
+        release = asyncio.Event()
+
+        first = asyncio.ensure_future(_hold(scheduler, 'bulk', order, 'bulk0', release))
+        second = asyncio.ensure_future(_hold(scheduler, 'bulk', order, 'bulk1', release))
+        await asyncio.sleep(0)
+        assert scheduler.stats()['lanes']['bulk']['active'] == 1
+
+        # Bulk is at its limit but interactive still has room
+        click = asyncio.ensure_future(_hold(scheduler, 'interactive', order, 'click', release))
+        await asyncio.sleep(0)
+        assert 'click' in order
+
+        second.cancel()
+        await asyncio.sleep(0)
+        assert scheduler.stats()['lanes']['bulk']['queue_depth'] == 0
+
+        release.set()
+        await asyncio.gather(first, click)
+        lanes = scheduler.stats()['lanes']
+        assert lanes['bulk']['active'] == lanes['interactive']['active'] == 0
+
+    asyncio.run(scenario())
+
+
+def test_unknown_lane_rejected():
+    async def scenario():
+        scheduler = PriorityScheduler({'interactive': 1, 'bulk': 1})
+        with pytest.raises(ValueError):
+            async with scheduler.slot('urgent'):
+                pass
+
+    asyncio.run(scenario())
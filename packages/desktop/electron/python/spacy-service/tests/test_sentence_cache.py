@@ -0,0 +1,51 @@
+"""Tests for the per-sentence memo cache."""
+
+import spacy
+
+import preprocessor
+from sentence_cache import SentenceMemo
+
+
+def _nlp():
+    nlp = spacy.blank('en')
+    nlp.add_pipe('sentencizer')
+    return nlp
+
+
+FOOTER = 'This page was archived by the county historical society.'
+
+
+def test_memo_is_bounded_lru():
+    memo = SentenceMemo(max_entries=2)
+    memo.entry('one')['x'] = 1
+    memo.entry('two')
+    assert memo.entry('one') == {'x': 1}  # refreshes 'one'
+    memo.entry('three')  # evicts 'two'
+    assert memo.entry('two') == {}
+    stats = memo.stats()
+    assert stats['entries'] == 2
+    assert (stats['hits'], stats['misses']) == (1, 4)
+
+
+def test_disabled_memo_stores_nothing():
+    memo = SentenceMemo(max_entries=0)
+    memo.entry('one')['x'] = 1
+    assert memo.entry('one') == {}
+    assert memo.stats()['entries'] == 0
+
+
+def test_shared_sentences_hit_and_give_same_analysis(monkeypatch):
+    memo = SentenceMemo()
+    monkeypatch.setattr(preprocessor, 'sentence_memo', memo)
+    nlp = _nlp()
+
+    first_text = 'The mill was built in 1920 by the river. ' + FOOTER
+    second_text = 'The hospital opened near the river later on. ' + FOOTER
+    first = preprocessor.preprocess_text(first_text, nlp)
+    second = preprocessor.preprocess_text(second_text, nlp)
+    assert memo.stats()['hits'] == 1
+
+    uncached = SentenceMemo(max_entries=0)
+    monkeypatch.setattr(preprocessor, 'sentence_memo', uncached)
+    assert preprocessor.preprocess_text(second_text, nlp)['sentences'] == second['sentences']
+    assert first['sentences'][1]['verbs'] == second['sentences'][1]['verbs']
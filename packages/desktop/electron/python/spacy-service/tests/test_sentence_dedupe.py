@@ -0,0 +1,54 @@
+"""Tests for vector-based duplicate sentence marking."""
+
+import numpy as np
+import spacy
+
+from preprocessor import build_llm_context, mark_duplicate_sentences, preprocess_text, sentence_vectors
+
+
+def _nlp():
+    nlp = spacy.blank('en')
+    nlp.add_pipe('sentencizer')
+    rng = np.random.default_rng(0)
+    for word in 'mill built closed factory demolished river hospital opened'.split():
+        nlp.vocab.set_vector(word, rng.standard_normal(16).astype('float32'))
+    return nlp
+
+
+TEXT = (
+    'The mill was built in 1920 by the river. '
+    'The factory was demolished long after it closed. '
+    'The mill was built by the river in 1920. '
+    'The hospital opened near the river later on.'
+)
+
+
+def test_sentence_vectors_match_token_means():
+    nlp = _nlp()
+    doc = nlp(TEXT)
+    spans = [(s.start, s.end) for s in doc.sents]
+    matrix = sentence_vectors(doc, spans)
+    for row, sent in zip(matrix, doc.sents):
+        tokens = [t for t in sent if t.has_vector and not t.is_punct and not t.is_stop]
+        assert np.allclose(row, np.mean([t.vector for t in tokens], axis=0), atol=1e-6)
+
+
+def test_repeated_sentence_is_marked_and_skipped():
+    nlp = _nlp()
+    result = preprocess_text(TEXT, nlp, doc=nlp(TEXT), dedupe_threshold=0.95)
+    marks = [s['duplicate_of'] for s in result['sentences']]
+    assert marks == [None, None, 0, None]
+    assert result['document_stats']['duplicate_sentences'] == 1
+    assert build_llm_context(result).count('The mill was built') == 1
+
+    plain = preprocess_text(TEXT, nlp)
+    assert all(s['duplicate_of'] is None for s in plain['sentences'])
+
+
+def test_no_vectors_is_a_no_op():
+    nlp = spacy.blank('en')
+    nlp.add_pipe('sentencizer')
+    doc = nlp(TEXT)
+    sentences = [{'relevancy': 'context', 'confidence': 0.5, 'duplicate_of': None} for _ in doc.sents]
+    mark_duplicate_sentences(doc, sentences, [(s.start, s.end) for s in doc.sents], 0.5)
+    assert all(s['duplicate_of'] is None for s in sentences)
@@ -0,0 +1,59 @@
+"""Tests for the document session store."""
+
+import os
+
+import spacy
+
+import sessions as sessions_module
+from sessions import SessionStore
+
+
+def _doc(text='The mill was built in 1920.'):
+    return spacy.blank('en')(text)
+
+
+def test_get_refreshes_and_derived_tables_are_kept():
+    store = SessionStore()
+    session = store.create('text', _doc())
+    assert session.id.startswith(f'{os.getpid()}-')
+
+    calls = []
+    assert store.get(session.id).get_or_compute('x', lambda: calls.append(1) or 42) == 42
+    assert store.get(session.id).get_or_compute('x', lambda: calls.append(1) or 43) == 42
+    assert calls == [1]
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(sessions_module.time, 'monotonic', lambda: now[0])
+    store = SessionStore(ttl_s=10)
+    session = store.create('text', _doc())
+    now[0] += 5
+    assert store.get(session.id) is session
+    now[0] += 9  # 9s since last access
+    assert store.get(session.id) is session
+    now[0] += 11
+    assert store.get(session.id) is None
+    assert store.stats()['expired'] == 1
+    assert store.total_bytes == 0
+
+
+def test_memory_bound_evicts_least_recently_used():
+    store = SessionStore()
+    first = store.create('a', _doc())
+    store.max_bytes = first.size_bytes * 2
+    second = store.create('b', _doc())
+    store.get(first.id)
+    third = store.create('c', _doc())
+    assert store.get(second.id) is None
+    assert store.get(first.id) is first and store.get(third.id) is third
+    assert store.stats()['evicted'] == 1
+
+
+def test_delete_and_owner_pid():
+    store = SessionStore(max_sessions=5)
+    session = store.create('text', _doc())
+    assert store.delete(session.id)
+    assert not store.delete(session.id)
+    assert store.owner_pid('123-abc') == 123
+    assert store.owner_pid('abc') is None
@@ -0,0 +1,94 @@
+"""Tests for single-flight de-duplication."""
+
+import asyncio
+
+import pytest
+
+from singleflight import SingleFlight, make_key
+
+
+def test_key_depends_on_endpoint_text_and_options():
+    base = make_key('extract', 'text', {'a': 1, 'b': 2})
+    assert base == make_key('extract', 'text', {'b': 2, 'a': 1})
+    assert base != make_key('preprocess', 'text', {'a': 1, 'b': 2})
+    assert base != make_key('extract', 'text!', {'a': 1, 'b': 2})
+    assert base != make_key('extract', 'text', {'a': 1, 'b': 3})
+
+
+def test_concurrent_callers_share_one_computation():
+    async def scenario():
+        flights = SingleFlight()
+        runs = 0
+
+        async def work():
+            nonlocal runs
+            runs += 1
+            await asyncio.sleep(0.05)
+            return object()
+
+        results = await asyncio.gather(*(flights.do('k', work) for _ in range(5)))
+        assert runs == 1
+        assert all(r is results[0] for r in results)
+        assert flights.stats() == {'in_flight': 0, 'computed': 1, 'coalesced': 4}
+
+        # Completed work is not cached
+        await flights.do('k', work)
+        assert runs == 2
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_does_not_cancel_others():
+    async def scenario():
+        flights = SingleFlight()
+        started = asyncio.Event()
+
+        async def work():
+            started.set()
+            await asyncio.sleep(0.05)
+            return 'done'
+
+        first = asyncio.ensure_future(flights.do('k', work))
+        await started.wait()
+        second = asyncio.ensure_future(flights.do('k', work))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == 'done'
+
+    asyncio.run(scenario())
+
+
+def test_work_cancelled_when_every_waiter_leaves():
+    async def scenario():
+        flights = SingleFlight()
+        cancelled = asyncio.Event()
+
+        async def work():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        caller = asyncio.ensure_future(flights.do('k', work))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+        assert flights.stats()['in_flight'] == 0
+
+    asyncio.run(scenario())
+
+
+def test_exceptions_are_shared():
+    async def scenario():
+        flights = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError('boom')
+
+        results = await asyncio.gather(*(flights.do('k', work) for _ in range(3)),
+                                       return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in results)
+
+    asyncio.run(scenario())
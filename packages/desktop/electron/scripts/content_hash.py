@@ -0,0 +1,91 @@
+"""
+Hashing and extraction dedup for extract-text.py.
+
+Hashes follow docs/contracts/hashing.md: BLAKE3, first 16 lowercase hex
+characters, the same as the app's hash worker. Two are recorded per page:
+
+- rawHash: the page bytes exactly as downloaded, hashed chunk by chunk as
+  they arrive (page_fetch.py), so no second pass over the body
+- hash: the extracted content
+
+With a HashStore, a page whose rawHash was extracted before (the same
+capture saved twice, a mirror, an unchanged refresh) reuses the stored
+result instead of running the extractors again.
+
+BLAKE3 needs the optional blake3 package (pip install blake3). Without it
+hashes fall back to truncated SHA-256 and results say so in
+hashAlgorithm.
+
+Per CLAUDE.md/lilbits.md: Scripts under 300 LOC, single focused purpose.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, Optional
+
+try:
+    import blake3
+    HAS_BLAKE3 = True
+except ImportError:
+    HAS_BLAKE3 = False
+
+HASH_LENGTH = 16
+HASH_ALGORITHM = 'blake3' if HAS_BLAKE3 else 'sha256'
+
+
+def new_hasher():
+    """Incremental hasher (update(bytes) / hexdigest())."""
+    return blake3.blake3() if HAS_BLAKE3 else hashlib.sha256()
+
+
+def short_digest(hasher) -> str:
+    """16-hex-character hash from a hasher."""
+    return hasher.hexdigest()[:HASH_LENGTH]
+
+
+def hash_bytes(data) -> str:
+    """16-hex-character hash of bytes (or any buffer, e.g. an mmap)."""
+    hasher = new_hasher()
+    hasher.update(data)
+    return short_digest(hasher)
+
+
+class HashStore:
+    """
+    Extraction results keyed by the raw page hash, one JSON file each.
+
+    Files are bucketed by the first two hash characters, like the app's
+    thumbnails. Writes are atomic, so batch threads and offline worker
+    processes can share a store.
+
+    Args:
+        directory: Store directory (created if missing)
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, raw_hash: str) -> str:
+        return os.path.join(self.directory, raw_hash[:2], raw_hash + '.json')
+
+    def get(self, raw_hash: str) -> Optional[Dict[str, Any]]:
+        """The result stored for a raw page hash, or None."""
+        try:
+            with open(self._path(raw_hash), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, raw_hash: str, result: Dict[str, Any]):
+        """Store a result; failed extractions are not stored."""
+        if result.get('method') == 'failed':
+            return
+        path = self._path(raw_hash)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-', suffix='.part')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
@@ -4,216 +4,138 @@ OPT-110: Text extraction script for AU Archive web sources.
 Uses Trafilatura for main content extraction with BeautifulSoup fallback.
 
 Usage: python extract-text.py <url> <output_path>
-Output: JSON with title, author, date, content, wordCount, hash
+       python extract-text.py --batch <file|-> [--concurrency 8] [--per-host 2]
+       python extract-text.py --serve [--concurrency 4]
+       python extract-text.py --offline <file|dir>... [--jobs N]
+Output: JSON with title, author, date, content, wordCount, hash, rawHash, timings
+
+The page is fetched once (page_fetch.py: HTML only, at most --max-mb)
+and the same bytes feed every extractor; timings has fetchMs/extractMs.
+
+Batch mode reads "<url> [output_path]" lines from a file or stdin (-),
+extracts them concurrently in one process (see extract_batch.py), writes
+each result to its output path and prints one JSON status line per URL.
+
+With --cache-dir, a 304 to a conditional request returns the stored
+result without downloading or extracting again (see http_cache.py).
+
+Worker mode (--serve) keeps the libraries loaded and answers
+newline-delimited JSON requests on stdin (see extract_daemon.py).
+
+Hashes are BLAKE3 (content_hash.py); with --hash-store, a page whose raw
+bytes were extracted before reuses the stored result.
+
+Offline mode extracts saved HTML and WARC captures without the network,
+across worker processes, one JSON line per page (see offline_extract.py).
 
 This script provides better text extraction than browser-based extraction
 by using specialized libraries that understand article structure and
 can filter out navigation, ads, and boilerplate content.
 
 Dependencies:
-    pip install trafilatura beautifulsoup4 requests
+    pip install trafilatura beautifulsoup4 blake3
 
 Per CLAUDE.md/lilbits.md: Scripts under 300 LOC, single focused purpose.
 """
 
+import argparse
+import functools
 import sys
 import json
-import hashlib
-import html
-import re
-from datetime import datetime
 from typing import Optional, Dict, Any
 
-# Try importing optional dependencies with graceful fallback
-try:
-    import trafilatura
-    HAS_TRAFILATURA = True
-except ImportError:
-    HAS_TRAFILATURA = False
-
-try:
-    from bs4 import BeautifulSoup
-    import requests
-    HAS_BEAUTIFULSOUP = True
-except ImportError:
-    HAS_BEAUTIFULSOUP = False
-
-
-def decode_html_entities(text: str) -> str:
-    """Decode HTML entities like &#x2014; to actual characters."""
-    if not text:
-        return text
-    # Decode named and numeric entities
-    decoded = html.unescape(text)
-    return decoded
-
-
-def clean_text(text: str) -> str:
-    """Clean and normalize extracted text."""
-    if not text:
-        return ''
-    # Decode HTML entities
-    text = decode_html_entities(text)
-    # Normalize whitespace
-    text = re.sub(r'\s+', ' ', text)
-    # Remove leading/trailing whitespace
-    text = text.strip()
-    return text
-
-
-def extract_with_trafilatura(url: str) -> Optional[Dict[str, Any]]:
-    """Extract content using Trafilatura (preferred method)."""
-    if not HAS_TRAFILATURA:
-        return None
+from content_hash import HashStore
+from extract_batch import run_batch_mode
+from extract_daemon import serve
+from http_cache import HttpCache, add_cache_arguments, open_cache
+from offline_extract import run_offline_mode
+from page_extract import extract_page
+from page_fetch import DEFAULT_MAX_BYTES, FetchError, fetch_page
+from soup_backend import DEFAULT_PARSER, PARSERS, parser_for
+
+
+def extract_url(
+    url: str,
+    cache: Optional[HttpCache] = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    store: Optional[HashStore] = None,
+    html_parser: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Fetch a URL once, run the extractor chain on it and add metadata."""
+    errors = []
+    timings = {'fetchMs': 0.0, 'extractMs': 0.0}
+    cached = cache.get(url) if cache else None
 
     try:
-        downloaded = trafilatura.fetch_url(url)
-        if not downloaded:
-            return None
-
-        # Extract with full metadata
-        result = trafilatura.extract(
-            downloaded,
-            include_comments=False,
-            include_tables=True,
-            no_fallback=False,
-            favor_precision=True,
-            output_format='json'
-        )
-
-        if not result:
-            return None
-
-        data = json.loads(result)
-        content = clean_text(data.get('text', ''))
-
-        return {
-            'title': clean_text(data.get('title')),
-            'author': clean_text(data.get('author')),
-            'date': data.get('date'),
-            'content': content,
-            'wordCount': len(content.split()) if content else 0,
-            'method': 'trafilatura'
-        }
-    except Exception as e:
-        print(f"Trafilatura error: {e}", file=sys.stderr)
-        return None
-
-
-def extract_with_beautifulsoup(url: str) -> Optional[Dict[str, Any]]:
-    """Fallback extraction using BeautifulSoup."""
-    if not HAS_BEAUTIFULSOUP:
-        return None
+        page = fetch_page(url, headers=cached.conditional_headers() if cached else None, max_bytes=max_bytes)
+        timings['fetchMs'] = page.fetch_ms
+    except FetchError as e:
+        print(str(e), file=sys.stderr)
+        errors.append(str(e))
+        page = None
 
-    try:
-        response = requests.get(url, timeout=30, headers={
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (compatible; AUArchive/1.0)'
-        })
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Remove script, style, nav, footer, sidebar elements
-        for tag in soup(['script', 'style', 'nav', 'footer', 'header', 'aside', 'noscript']):
-            tag.decompose()
-
-        # Remove common ad/navigation class patterns
-        for element in soup.find_all(class_=re.compile(r'(sidebar|menu|nav|ad|cookie|popup|modal|share|social)', re.I)):
-            element.decompose()
-
-        # Try to find main content using semantic hierarchy
-        main_content = (
-            soup.find('article') or
-            soup.find('main') or
-            soup.find(class_=re.compile(r'(content|post-content|entry-content|article-body)', re.I)) or
-            soup.find(id=re.compile(r'(content|main|article)', re.I)) or
-            soup.find('body')
-        )
-
-        if not main_content:
-            return None
-
-        content = clean_text(main_content.get_text(separator=' ', strip=True))
-
-        # Extract metadata
-        title = None
-        title_tag = soup.find('title')
-        if title_tag:
-            title = clean_text(title_tag.get_text(strip=True))
-
-        # Try og:title if regular title looks like site name
-        og_title = soup.find('meta', property='og:title')
-        if og_title and og_title.get('content'):
-            og_title_text = clean_text(og_title['content'])
-            if og_title_text and (not title or len(og_title_text) > len(title)):
-                title = og_title_text
-
-        author = None
-        author_meta = soup.find('meta', attrs={'name': 'author'})
-        if author_meta:
-            author = clean_text(author_meta.get('content'))
-
-        date = None
-        # Try multiple date meta tags
-        for prop in ['article:published_time', 'datePublished', 'date']:
-            date_meta = soup.find('meta', attrs={'property': prop}) or soup.find('meta', attrs={'name': prop})
-            if date_meta and date_meta.get('content'):
-                date = date_meta['content']
-                break
-
-        return {
-            'title': title,
-            'author': author,
-            'date': date,
-            'content': content,
-            'wordCount': len(content.split()) if content else 0,
-            'method': 'beautifulsoup'
-        }
-    except Exception as e:
-        print(f"BeautifulSoup error: {e}", file=sys.stderr)
-        return None
-
-
-def calculate_hash(content: str) -> str:
-    """
-    Calculate content hash for integrity verification.
-    Uses first 16 hex chars to match BLAKE3 format used elsewhere in app.
-    """
-    return hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+    if cached and cache.revalidated(page):
+        return {**cached.result, 'notModified': True, 'timings': timings}
+
+    result = extract_page(page, url, errors, timings, store, html_parser)
+    if cache and page is not None:
+        cache.put(url, page.headers, result)
+    return result
+
+
+def write_result(result: Dict[str, Any], output_path: str):
+    """Write one result as pretty-printed JSON."""
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
 
 
 def main():
-    if len(sys.argv) < 3:
+    parser = argparse.ArgumentParser(description='Extract article text from web pages')
+    parser.add_argument('url', nargs='?', help='URL to extract')
+    parser.add_argument('output_path', nargs='?', help='Where to write the JSON result')
+    parser.add_argument('--batch', metavar='FILE', help='File of "<url> [output_path]" lines, - for stdin')
+    parser.add_argument('--serve', action='store_true', help='NDJSON worker mode on stdin/stdout')
+    parser.add_argument('--offline', nargs='+', metavar='PATH', help='Extract saved HTML/WARC files or directories')
+    parser.add_argument('--jobs', type=int, default=None, help='Offline: worker processes (default: CPU count)')
+    parser.add_argument('--concurrency', type=int, default=None,
+                        help='Concurrent extractions (batch default 8, worker default 4)')
+    parser.add_argument('--per-host', type=int, default=2, help='Batch: concurrent requests per host')
+    parser.add_argument('--max-mb', type=float, default=DEFAULT_MAX_BYTES / 1024 / 1024, help='Largest page fetched')
+    parser.add_argument('--hash-store', metavar='DIR', help='Reuse results for pages whose raw bytes were seen before')
+    parser.add_argument('--html-parser', choices=PARSERS, default=None,
+                        help=f'BeautifulSoup fallback parser (default {DEFAULT_PARSER})')
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+    try:
+        parser_for(args.html_parser)
+    except ValueError as e:
+        parser.error(str(e))
+    store = HashStore(args.hash_store) if args.hash_store else None
+    extract = functools.partial(extract_url, cache=open_cache(args), max_bytes=int(args.max_mb * 1024 * 1024),
+                                store=store, html_parser=args.html_parser)
+
+    if args.offline:
+        sys.exit(run_offline_mode(args.offline, args.jobs, store_dir=args.hash_store,
+                                  html_parser=args.html_parser))
+
+    if args.batch:
+        sys.exit(run_batch_mode(args.batch, extract, write_result, args.concurrency or 8, args.per_host))
+
+    if args.serve:
+        # stdout carries protocol lines only; stray prints go to stderr
+        protocol_out = sys.stdout
+        sys.stdout = sys.stderr
+        serve(extract, write_result, sys.stdin, protocol_out, args.concurrency or 4)
+        return
+
+    if not args.url or not args.output_path:
         print("Usage: extract-text.py <url> <output_path>", file=sys.stderr)
         sys.exit(1)
 
-    url = sys.argv[1]
-    output_path = sys.argv[2]
-
-    # Try Trafilatura first (better quality), then BeautifulSoup
-    result = extract_with_trafilatura(url)
-    if not result:
-        result = extract_with_beautifulsoup(url)
-
-    if not result:
-        # Return empty result on failure
-        result = {
-            'title': None,
-            'author': None,
-            'date': None,
-            'content': '',
-            'wordCount': 0,
-            'method': 'failed'
-        }
-
-    # Add metadata
-    result['hash'] = calculate_hash(result.get('content', ''))
-    result['extractedAt'] = datetime.utcnow().isoformat() + 'Z'
-    result['url'] = url
+    result = extract(args.url)
 
     # Write output to file
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(result, f, indent=2, ensure_ascii=False)
+    write_result(result, args.output_path)
 
     # Also print to stdout for Node.js to capture
     print(json.dumps(result))
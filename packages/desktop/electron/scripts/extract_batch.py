@@ -0,0 +1,180 @@
+"""
+Concurrent batch runner for extract-text.py.
+
+Archiving a research session means hundreds of links; running one
+interpreter per link pays Python startup and library imports every time
+and fetches strictly one after another. The batch runner extracts a list
+of URLs in one process, concurrently, while staying polite to each host.
+
+- Global concurrency limit (worker threads)
+- Per-host limit: a worker picks the next URL whose host has a free slot,
+  so a long run of links to one site doesn't block the others
+- One result per URL; an exception in one URL is reported for that URL
+  and doesn't stop the batch
+
+Per CLAUDE.md/lilbits.md: Scripts under 300 LOC, single focused purpose.
+"""
+
+import json
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+Job = Tuple[str, Optional[str]]
+
+
+def parse_jobs(lines: Iterable[str]) -> List[Job]:
+    """
+    Parse batch input: one "<url> [output_path]" per line.
+
+    URL and output path are separated by a tab or whitespace; blank lines
+    and lines starting with '#' are skipped.
+    """
+    jobs = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        parts = line.split('\t', 1) if '\t' in line else line.split(None, 1)
+        url = parts[0].strip()
+        output_path = parts[1].strip() if len(parts) > 1 and parts[1].strip() else None
+        jobs.append((url, output_path))
+    return jobs
+
+
+def host_of(url: str) -> str:
+    """Host (with port) used for the per-host limit."""
+    return urlsplit(url).netloc.lower()
+
+
+class _Dispatcher:
+    """Hands out jobs in order, skipping those whose host is at its limit."""
+
+    def __init__(self, jobs: List[Job], per_host: int):
+        self.pending = list(enumerate(jobs))
+        self.per_host = max(1, per_host)
+        self.active: Dict[str, int] = {}
+        self.condition = threading.Condition()
+
+    def take(self) -> Optional[Tuple[int, Job]]:
+        with self.condition:
+            while self.pending:
+                for i, (index, job) in enumerate(self.pending):
+                    host = host_of(job[0])
+                    if self.active.get(host, 0) < self.per_host:
+                        del self.pending[i]
+                        self.active[host] = self.active.get(host, 0) + 1
+                        return index, job
+                self.condition.wait()
+            return None
+
+    def done(self, job: Job):
+        with self.condition:
+            host = host_of(job[0])
+            self.active[host] -= 1
+            self.condition.notify_all()
+
+
+def run_batch(
+    jobs: List[Job],
+    extract: Callable[[str], Dict[str, Any]],
+    concurrency: int = 8,
+    per_host: int = 2,
+    on_result: Optional[Callable[[Job, Dict[str, Any]], None]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Extract every job's URL concurrently.
+
+    Args:
+        jobs: (url, output_path) pairs, see parse_jobs
+        extract: Function returning the result dict for a URL
+        concurrency: Worker threads (global limit)
+        per_host: Concurrent requests per host
+        on_result: Called from the worker thread with each job and its
+            status as soon as it finishes
+
+    Returns:
+        Status per job, in input order: url, output, ok, method,
+        wordCount, error, elapsedMs (and result, for the caller to write)
+    """
+    dispatcher = _Dispatcher(jobs, per_host)
+    statuses: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+
+    def worker():
+        while True:
+            taken = dispatcher.take()
+            if taken is None:
+                return
+            index, job = taken
+            url, output_path = job
+            start = time.perf_counter()
+            status: Dict[str, Any] = {'url': url, 'output': output_path}
+            try:
+                result = extract(url)
+                status.update(
+                    ok=result.get('method') != 'failed',
+                    method=result.get('method'),
+                    wordCount=result.get('wordCount', 0),
+                    error=result.get('error'),
+                    result=result,
+                )
+            except Exception as e:
+                status.update(ok=False, method='failed', wordCount=0, error=f"{type(e).__name__}: {e}")
+            finally:
+                dispatcher.done(job)
+            status['elapsedMs'] = round((time.perf_counter() - start) * 1000, 1)
+            statuses[index] = status
+            if on_result is not None:
+                on_result(job, status)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(max(1, min(concurrency, len(jobs))))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return statuses
+
+
+def run_batch_mode(
+    source: str,
+    extract: Callable[[str], Dict[str, Any]],
+    write_result: Callable[[Dict[str, Any], str], None],
+    concurrency: int = 8,
+    per_host: int = 2,
+) -> int:
+    """
+    extract-text.py --batch: extract every listed URL from a file or stdin
+    (-), write each result to its output path and print one JSON status
+    line per URL.
+
+    Returns:
+        Exit code (per-URL failures are reported on their status lines)
+    """
+    if source == '-':
+        jobs = parse_jobs(sys.stdin)
+    else:
+        with open(source, encoding='utf-8') as f:
+            jobs = parse_jobs(f)
+
+    print_lock = threading.Lock()
+
+    def on_result(job, status):
+        result = status.pop('result', None)
+        output_path = job[1]
+        if result is not None and output_path:
+            try:
+                write_result(result, output_path)
+            except OSError as e:
+                status.update(ok=False, error=f"Write error: {e}")
+        elif result is not None:
+            # No output path: the result goes on the status line
+            status['result'] = result
+        with print_lock:
+            print(json.dumps(status, ensure_ascii=False), flush=True)
+
+    statuses = run_batch(jobs, extract, concurrency, per_host, on_result)
+    failed = sum(1 for status in statuses if not status['ok'])
+    print(f"Batch done: {len(statuses) - failed} ok, {failed} failed", file=sys.stderr)
+    return 0
@@ -0,0 +1,119 @@
+"""
+Persistent NDJSON worker mode for extract-text.py.
+
+Python startup plus the trafilatura/lxml/bs4 imports often cost more than
+extracting a page. In worker mode the Electron main process keeps one
+warm extractor and sends it requests over stdin instead of spawning a
+process per page.
+
+Protocol (one JSON object per line, both directions):
+    -> {"id": "1", "url": "https://...", "outputPath": "/tmp/1.json"}
+    <- {"id": "1", "ok": true, "result": {...}, "elapsedMs": 812.4}
+    <- {"id": "2", "ok": false, "error": "..."}
+
+- "outputPath" is optional; the result is always in the response
+- Requests are handled concurrently, so responses can arrive out of
+  order: match them by id
+- {"op": "ping"} is answered with {"id": ..., "ok": true, "op": "pong"}
+- {"op": "shutdown"} or end of input stops reading; in-flight requests
+  are finished first
+- {"event": "ready", "pid": ...} is written once libraries are loaded
+
+Per CLAUDE.md/lilbits.md: Scripts under 300 LOC, single focused purpose.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TextIO
+
+
+class _Writer:
+    """Serializes response lines from worker threads."""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self.lock = threading.Lock()
+
+    def send(self, message: Dict[str, Any]):
+        line = json.dumps(message, ensure_ascii=False)
+        with self.lock:
+            self.stream.write(line + '\n')
+            self.stream.flush()
+
+
+def _handle(
+    request: Dict[str, Any],
+    extract: Callable[[str], Dict[str, Any]],
+    write_result: Callable[[Dict[str, Any], str], None],
+) -> Dict[str, Any]:
+    start = time.perf_counter()
+    response: Dict[str, Any] = {'id': request.get('id')}
+    url = request.get('url')
+    if not isinstance(url, str) or not url:
+        response.update(ok=False, error='url is required')
+        return response
+    try:
+        result = extract(url)
+        if request.get('outputPath'):
+            write_result(result, request['outputPath'])
+        response.update(ok=result.get('method') != 'failed', result=result)
+        if result.get('error'):
+            response['error'] = result['error']
+    except Exception as e:
+        response.update(ok=False, error=f"{type(e).__name__}: {e}")
+    response['elapsedMs'] = round((time.perf_counter() - start) * 1000, 1)
+    return response
+
+
+def serve(
+    extract: Callable[[str], Dict[str, Any]],
+    write_result: Callable[[Dict[str, Any], str], None],
+    stdin: TextIO,
+    stdout: TextIO,
+    concurrency: int = 4,
+) -> int:
+    """
+    Answer NDJSON requests from stdin until shutdown or end of input.
+
+    Args:
+        extract: Function returning the result dict for a URL
+        write_result: Writes a result to an output path
+        stdin: Request stream
+        stdout: Response stream (nothing else may write to it)
+        concurrency: Requests handled at once
+
+    Returns:
+        Number of extraction requests handled
+    """
+    writer = _Writer(stdout)
+    handled = 0
+
+    def respond(request):
+        writer.send(_handle(request, extract, write_result))
+
+    writer.send({'event': 'ready', 'pid': os.getpid()})
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix='extract') as pool:
+        for line in stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError('request must be a JSON object')
+            except ValueError as e:
+                writer.send({'id': None, 'ok': False, 'error': f'Invalid request: {e}'})
+                continue
+
+            op: Optional[str] = request.get('op')
+            if op == 'shutdown':
+                break
+            if op == 'ping':
+                writer.send({'id': request.get('id'), 'ok': True, 'op': 'pong'})
+                continue
+            pool.submit(respond, request)
+            handled += 1
+    return handled
@@ -0,0 +1,178 @@
+"""
+Conditional-request cache for extract-text.py.
+
+Refreshing a saved web source used to download and extract the whole
+page again even when nothing had changed. The cache keeps, per URL, the
+ETag / Last-Modified validators and the extraction result. The next
+fetch sends If-None-Match / If-Modified-Since; on 304 Not Modified the
+stored result is returned without downloading or extracting anything.
+
+- One JSON file per URL in the cache directory (written atomically)
+- Size capped in bytes, least recently used entries evicted first
+  (file mtime is the last-use time, so it survives restarts)
+- Only successful extractions of pages that sent a validator are stored
+- Thread-safe for batch and worker mode
+
+Per CLAUDE.md/lilbits.md: Scripts under 300 LOC, single focused purpose.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Response header -> request header
+VALIDATORS = {'etag': 'If-None-Match', 'last-modified': 'If-Modified-Since'}
+
+
+class CacheEntry:
+    """A stored result and the validators to revalidate it with."""
+
+    def __init__(self, url: str, validators: Dict[str, str], result: Dict[str, Any]):
+        self.url = url
+        self.validators = validators
+        self.result = result
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Request headers that make the server answer 304 if unchanged."""
+        return {VALIDATORS[name]: value for name, value in self.validators.items() if name in VALIDATORS}
+
+
+class HttpCache:
+    """
+    On-disk cache of extraction results keyed by URL.
+
+    Args:
+        directory: Cache directory (created if missing)
+        max_bytes: Total size of the entries; least recently used beyond
+            this are evicted
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max(0, max_bytes)
+        self._lock = threading.Lock()
+        self._sizes: Optional[Dict[str, int]] = None  # key -> bytes, loaded lazily
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _key(self, url: str) -> str:
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.json')
+
+    def _index(self) -> Dict[str, int]:
+        if self._sizes is None:
+            self._sizes = {}
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith('.json') and entry.is_file():
+                    self._sizes[entry.name[:-5]] = entry.stat().st_size
+        return self._sizes
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """The stored entry for a URL (marked as recently used), or None."""
+        path = self._path(self._key(url))
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        if data.get('url') != url:
+            return None
+        return CacheEntry(url, data.get('validators', {}), data.get('result', {}))
+
+    def put(self, url: str, validators: Dict[str, str], result: Dict[str, Any]):
+        """Store a result; ignored when there is nothing to revalidate with."""
+        validators = {name: value for name, value in validators.items() if name in VALIDATORS and value}
+        if not validators or result.get('method') == 'failed':
+            return
+
+        key = self._key(url)
+        payload = json.dumps({'url': url, 'validators': validators, 'result': result}, ensure_ascii=False)
+        size = len(payload.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-', suffix='.part')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(tmp_path, self._path(key))
+
+        with self._lock:
+            self._index()[key] = size
+            self.stores += 1
+            self._evict()
+
+    def _evict(self):
+        sizes = self._index()
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return
+        by_last_use = []
+        for key in sizes:
+            try:
+                by_last_use.append((os.path.getmtime(self._path(key)), key))
+            except OSError:
+                by_last_use.append((0.0, key))
+        for _, key in sorted(by_last_use):
+            if total <= self.max_bytes:
+                break
+            total -= sizes.pop(key)
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            self.evictions += 1
+
+    def revalidated(self, page) -> bool:
+        """
+        Whether a conditional fetch confirmed the stored entry is current.
+
+        Args:
+            page: FetchedPage from the conditional request, or None when
+                the fetch failed
+        """
+        hit = page is not None and page.not_modified
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return hit
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for logging."""
+        with self._lock:
+            sizes = self._index()
+            return {
+                'entries': len(sizes),
+                'bytes': sum(sizes.values()),
+                'maxBytes': self.max_bytes,
+                'notModified': self.hits,
+                'misses': self.misses,
+                'stores': self.stores,
+                'evictions': self.evictions,
+            }
+
+
+def add_cache_arguments(parser):
+    """Add --cache-dir / --cache-max-mb to extract-text.py's parser."""
+    parser.add_argument('--cache-dir', help='Revalidate against results cached here (ETag/Last-Modified)')
+    parser.add_argument('--cache-max-mb', type=float, default=DEFAULT_MAX_BYTES / 1024 / 1024,
+                        help='Cache size cap; least recently used entries are evicted')
+
+
+def open_cache(args) -> Optional[HttpCache]:
+    """The cache selected on the command line, or None without --cache-dir."""
+    if not args.cache_dir:
+        return None
+    return HttpCache(args.cache_dir, int(args.cache_max_mb * 1024 * 1024))
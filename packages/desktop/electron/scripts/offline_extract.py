@@ -0,0 +1,257 @@
+"""
+Offline extraction for extract-text.py (--offline).
+
+The app already keeps page captures on disk (saved HTML and WARC files),
+so re-running extraction over the archive should not fetch every page
+again. Offline mode reads captures directly and extracts them across
+cores, writing one JSON line per page.
+
+- Inputs: .html/.htm/.xhtml files and .warc/.warc.gz archives, given as
+  files or directory trees
+- Files are memory-mapped; WARC records that are not HTML responses
+  (images, CSS, requests, metadata) are skipped by seeking past them
+  without copying their payload
+- Only 2xx HTML responses in WARCs are extracted; chunked transfer
+  encoding and gzip/deflate content encoding are undone
+- One worker process per core by default; each file is one task
+- With a hash store (content_hash.py), pages seen before are not
+  extracted again, across files and runs
+
+Per CLAUDE.md/lilbits.md: Scripts under 300 LOC, single focused purpose.
+"""
+
+import gzip
+import json
+import mmap
+import os
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from content_hash import HashStore, hash_bytes
+from page_extract import extract_page
+from page_fetch import HTML_TYPES, FetchedPage, looks_like_markup
+
+HTML_SUFFIXES = ('.html', '.htm', '.xhtml')
+WARC_SUFFIXES = ('.warc', '.warc.gz')
+
+
+def _suffix_match(path: str, suffixes) -> bool:
+    return path.lower().endswith(suffixes)
+
+
+def find_inputs(paths: Iterable[str]) -> List[str]:
+    """Capture files among paths, directories searched recursively, sorted."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                found.extend(os.path.join(root, name) for name in names
+                             if _suffix_match(name, HTML_SUFFIXES + WARC_SUFFIXES))
+        elif os.path.isfile(path):
+            found.append(path)
+        else:
+            raise FileNotFoundError(path)
+    return sorted(found)
+
+
+class _mapped:
+    """Read-only memory map of a file (empty files map to b'')."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __enter__(self):
+        self.file = open(self.path, 'rb')
+        if os.fstat(self.file.fileno()).st_size == 0:
+            self.map = None
+            return b''
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.map
+
+    def __exit__(self, *exc):
+        if self.map is not None:
+            self.map.close()
+        self.file.close()
+
+
+# =============================================================================
+# WARC
+# =============================================================================
+
+def _read_headers(stream) -> Dict[str, str]:
+    headers = {}
+    while True:
+        line = stream.readline()
+        if not line or not line.strip():
+            return headers
+        name, sep, value = line.decode('latin-1').partition(':')
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+
+
+def _dechunk(body: bytes) -> bytes:
+    out = []
+    pos = 0
+    while pos < len(body):
+        end = body.find(b'\r\n', pos)
+        if end < 0:
+            break
+        size = int(body[pos:end].split(b';')[0].strip() or b'0', 16)
+        if size == 0:
+            break
+        out.append(body[end + 2:end + 2 + size])
+        pos = end + 2 + size + 2
+    return b''.join(out)
+
+
+def _decode_body(body: bytes, headers: Dict[str, str]) -> bytes:
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        body = _dechunk(body)
+    encoding = headers.get('content-encoding', '').lower()
+    if encoding in ('gzip', 'x-gzip'):
+        body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+    elif encoding == 'deflate':
+        try:
+            body = zlib.decompress(body)
+        except zlib.error:
+            body = zlib.decompress(body, -zlib.MAX_WBITS)
+    return body
+
+
+def iter_warc_pages(stream, source: str) -> Iterator[FetchedPage]:
+    """
+    HTML responses in a WARC stream (a memory map or a gzip reader).
+
+    Args:
+        stream: Binary stream with readline/read/seek/tell
+        source: File path, for error messages
+
+    Raises:
+        ValueError: Not a WARC file
+    """
+    while True:
+        line = stream.readline()
+        if not line:
+            return
+        if not line.strip():
+            continue
+        if not line.startswith(b'WARC/'):
+            raise ValueError(f"{source}: not a WARC record at byte {stream.tell() - len(line)}")
+
+        warc = _read_headers(stream)
+        length = int(warc.get('content-length', '0'))
+        block_start = stream.tell()
+        if warc.get('warc-type') != 'response' or not warc.get('content-type', '').startswith('application/http'):
+            stream.seek(block_start + length)
+            continue
+
+        status_line = stream.readline().split(None, 2)
+        http = _read_headers(stream)
+        remaining = length - (stream.tell() - block_start)
+        status = int(status_line[1]) if len(status_line) > 1 and status_line[1].isdigit() else 0
+        content_type = http.get('content-type', '').split(';')[0].strip().lower()
+        if not 200 <= status < 300 or (content_type and content_type not in HTML_TYPES):
+            stream.seek(block_start + length)
+            continue
+
+        body = _decode_body(stream.read(remaining), http)
+        if not content_type and not looks_like_markup(body):
+            continue
+        url = warc.get('warc-target-uri', '').strip('<>')
+        yield FetchedPage(url, url, status, http, body, 0.0)
+
+
+# =============================================================================
+# EXTRACTION
+# =============================================================================
+
+def extract_file(
+    path: str,
+    store_dir: Optional[str] = None,
+    html_parser: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Extract every page in one capture file (runs in a worker process).
+
+    Args:
+        path: HTML or WARC file
+        store_dir: HashStore directory for dedup by raw page hash
+        html_parser: BeautifulSoup parser for the fallback extractor
+
+    Returns:
+        One result per page, with 'source' set to the file path; a file
+        that cannot be read gives a single failed result
+    """
+    results = []
+    store = HashStore(store_dir) if store_dir else None
+    start = time.perf_counter()
+    try:
+        with _mapped(path) as data:
+            if _suffix_match(path, HTML_SUFFIXES):
+                page = FetchedPage(Path(path).resolve().as_uri(), path, 200, {}, data[:], 0.0, hash_bytes(data))
+                pages = [page]
+            elif path.lower().endswith('.gz'):
+                pages = iter_warc_pages(gzip.GzipFile(fileobj=data), path) if data else []
+            else:
+                pages = iter_warc_pages(data, path) if data else []
+
+            for page in pages:
+                timings = {'readMs': round((time.perf_counter() - start) * 1000, 1), 'extractMs': 0.0}
+                result = extract_page(page, page.url, timings=timings, store=store, html_parser=html_parser)
+                result['source'] = path
+                results.append(result)
+                start = time.perf_counter()
+    except (OSError, ValueError, EOFError, zlib.error) as e:
+        results.append({'source': path, 'url': None, 'method': 'failed', 'content': '', 'wordCount': 0,
+                        'error': f"Read error: {e}"})
+    return results
+
+
+def run_offline_mode(
+    paths: List[str],
+    jobs: Optional[int] = None,
+    out=None,
+    store_dir: Optional[str] = None,
+    html_parser: Optional[str] = None,
+) -> int:
+    """
+    extract-text.py --offline: extract every capture under paths and
+    print one JSON line per page.
+
+    Args:
+        paths: Files and directories
+        jobs: Worker processes (default: CPU count; 1 runs in-process)
+        out: Where to write the lines (default stdout)
+        store_dir: HashStore directory for dedup by raw page hash
+        html_parser: BeautifulSoup parser for the fallback extractor
+
+    Returns:
+        Exit code (per-page failures are reported on their lines)
+    """
+    out = out or sys.stdout
+    files = find_inputs(paths)
+    jobs = jobs or os.cpu_count() or 1
+    pages = failed = 0
+
+    def emit(results):
+        nonlocal pages, failed
+        for result in results:
+            pages += 1
+            failed += result.get('method') == 'failed'
+            out.write(json.dumps(result, ensure_ascii=False) + '\n')
+        out.flush()
+
+    if jobs <= 1 or len(files) <= 1:
+        for path in files:
+            emit(extract_file(path, store_dir, html_parser))
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(files))) as pool:
+            for future in as_completed([pool.submit(extract_file, path, store_dir, html_parser) for path in files]):
+                emit(future.result())
+
+    print(f"Offline done: {len(files)} files, {pages - failed} pages ok, {failed} failed", file=sys.stderr)
+    return 0
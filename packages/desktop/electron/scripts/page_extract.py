@@ -0,0 +1,247 @@
+"""
+Extractor chain for extract-text.py.
+
+Turns a downloaded (or locally read) page into the result JSON:
+Trafilatura first, BeautifulSoup as the fallback, plus the content and
+raw-page hashes, timestamp and timings. With a HashStore, a page whose
+raw bytes were extracted before reuses that result. Kept apart from the fetch/CLI code so offline mode
+(offline_extract.py) can run it in worker processes.
+
+Per CLAUDE.md/lilbits.md: Scripts under 300 LOC, single focused purpose.
+"""
+
+import sys
+import json
+import html
+import re
+import time
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+from content_hash import HASH_ALGORITHM, HashStore, hash_bytes
+from page_fetch import FetchedPage
+from soup_backend import parser_for, prune
+
+# Try importing optional dependencies with graceful fallback
+try:
+    import trafilatura
+    HAS_TRAFILATURA = True
+except ImportError:
+    HAS_TRAFILATURA = False
+
+try:
+    from bs4 import BeautifulSoup
+    HAS_BEAUTIFULSOUP = True
+except ImportError:
+    HAS_BEAUTIFULSOUP = False
+
+
+def decode_html_entities(text: str) -> str:
+    """Decode HTML entities like &#x2014; to actual characters."""
+    if not text:
+        return text
+    # Decode named and numeric entities
+    decoded = html.unescape(text)
+    return decoded
+
+
+def clean_text(text: str) -> str:
+    """Clean and normalize extracted text."""
+    if not text:
+        return ''
+    # Decode HTML entities
+    text = decode_html_entities(text)
+    # Normalize whitespace
+    text = re.sub(r'\s+', ' ', text)
+    # Remove leading/trailing whitespace
+    text = text.strip()
+    return text
+
+
+def extract_with_trafilatura(page: FetchedPage, errors: Optional[list] = None) -> Optional[Dict[str, Any]]:
+    """Extract content using Trafilatura (preferred method)."""
+    if not HAS_TRAFILATURA:
+        return None
+
+    try:
+        downloaded = page.text() if page.charset else page.body
+        if not downloaded:
+            return None
+
+        # Extract with full metadata
+        result = trafilatura.extract(
+            downloaded,
+            include_comments=False,
+            include_tables=True,
+            no_fallback=False,
+            favor_precision=True,
+            output_format='json'
+        )
+
+        if not result:
+            return None
+
+        data = json.loads(result)
+        content = clean_text(data.get('text', ''))
+
+        return {
+            'title': clean_text(data.get('title')),
+            'author': clean_text(data.get('author')),
+            'date': data.get('date'),
+            'content': content,
+            'wordCount': len(content.split()) if content else 0,
+            'method': 'trafilatura'
+        }
+    except Exception as e:
+        print(f"Trafilatura error: {e}", file=sys.stderr)
+        if errors is not None:
+            errors.append(f"Trafilatura error: {e}")
+        return None
+
+
+# Removed before looking for the main content
+BOILERPLATE_TAGS = ('script', 'style', 'nav', 'footer', 'header', 'aside', 'noscript')
+BOILERPLATE_CLASS_PATTERN = re.compile(r'(sidebar|menu|nav|ad|cookie|popup|modal|share|social)', re.I)
+
+
+def extract_with_beautifulsoup(
+    page: FetchedPage,
+    errors: Optional[list] = None,
+    parser: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """Fallback extraction using BeautifulSoup (parser: see soup_backend.py)."""
+    if not HAS_BEAUTIFULSOUP:
+        return None
+
+    try:
+        soup = BeautifulSoup(page.text(), parser_for(parser))
+
+        # Remove script, style, nav, footer, sidebar elements and common
+        # ad/navigation class patterns, in one pass over the tree
+        prune(soup, BOILERPLATE_TAGS, BOILERPLATE_CLASS_PATTERN)
+
+        # Try to find main content using semantic hierarchy
+        main_content = (
+            soup.find('article') or
+            soup.find('main') or
+            soup.find(class_=re.compile(r'(content|post-content|entry-content|article-body)', re.I)) or
+            soup.find(id=re.compile(r'(content|main|article)', re.I)) or
+            soup.find('body')
+        )
+
+        if not main_content:
+            return None
+
+        content = clean_text(main_content.get_text(separator=' ', strip=True))
+
+        # Extract metadata
+        title = None
+        title_tag = soup.find('title')
+        if title_tag:
+            title = clean_text(title_tag.get_text(strip=True))
+
+        # Try og:title if regular title looks like site name
+        og_title = soup.find('meta', property='og:title')
+        if og_title and og_title.get('content'):
+            og_title_text = clean_text(og_title['content'])
+            if og_title_text and (not title or len(og_title_text) > len(title)):
+                title = og_title_text
+
+        author = None
+        author_meta = soup.find('meta', attrs={'name': 'author'})
+        if author_meta:
+            author = clean_text(author_meta.get('content'))
+
+        date = None
+        # Try multiple date meta tags
+        for prop in ['article:published_time', 'datePublished', 'date']:
+            date_meta = soup.find('meta', attrs={'property': prop}) or soup.find('meta', attrs={'name': prop})
+            if date_meta and date_meta.get('content'):
+                date = date_meta['content']
+                break
+
+        return {
+            'title': title,
+            'author': author,
+            'date': date,
+            'content': content,
+            'wordCount': len(content.split()) if content else 0,
+            'method': 'beautifulsoup'
+        }
+    except Exception as e:
+        print(f"BeautifulSoup error: {e}", file=sys.stderr)
+        if errors is not None:
+            errors.append(f"BeautifulSoup error: {e}")
+        return None
+
+
+def calculate_hash(content: str) -> str:
+    """
+    Calculate content hash for integrity verification.
+    BLAKE3, first 16 hex chars, per docs/contracts/hashing.md.
+    """
+    return hash_bytes(content.encode('utf-8'))
+
+
+def extract_page(
+    page: Optional[FetchedPage],
+    url: str,
+    errors: Optional[list] = None,
+    timings: Optional[Dict[str, float]] = None,
+    store: Optional[HashStore] = None,
+    html_parser: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Run the extractor chain on a page and add metadata.
+
+    Args:
+        page: Downloaded page, or None when fetching failed
+        url: URL reported in the result
+        errors: Errors so far (e.g. the fetch error), reported on failure
+        timings: Timings so far; extractMs is filled in here
+        store: Results of earlier extractions by raw page hash; a hit is
+            returned (marked deduplicated) without extracting
+        html_parser: BeautifulSoup parser for the fallback (default lxml
+            when installed)
+    """
+    errors = errors if errors is not None else []
+    timings = timings if timings is not None else {'fetchMs': 0.0, 'extractMs': 0.0}
+    result = None
+
+    if page is not None and store is not None:
+        stored = store.get(page.raw_hash)
+        if stored is not None:
+            return {**stored, 'url': url, 'timings': timings, 'deduplicated': True, 'duplicateOf': stored.get('url')}
+
+    if page is not None:
+        start = time.perf_counter()
+        # Try Trafilatura first (better quality), then BeautifulSoup, on
+        # the same downloaded bytes
+        result = extract_with_trafilatura(page, errors)
+        if not result:
+            result = extract_with_beautifulsoup(page, errors, html_parser)
+        timings['extractMs'] = round((time.perf_counter() - start) * 1000, 1)
+
+    if not result:
+        # Return empty result on failure
+        result = {
+            'title': None,
+            'author': None,
+            'date': None,
+            'content': '',
+            'wordCount': 0,
+            'method': 'failed'
+        }
+        if errors:
+            result['error'] = '; '.join(errors)
+
+    # Add metadata
+    result['hash'] = calculate_hash(result.get('content', ''))
+    result['extractedAt'] = datetime.utcnow().isoformat() + 'Z'
+    result['rawHash'] = page.raw_hash if page is not None else None
+    result['hashAlgorithm'] = HASH_ALGORITHM
+    result['url'] = url
+    result['timings'] = timings
+    if page is not None and store is not None:
+        store.put(page.raw_hash, result)
+    return result
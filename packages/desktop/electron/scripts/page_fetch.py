@@ -0,0 +1,176 @@
+"""
+Fetch stage for extract-text.py.
+
+The page is downloaded once and the raw bytes are handed to every
+extractor in the chain, instead of each extractor fetching the URL
+itself (a BeautifulSoup fallback used to mean a second full download).
+
+Conditional requests (see http_cache.py) pass extra headers; a 304 Not
+Modified comes back as a FetchedPage with an empty body.
+
+Memory per page is bounded:
+- Content-Type is checked before the body is read; PDFs, videos and
+  other non-HTML responses are abandoned unread (without a Content-Type
+  the first chunk must look like markup)
+- The body is streamed in chunks up to max_bytes; a larger Content-Length
+  is refused up front, and a body that grows past the cap is abandoned
+- The charset comes from the Content-Type header or a <meta> tag in the
+  first bytes, and the body is decoded once and shared by the extractors
+- The raw bytes are hashed (content_hash.py) chunk by chunk as they arrive
+
+Per CLAUDE.md/lilbits.md: Scripts under 300 LOC, single focused purpose.
+"""
+
+import codecs
+import re
+import time
+from typing import Dict, Optional, Tuple
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from content_hash import hash_bytes, new_hasher, short_digest
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (compatible; AUArchive/1.0)'
+DEFAULT_TIMEOUT = 30
+DEFAULT_MAX_BYTES = 20 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+HTML_TYPES = ('text/html', 'application/xhtml+xml', 'application/xml', 'text/xml', 'text/plain')
+
+# Where browsers look for <meta charset>; the spec says 1024, real pages
+# often put it a little later
+META_SNIFF_BYTES = 4096
+META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([A-Za-z0-9_.:-]+)', re.I)
+
+
+class FetchError(Exception):
+    """The page could not be downloaded."""
+
+
+def _usable_charset(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def looks_like_markup(chunk: bytes) -> bool:
+    """Whether the start of an untyped body is plausibly HTML/XML."""
+    head = chunk[:1024]
+    return b'\x00' not in head and head.lstrip(b'\xef\xbb\xbf \t\r\n').startswith(b'<')
+
+
+class FetchedPage:
+    """Raw page bytes plus what extractors need to interpret them."""
+
+    def __init__(self, url: str, final_url: str, status: int, headers: Dict[str, str], body: bytes, fetch_ms: float,
+                 raw_hash: Optional[str] = None):
+        self.url = url
+        self.final_url = final_url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.fetch_ms = fetch_ms
+        self._raw_hash = raw_hash
+        self._charset = False  # not looked up yet
+        self._text: Optional[str] = None
+
+    @property
+    def not_modified(self) -> bool:
+        """The server answered a conditional request with 304."""
+        return self.status == 304
+
+    @property
+    def raw_hash(self) -> str:
+        """Hash of the body bytes (see content_hash.py)."""
+        if self._raw_hash is None:
+            self._raw_hash = hash_bytes(self.body)
+        return self._raw_hash
+
+    @property
+    def charset(self) -> Optional[str]:
+        """Declared charset: Content-Type header, else a <meta> tag, else None."""
+        if self._charset is False:
+            declared = None
+            for param in self.headers.get('content-type', '').split(';')[1:]:
+                name, _, value = param.strip().partition('=')
+                if name.lower() == 'charset' and value:
+                    declared = _usable_charset(value.strip('"\' '))
+            if declared is None:
+                match = META_CHARSET_PATTERN.search(self.body, 0, META_SNIFF_BYTES)
+                declared = _usable_charset(match.group(1).decode('ascii')) if match else None
+            self._charset = declared
+        return self._charset
+
+    def text(self) -> str:
+        """Body decoded with the declared charset (UTF-8 otherwise), once."""
+        if self._text is None:
+            self._text = self.body.decode(self.charset or 'utf-8', errors='replace')
+        return self._text
+
+
+def _read_capped(response, max_bytes: int) -> Tuple[bytes, str]:
+    length = response.headers.get('Content-Length')
+    if length and length.isdigit() and int(length) > max_bytes:
+        raise FetchError(f"Page too large: {int(length)} bytes (limit {max_bytes})")
+
+    content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+    if content_type and content_type not in HTML_TYPES:
+        raise FetchError(f"Not an HTML page: {content_type}")
+
+    chunks = []
+    size = 0
+    hasher = new_hasher()
+    while True:
+        chunk = response.read(CHUNK_SIZE)
+        if not chunk:
+            return b''.join(chunks), short_digest(hasher)
+        if not chunks and not content_type and not looks_like_markup(chunk):
+            raise FetchError("Not an HTML page: no Content-Type and body is not markup")
+        size += len(chunk)
+        if size > max_bytes:
+            raise FetchError(f"Page too large: over {max_bytes} bytes")
+        hasher.update(chunk)
+        chunks.append(chunk)
+
+
+def fetch_page(
+    url: str,
+    timeout: float = DEFAULT_TIMEOUT,
+    headers: Optional[Dict[str, str]] = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> FetchedPage:
+    """
+    Download a page once, streaming at most max_bytes.
+
+    Args:
+        url: Page URL
+        timeout: Socket timeout in seconds
+        headers: Extra request headers (e.g. If-None-Match)
+        max_bytes: Largest body accepted
+
+    Raises:
+        FetchError: HTTP error status, network failure, non-HTML content
+            or a body over max_bytes
+    """
+    request = Request(url, headers={
+        'User-Agent': USER_AGENT,
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        **(headers or {}),
+    })
+    start = time.perf_counter()
+    try:
+        with urlopen(request, timeout=timeout) as response:
+            body, raw_hash = _read_capped(response, max_bytes)
+            response_headers = {name.lower(): value for name, value in response.headers.items()}
+            return FetchedPage(url, response.geturl(), response.status, response_headers, body,
+                               round((time.perf_counter() - start) * 1000, 1), raw_hash)
+    except HTTPError as e:
+        if e.code == 304:
+            response_headers = {name.lower(): value for name, value in e.headers.items()}
+            return FetchedPage(url, url, 304, response_headers, b'', round((time.perf_counter() - start) * 1000, 1))
+        raise FetchError(f"HTTP {e.code}: {e.reason}") from e
+    except (URLError, OSError) as e:
+        raise FetchError(f"Fetch error: {getattr(e, 'reason', e)}") from e
@@ -0,0 +1,85 @@
+"""
+BeautifulSoup parser choice and single-pass cleanup.
+
+The BeautifulSoup fallbacks in both extract-text.py copies used Python's
+html.parser, the slowest backend, and then walked the whole tree once per
+cleanup rule (a find_all for the unwanted tags and, in the Electron copy,
+another with a class regex over every element). Pages reach the fallback
+exactly when Trafilatura gave up, which tends to be the large, messy ones.
+
+- parser_for(): the requested backend, else lxml when installed, else
+  html.parser
+- prune(): removes unwanted tags and class matches in one traversal,
+  never descending into a subtree that is being removed; the resulting
+  tree is the same as the per-rule loops produced
+
+Per CLAUDE.md/lilbits.md: Scripts under 300 LOC, single focused purpose.
+"""
+
+from typing import Iterable, Optional, Pattern
+
+try:
+    from bs4 import Tag
+    HAS_BEAUTIFULSOUP = True
+except ImportError:
+    HAS_BEAUTIFULSOUP = False
+
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    import html5lib  # noqa: F401
+    HAS_HTML5LIB = True
+except ImportError:
+    HAS_HTML5LIB = False
+
+PARSERS = ('lxml', 'html.parser', 'html5lib')
+DEFAULT_PARSER = 'lxml' if HAS_LXML else 'html.parser'
+
+
+def parser_for(name: Optional[str] = None) -> str:
+    """
+    BeautifulSoup parser name to use.
+
+    Raises:
+        ValueError: Unknown or unavailable parser
+    """
+    name = name or DEFAULT_PARSER
+    if name not in PARSERS:
+        raise ValueError(f"Unknown HTML parser '{name}', expected one of {', '.join(PARSERS)}")
+    if (name == 'lxml' and not HAS_LXML) or (name == 'html5lib' and not HAS_HTML5LIB):
+        raise ValueError(f"HTML parser '{name}' is not installed: pip install {name}")
+    return name
+
+
+def prune(root, names: Iterable[str], class_pattern: Optional[Pattern] = None) -> int:
+    """
+    Decompose every element under root whose tag is in names or any of
+    whose classes matches class_pattern, in a single traversal.
+
+    Returns:
+        Number of subtrees removed
+    """
+    names = frozenset(names)
+    removed = 0
+    stack = [child for child in reversed(root.contents) if isinstance(child, Tag)]
+    while stack:
+        element = stack.pop()
+        if element.name in names or (class_pattern is not None and _class_matches(element, class_pattern)):
+            element.decompose()
+            removed += 1
+            continue
+        stack.extend(child for child in reversed(element.contents) if isinstance(child, Tag))
+    return removed
+
+
+def _class_matches(element, pattern: Pattern) -> bool:
+    classes = element.attrs.get('class')
+    if not classes:
+        return False
+    if isinstance(classes, str):
+        return pattern.search(classes) is not None
+    return any(pattern.search(value) for value in classes) or pattern.search(' '.join(classes)) is not None
@@ -0,0 +1,94 @@
+import importlib.util
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# The scripts are run from their own directory
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+
+def load_extract_text():
+    """Import extract-text.py (hyphenated, so not importable by name)."""
+    spec = importlib.util.spec_from_file_location('extract_text', SCRIPTS_DIR / 'extract-text.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+ARTICLE = """<!DOCTYPE html>
+<html><head><title>{title}</title><meta name="author" content="Jane Doe"></head>
+<body><nav>Home | About</nav>
+<article><h1>{title}</h1>
+<p>The Hudson River State Hospital was built in 1871 and operated for more than a century
+before it closed its doors to patients in 2003 after decades of declining use.</p>
+<p>Local historians documented the buildings extensively before parts of the campus were
+demolished, and their photographs remain the best record of the interior spaces.</p>
+<p>Redevelopment plans for the site were announced in 2013 and revised several times.</p>
+</article><footer>Copyright</footer></body></html>"""
+
+
+class PageServer:
+    """
+    Local HTTP server for extraction tests.
+
+    pages maps a path to (status, headers, body); every request is logged
+    and the peak number of requests in flight is tracked.
+    """
+
+    def __init__(self):
+        self.pages = {}
+        self.requests = []
+        self.delay_s = 0.0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server._lock:
+                    server.active += 1
+                    server.max_active = max(server.max_active, server.active)
+                    server.requests.append((self.path, dict(self.headers)))
+                try:
+                    time.sleep(server.delay_s)
+                    status, headers, body = server.pages.get(self.path, (404, {}, b'not found'))
+                    if callable(body):
+                        status, headers, body = body(self)
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with server._lock:
+                        server.active -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base = f'http://127.0.0.1:{self.httpd.server_address[1]}'
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def add_article(self, path: str, title: str = 'Hudson River State Hospital', headers=None):
+        headers = {'Content-Type': 'text/html; charset=utf-8', **(headers or {})}
+        self.pages[path] = (200, headers, ARTICLE.format(title=title).encode('utf-8'))
+        return self.base + path
+
+    def hits(self, path: str) -> int:
+        return sum(1 for p, _ in self.requests if p == path)
+
+
+@pytest.fixture
+def page_server():
+    server = PageServer()
+    yield server
+    server.httpd.shutdown()
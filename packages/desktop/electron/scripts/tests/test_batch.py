@@ -0,0 +1,63 @@
+import json
+import subprocess
+import sys
+import threading
+import time
+
+from conftest import SCRIPTS_DIR
+from extract_batch import parse_jobs, run_batch
+
+
+def test_parse_jobs_accepts_tabs_spaces_and_comments():
+    lines = ['# session', '', 'http://a/1\t/tmp/out 1.json', 'http://b/2 /tmp/b.json', 'http://c/3']
+    assert parse_jobs(lines) == [
+        ('http://a/1', '/tmp/out 1.json'), ('http://b/2', '/tmp/b.json'), ('http://c/3', None)]
+
+
+def test_per_host_limit_does_not_block_other_hosts():
+    active = {}
+    peak = {}
+    lock = threading.Lock()
+
+    def extract(url):
+        host = url.split('/')[2]
+        with lock:
+            active[host] = active.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), active[host])
+        time.sleep(0.05)
+        with lock:
+            active[host] -= 1
+        if url.endswith('boom'):
+            raise ValueError('boom')
+        return {'method': 'trafilatura', 'wordCount': 3}
+
+    jobs = [(f'http://slow/{i}', None) for i in range(8)] + [('http://other/1', None), ('http://other/boom', None)]
+    statuses = run_batch(jobs, extract, concurrency=6, per_host=2)
+    assert peak == {'slow': 2, 'other': 2}
+    assert [s['url'] for s in statuses] == [url for url, _ in jobs]
+    assert statuses[-1]['ok'] is False and 'boom' in statuses[-1]['error']
+    assert all(s['ok'] for s in statuses[:-1])
+
+
+def test_batch_cli_against_local_server(page_server, tmp_path):
+    page_server.delay_s = 0.1
+    urls = [page_server.add_article(f'/article/{i}', title=f'Article {i}') for i in range(5)]
+    jobs = [f'{url}\t{tmp_path / f"{i}.json"}' for i, url in enumerate(urls)]
+    jobs.append(f'{page_server.base}/missing\t{tmp_path / "missing.json"}')
+
+    proc = subprocess.run(
+        [sys.executable, str(SCRIPTS_DIR / 'extract-text.py'), '--batch', '-', '--per-host', '2'],
+        input='\n'.join(jobs), capture_output=True, text=True, timeout=120,
+    )
+    assert proc.returncode == 0, proc.stderr
+    statuses = {s['url']: s for s in map(json.loads, proc.stdout.splitlines())}
+    assert len(statuses) == 6
+    assert page_server.max_active <= 2
+
+    for i, url in enumerate(urls):
+        assert statuses[url]['ok'], statuses[url]
+        result = json.loads((tmp_path / f'{i}.json').read_text())
+        assert 'built in 1871' in result['content']
+
+    missing = statuses[f'{page_server.base}/missing']
+    assert not missing['ok'] and '404' in missing['error']
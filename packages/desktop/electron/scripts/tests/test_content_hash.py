@@ -0,0 +1,55 @@
+import pytest
+
+import page_extract
+from conftest import ARTICLE, load_extract_text
+from content_hash import HASH_ALGORITHM, HashStore
+from offline_extract import extract_file
+from page_fetch import CHUNK_SIZE, fetch_page
+
+extract_text = load_extract_text()
+
+
+def test_hashes_follow_the_blake3_contract(page_server):
+    blake3 = pytest.importorskip('blake3')
+    body = (ARTICLE.format(title='Big Page') + '<!--' + 'x' * (3 * CHUNK_SIZE) + '-->').encode('utf-8')
+    page_server.pages['/big'] = (200, {'Content-Type': 'text/html'}, body)
+
+    page = fetch_page(page_server.base + '/big')
+    assert page.raw_hash == blake3.blake3(body).hexdigest()[:16]
+
+    result = extract_text.extract_url(page_server.base + '/big')
+    assert HASH_ALGORITHM == 'blake3' and result['hashAlgorithm'] == 'blake3'
+    assert result['rawHash'] == page.raw_hash
+    assert result['hash'] == blake3.blake3(result['content'].encode('utf-8')).hexdigest()[:16]
+
+
+def test_identical_pages_reuse_the_stored_result(page_server, tmp_path, monkeypatch):
+    first_url = page_server.add_article('/original')
+    mirror_url = page_server.add_article('/mirror')
+    store = HashStore(str(tmp_path))
+
+    first = extract_text.extract_url(first_url, store=store)
+    assert 'deduplicated' not in first
+
+    monkeypatch.setattr(page_extract, 'extract_with_trafilatura', lambda page, errors=None: pytest.fail('extracted'))
+    mirror = extract_text.extract_url(mirror_url, store=store)
+    assert mirror['deduplicated'] is True and mirror['duplicateOf'] == first_url
+    assert mirror['url'] == mirror_url
+    assert mirror['content'] == first['content'] and mirror['hash'] == first['hash']
+
+    # A different page is still extracted
+    monkeypatch.undo()
+    other = extract_text.extract_url(page_server.add_article('/other', title='Another Page'), store=store)
+    assert 'deduplicated' not in other and other['rawHash'] != first['rawHash']
+
+
+def test_offline_copies_are_extracted_once(tmp_path):
+    page = ARTICLE.format(title='Saved Twice').encode('utf-8')
+    (tmp_path / 'a.html').write_bytes(page)
+    (tmp_path / 'b.html').write_bytes(page)
+    store_dir = str(tmp_path / 'store')
+
+    first = extract_file(str(tmp_path / 'a.html'), store_dir)[0]
+    second = extract_file(str(tmp_path / 'b.html'), store_dir)[0]
+    assert 'deduplicated' not in first and second['deduplicated'] is True
+    assert second['source'].endswith('b.html') and second['rawHash'] == first['rawHash']
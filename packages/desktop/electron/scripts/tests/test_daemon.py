@@ -0,0 +1,38 @@
+import json
+import subprocess
+import sys
+
+from conftest import SCRIPTS_DIR
+
+RESULT_FIELDS = {'title', 'author', 'date', 'content', 'wordCount', 'method', 'hash', 'extractedAt'}
+
+
+def test_worker_mode_answers_concurrent_requests(page_server, tmp_path):
+    page_server.delay_s = 0.3
+    urls = [page_server.add_article(f'/a/{i}') for i in range(3)]
+    requests = [{'id': 'ping', 'op': 'ping'}, 'not json']
+    requests += [{'id': str(i), 'url': url} for i, url in enumerate(urls)]
+    requests.append({'id': 'file', 'url': urls[0], 'outputPath': str(tmp_path / 'out.json')})
+    requests.append({'id': 'bad'})
+    requests.append({'op': 'shutdown'})
+    stdin = '\n'.join(r if isinstance(r, str) else json.dumps(r) for r in requests) + '\n'
+
+    proc = subprocess.run(
+        [sys.executable, str(SCRIPTS_DIR / 'extract-text.py'), '--serve', '--concurrency', '4'],
+        input=stdin, capture_output=True, text=True, timeout=120,
+    )
+    assert proc.returncode == 0, proc.stderr
+    lines = [json.loads(line) for line in proc.stdout.splitlines()]
+    assert lines[0]['event'] == 'ready'
+    by_id = {line.get('id'): line for line in lines[1:]}
+
+    assert by_id['ping']['op'] == 'pong'
+    assert 'Invalid request' in by_id[None]['error']
+    assert by_id['bad'] == {'id': 'bad', 'ok': False, 'error': 'url is required'}
+    for i in range(3):
+        assert by_id[str(i)]['ok']
+        assert RESULT_FIELDS <= set(by_id[str(i)]['result'])
+    assert json.loads((tmp_path / 'out.json').read_text())['content'] == by_id['file']['result']['content']
+
+    # Handled concurrently, not one after another
+    assert page_server.max_active >= 2
@@ -0,0 +1,22 @@
+import page_extract
+from conftest import load_extract_text
+
+extract_text = load_extract_text()
+
+
+def test_fallback_reuses_the_single_download(page_server, monkeypatch):
+    url = page_server.add_article('/page')
+    monkeypatch.setattr(page_extract, 'extract_with_trafilatura', lambda page, errors=None: None)
+
+    result = extract_text.extract_url(url)
+    assert result['method'] == 'beautifulsoup'
+    assert 'built in 1871' in result['content']
+    assert page_server.hits('/page') == 1
+    assert result['timings']['fetchMs'] > 0 and result['timings']['extractMs'] > 0
+
+
+def test_fetch_error_is_reported_without_extracting(page_server):
+    result = extract_text.extract_url(page_server.base + '/gone')
+    assert result['method'] == 'failed'
+    assert result['error'] == 'HTTP 404: Not Found'
+    assert page_server.hits('/gone') == 1
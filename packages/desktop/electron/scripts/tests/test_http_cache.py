@@ -0,0 +1,75 @@
+import os
+
+import page_extract
+from conftest import ARTICLE, load_extract_text
+from http_cache import HttpCache
+
+extract_text = load_extract_text()
+
+BODY = ARTICLE.format(title='Hudson River State Hospital').encode('utf-8')
+
+
+def etag_page(etag):
+    """Page that honours If-None-Match for the current etag."""
+    def respond(handler):
+        if handler.headers.get('If-None-Match') == etag[0]:
+            return 304, {'ETag': etag[0]}, b''
+        return 200, {'Content-Type': 'text/html; charset=utf-8', 'ETag': etag[0]}, BODY
+    return respond
+
+
+def test_unchanged_page_is_not_extracted_again(page_server, tmp_path, monkeypatch):
+    etag = ['"v1"']
+    page_server.pages['/page'] = (200, {}, etag_page(etag))
+    cache = HttpCache(str(tmp_path))
+
+    first = extract_text.extract_url(page_server.base + '/page', cache=cache)
+    assert first['method'] == 'trafilatura' and 'notModified' not in first
+
+    calls = []
+    monkeypatch.setattr(page_extract, 'extract_with_trafilatura', lambda page, errors=None: calls.append(page))
+    second = extract_text.extract_url(page_server.base + '/page', cache=cache)
+    assert second['notModified'] is True
+    assert second['content'] == first['content'] and second['hash'] == first['hash']
+    assert calls == []
+    assert page_server.requests[-1][1].get('If-None-Match') == '"v1"'
+
+    # A changed page is downloaded and extracted again
+    monkeypatch.undo()
+    etag[0] = '"v2"'
+    third = extract_text.extract_url(page_server.base + '/page', cache=cache)
+    assert 'notModified' not in third
+    assert cache.get(page_server.base + '/page').validators == {'etag': '"v2"'}
+    assert cache.stats()['notModified'] == 1
+
+
+def test_last_modified_is_sent_back(page_server, tmp_path):
+    url = page_server.add_article('/dated', headers={'Last-Modified': 'Wed, 01 Jan 2025 00:00:00 GMT'})
+    cache = HttpCache(str(tmp_path))
+    extract_text.extract_url(url, cache=cache)
+    extract_text.extract_url(url, cache=cache)
+    assert page_server.requests[-1][1].get('If-Modified-Since') == 'Wed, 01 Jan 2025 00:00:00 GMT'
+
+
+def test_pages_without_validators_or_content_are_not_stored(page_server, tmp_path):
+    cache = HttpCache(str(tmp_path))
+    extract_text.extract_url(page_server.add_article('/plain'), cache=cache)
+    extract_text.extract_url(page_server.base + '/missing', cache=cache)
+    assert cache.stats()['entries'] == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    result = {'method': 'trafilatura', 'content': 'x' * 200}
+    cache = HttpCache(str(tmp_path), max_bytes=700)
+    for i, url in enumerate(['http://a/1', 'http://a/2', 'http://a/3']):
+        cache.put(url, {'etag': f'"{i}"'}, result)
+        # mtime resolution can be coarse; make the order explicit
+        os.utime(cache._path(cache._key(url)), (i, i))
+    assert cache.stats()['entries'] == 2
+    assert cache.get('http://a/1') is None
+
+    os.utime(cache._path(cache._key('http://a/2')), (10, 10))
+    cache.put('http://a/4', {'etag': '"4"'}, result)
+    assert cache.get('http://a/2') is not None
+    assert cache.get('http://a/3') is None
+    assert cache.stats()['evictions'] == 2
@@ -0,0 +1,95 @@
+import gzip
+import io
+import json
+import subprocess
+import sys
+
+from conftest import ARTICLE, SCRIPTS_DIR
+from offline_extract import extract_file, find_inputs, run_offline_mode
+
+
+def article(title):
+    return ARTICLE.format(title=title).encode('utf-8')
+
+
+def warc_record(warc_type, uri, block, content_type='application/http; msgtype=response'):
+    headers = (f'WARC/1.1\r\nWARC-Type: {warc_type}\r\nWARC-Target-URI: {uri}\r\n'
+               f'Content-Type: {content_type}\r\nContent-Length: {len(block)}\r\n\r\n')
+    return headers.encode('latin-1') + block + b'\r\n\r\n'
+
+
+def http_response(body, status='200 OK', headers=None):
+    lines = [f'HTTP/1.1 {status}'] + [f'{name}: {value}' for name, value in (headers or {}).items()]
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+
+
+def chunked(body, size=100):
+    parts = [b'%x\r\n%s\r\n' % (len(body[i:i + size]), body[i:i + size]) for i in range(0, len(body), size)]
+    return b''.join(parts) + b'0\r\n\r\n'
+
+
+def sample_warc():
+    return [
+        warc_record('warcinfo', '', b'software: test', 'application/warc-fields'),
+        warc_record('request', 'https://example.com/a', b'GET /a HTTP/1.1\r\n\r\n', 'application/http; msgtype=request'),
+        warc_record('response', 'https://example.com/a', http_response(
+            chunked(article('Chunked Article')),
+            headers={'Content-Type': 'text/html; charset=utf-8', 'Transfer-Encoding': 'chunked'})),
+        warc_record('response', 'https://example.com/logo.png', http_response(
+            b'\x89PNG' + b'\0' * 5000, headers={'Content-Type': 'image/png'})),
+        warc_record('response', 'https://example.com/missing', http_response(
+            article('Not Found'), status='404 Not Found', headers={'Content-Type': 'text/html'})),
+        warc_record('response', 'https://example.com/b', http_response(
+            gzip.compress(article('Gzipped Article')),
+            headers={'Content-Type': 'text/html', 'Content-Encoding': 'gzip'})),
+    ]
+
+
+def test_warc_html_responses_are_extracted(tmp_path):
+    path = tmp_path / 'capture.warc'
+    path.write_bytes(b''.join(sample_warc()))
+    results = extract_file(str(path))
+    assert [r['url'] for r in results] == ['https://example.com/a', 'https://example.com/b']
+    assert [r['content'].split(' The ')[0] for r in results] == ['Chunked Article', 'Gzipped Article']
+    assert all('built in 1871' in r['content'] and r['source'] == str(path) for r in results)
+
+
+def test_gzipped_warc_with_one_member_per_record(tmp_path):
+    path = tmp_path / 'capture.warc.gz'
+    path.write_bytes(b''.join(gzip.compress(record) for record in sample_warc()))
+    assert [r['content'].split(' The ')[0] for r in extract_file(str(path))] == ['Chunked Article', 'Gzipped Article']
+
+
+def test_unreadable_files_give_one_failed_line(tmp_path):
+    (tmp_path / 'broken.warc').write_bytes(b'not a warc\r\n')
+    (tmp_path / 'empty.warc.gz').write_bytes(b'')
+    assert extract_file(str(tmp_path / 'broken.warc'))[0]['method'] == 'failed'
+    assert extract_file(str(tmp_path / 'empty.warc.gz')) == []
+
+
+def test_directory_tree_in_process(tmp_path):
+    (tmp_path / 'site' / 'deep').mkdir(parents=True)
+    (tmp_path / 'site' / 'page.html').write_bytes(article('Saved Page'))
+    (tmp_path / 'site' / 'deep' / 'capture.warc').write_bytes(b''.join(sample_warc()))
+    (tmp_path / 'site' / 'notes.txt').write_text('ignored')
+    assert [p.rsplit('/', 1)[-1] for p in find_inputs([str(tmp_path / 'site')])] == ['capture.warc', 'page.html']
+
+    out = io.StringIO()
+    assert run_offline_mode([str(tmp_path / 'site')], jobs=1, out=out) == 0
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    headings = sorted(line['content'].split(' The ')[0] for line in lines)
+    assert headings == ['Chunked Article', 'Gzipped Article', 'Saved Page']
+    saved = next(line for line in lines if line['content'].startswith('Saved Page'))
+    assert saved['url'].startswith('file://') and saved['method'] == 'trafilatura'
+
+
+def test_offline_cli_with_worker_processes(tmp_path):
+    for i in range(4):
+        (tmp_path / f'page{i}.html').write_bytes(article(f'Page {i}'))
+    proc = subprocess.run(
+        [sys.executable, str(SCRIPTS_DIR / 'extract-text.py'), '--offline', str(tmp_path), '--jobs', '2'],
+        capture_output=True, text=True, timeout=120, cwd=SCRIPTS_DIR,
+    )
+    assert proc.returncode == 0, proc.stderr
+    headings = sorted(json.loads(line)['content'].split(' The ')[0] for line in proc.stdout.splitlines())
+    assert headings == [f'Page {i}' for i in range(4)]
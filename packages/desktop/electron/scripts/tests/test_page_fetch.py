@@ -0,0 +1,57 @@
+import pytest
+
+from page_fetch import CHUNK_SIZE, FetchError, _read_capped, fetch_page
+
+
+def test_non_html_is_refused_before_the_body_is_read(page_server):
+    page_server.pages['/file.pdf'] = (200, {'Content-Type': 'application/pdf'}, b'%PDF-1.7' + b'\0' * 100_000)
+    with pytest.raises(FetchError, match='Not an HTML page: application/pdf'):
+        fetch_page(page_server.base + '/file.pdf')
+
+
+def test_untyped_body_must_look_like_markup(page_server):
+    page_server.pages['/blob'] = (200, {}, b'\x89PNG\r\n\x1a\n' + b'\0' * 100)
+    page_server.pages['/untyped'] = (200, {}, b'\n  <!DOCTYPE html><p>ok</p>')
+    with pytest.raises(FetchError, match='not markup'):
+        fetch_page(page_server.base + '/blob')
+    assert fetch_page(page_server.base + '/untyped').body.endswith(b'<p>ok</p>')
+
+
+def test_byte_cap(page_server):
+    page_server.pages['/big'] = (200, {'Content-Type': 'text/html'}, b'<p>' + b'x' * 300_000)
+    with pytest.raises(FetchError, match='Page too large: 300003 bytes'):
+        fetch_page(page_server.base + '/big', max_bytes=100_000)
+    assert len(fetch_page(page_server.base + '/big', max_bytes=400_000).body) == 300_003
+
+
+def test_byte_cap_without_content_length():
+    class Response:
+        headers = {'Content-Type': 'text/html'}
+
+        def __init__(self):
+            self.reads = 0
+
+        def read(self, size):
+            self.reads += 1
+            return b'<p>' + b'x' * (size - 3)
+
+    response = Response()
+    with pytest.raises(FetchError, match='over'):
+        _read_capped(response, 3 * CHUNK_SIZE)
+    assert response.reads == 4
+
+
+@pytest.mark.parametrize('headers, body, expected', [
+    ({'Content-Type': 'text/html; charset=ISO-8859-1'}, '<p>café</p>'.encode('latin-1'), 'iso8859-1'),
+    ({'Content-Type': 'text/html'}, '<meta charset="windows-1252"><p>café</p>'.encode('cp1252'), 'cp1252'),
+    ({'Content-Type': 'text/html'},
+     '<meta http-equiv="Content-Type" content="text/html; charset=koi8-r"><p>ж</p>'.encode('koi8-r'), 'koi8-r'),
+    ({'Content-Type': 'text/html; charset=bogus'}, '<p>café</p>'.encode('utf-8'), None),
+])
+def test_charset_from_header_or_meta(page_server, headers, body, expected):
+    page_server.pages['/page'] = (200, headers, body)
+    page = fetch_page(page_server.base + '/page')
+    assert page.charset == expected
+    text = page.text()
+    assert 'café' in text or 'ж' in text
+    assert page.text() is text
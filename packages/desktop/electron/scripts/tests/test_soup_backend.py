@@ -0,0 +1,54 @@
+import re
+
+import pytest
+from bs4 import BeautifulSoup
+
+import page_extract
+from page_fetch import FetchedPage
+from soup_backend import HAS_LXML, parser_for, prune
+
+PAGE = """<html><head><title>Mill Street Bridge</title><style>p {}</style></head><body>
+<header class="site-header"><nav>Home</nav></header>
+<div class="sidebar"><p>Popular posts</p><script>track()</script></div>
+<div class="post-content">
+  <p>The bridge was <b class="highlight">built in 1912</b> and closed in 1987.</p>
+  <div class="share-buttons social"><a>Share</a></div>
+  <p class="shadow">Shadowed paragraph</p>
+  <aside><div class="menu">Nested in a removed subtree</div></aside>
+</div>
+<footer>Copyright</footer></body></html>"""
+
+CLASS_PATTERN = re.compile(r'(sidebar|menu|nav|ad|cookie|popup|modal|share|social)', re.I)
+TAGS = ('script', 'style', 'nav', 'footer', 'header', 'aside', 'noscript')
+
+
+def per_rule(soup):
+    for tag in soup(list(TAGS)):
+        tag.decompose()
+    for element in soup.find_all(class_=CLASS_PATTERN):
+        element.decompose()
+
+
+def test_single_pass_matches_per_rule_cleanup():
+    expected = BeautifulSoup(PAGE, 'html.parser')
+    per_rule(expected)
+    soup = BeautifulSoup(PAGE, 'html.parser')
+    assert prune(soup, TAGS, CLASS_PATTERN) == 7
+    assert str(soup) == str(expected)
+    assert 'built in 1912' in soup.get_text() and 'Shadowed' not in soup.get_text()
+
+
+def test_parser_selection():
+    assert parser_for('html.parser') == 'html.parser'
+    assert parser_for() == ('lxml' if HAS_LXML else 'html.parser')
+    with pytest.raises(ValueError, match='Unknown HTML parser'):
+        parser_for('regex')
+
+
+@pytest.mark.skipif(not HAS_LXML, reason='lxml not installed')
+def test_fallback_gives_the_same_text_with_lxml():
+    page = FetchedPage('', '', 200, {'content-type': 'text/html; charset=utf-8'}, PAGE.encode('utf-8'), 0.0)
+    python = page_extract.extract_with_beautifulsoup(page, parser='html.parser')
+    lxml = page_extract.extract_with_beautifulsoup(page, parser='lxml')
+    assert python == lxml
+    assert python['content'] == 'The bridge was built in 1912 and closed in 1987.'
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Trafilatura Extraction Benchmark
+
+Runs extract_with_trafilatura() from extract-text.py over a directory of
+saved pages and compares it with the previous approach, where each page
+was parsed and extracted three times (text, metadata, HTML). Every page
+must give the same title, author, date, text and HTML either way.
+
+Usage:
+    python3 bench_extract.py saved-pages/
+    python3 bench_extract.py saved-pages/ --repeat 5 --url https://example.com/
+
+Output (one row per page, then totals):
+    page  KB  three-call ms  shared-tree ms  single-pass ms  speedup  parity
+
+`speedup` is three-call over single-pass time. Exits 1 on any parity
+mismatch.
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import time
+
+import trafilatura
+
+FIELDS = ('title', 'author', 'date', 'content', 'html')
+
+
+def load_extract_text():
+    """Import the hyphenated extract-text.py next to this file."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'extract-text.py')
+    spec = importlib.util.spec_from_file_location('extract_text', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def three_calls(html: str, url: str) -> dict:
+    """The previous extraction: every call parses the page again."""
+    result = trafilatura.extract(html, url=url, include_comments=False, include_tables=True,
+                                 include_images=False, include_links=False,
+                                 output_format='txt', with_metadata=True)
+    if not result:
+        return None
+    metadata = trafilatura.extract_metadata(html, default_url=url)
+    html_result = trafilatura.extract(html, url=url, include_comments=False,
+                                      include_tables=True, output_format='html')
+    return {
+        'title': metadata.title if metadata else None,
+        'author': metadata.author if metadata else None,
+        'date': metadata.date if metadata else None,
+        'content': result,
+        'html': html_result or '',
+    }
+
+
+def best_ms(fn, repeat: int) -> float:
+    """Best-of-repeat milliseconds for one call."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def same(a: dict, b: dict) -> bool:
+    if a is None or b is None:
+        return a is b
+    return all(a[field] == b[field] for field in FIELDS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark single-pass trafilatura extraction')
+    parser.add_argument('directory', help='Directory of saved .html/.htm pages')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repeats (best is kept)')
+    parser.add_argument('--url', default='https://example.com/article', help='URL passed to the extractors')
+    args = parser.parse_args()
+
+    extract_text = load_extract_text()
+    if not extract_text.HAS_SINGLE_PASS:
+        print("Single-pass extraction is unavailable with this trafilatura version", file=sys.stderr)
+
+    pages = sorted(name for name in os.listdir(args.directory) if name.lower().endswith(('.html', '.htm')))
+    if not pages:
+        parser.error(f"No .html pages in {args.directory}")
+
+    variants = (
+        lambda html: three_calls(html, args.url),
+        lambda html: extract_text.extract_with_trafilatura(html, args.url, single_pass=False),
+        lambda html: extract_text.extract_with_trafilatura(html, args.url),
+    )
+
+    print(f"{'page':<28} {'KB':>7} {'three-call ms':>13} {'shared-tree ms':>14} "
+          f"{'single-pass ms':>14} {'speedup':>7} {'parity':>6}")
+    totals = [0.0, 0.0, 0.0]
+    mismatches = 0
+    for name in pages:
+        with open(os.path.join(args.directory, name), encoding='utf-8', errors='replace') as f:
+            html = f.read()
+
+        expected = variants[0](html)
+        parity = all(same(variant(html), expected) for variant in variants[1:])
+        mismatches += not parity
+
+        timings = [best_ms(lambda: variant(html), args.repeat) for variant in variants]
+        totals = [total + ms for total, ms in zip(totals, timings)]
+        print(f"{name[:28]:<28} {len(html) / 1024:>7.1f} {timings[0]:>13.2f} {timings[1]:>14.2f} "
+              f"{timings[2]:>14.2f} {timings[0] / timings[2]:>6.2f}x {'ok' if parity else 'DIFF':>6}")
+
+    count = len(pages)
+    print(f"{'mean per page':<28} {'':>7} {totals[0] / count:>13.2f} {totals[1] / count:>14.2f} "
+          f"{totals[2] / count:>14.2f} {totals[0] / totals[2]:>6.2f}x {mismatches:>6}")
+
+    if mismatches:
+        print(f"PARITY MISMATCH on {mismatches} page(s)")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
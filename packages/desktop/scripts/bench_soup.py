@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+BeautifulSoup Fallback Benchmark
+
+Times the BeautifulSoup fallback of both extract-text.py copies (this
+directory's and electron/scripts') over a directory of saved pages:
+
+- legacy: html.parser and one find_all pass per cleanup rule (the
+  previous code)
+- every installed parser backend with the single-pass prune()
+
+Parity: with html.parser, single-pass cleanup must give exactly the
+legacy result (title, author, date, content). Other backends build the
+tree differently for malformed markup, so their text is compared to the
+legacy text and the similarity reported.
+
+Usage:
+    python3 bench_soup.py saved-pages/
+    python3 bench_soup.py saved-pages/ --repeat 5 --parsers lxml html.parser
+
+Output (one row per page and copy, then mean per page):
+    page  copy  KB  legacy ms  <parser> ms...  speedup  parity  <parser> text...
+
+`speedup` is legacy over the default backend (lxml when installed).
+Exits 1 on any html.parser parity mismatch.
+"""
+
+import argparse
+import difflib
+import importlib.util
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ELECTRON_SCRIPTS_DIR = os.path.join(SCRIPTS_DIR, '..', 'electron', 'scripts')
+
+FIELDS = ('title', 'author', 'date', 'content')
+
+
+def load_module(name: str, path: str):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def legacy_prune(root, names, class_pattern=None) -> int:
+    """The previous cleanup: one find_all per rule."""
+    removed = 0
+    for tag in root.find_all(list(names)):
+        tag.decompose()
+        removed += 1
+    if class_pattern is not None:
+        for element in root.find_all(class_=class_pattern):
+            element.decompose()
+            removed += 1
+    return removed
+
+
+@contextmanager
+def pruning_with(module, prune):
+    original = module.prune
+    module.prune = prune
+    try:
+        yield
+    finally:
+        module.prune = original
+
+
+def best_ms(fn, repeat: int) -> float:
+    """Best-of-repeat milliseconds for one call."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def fields(result) -> tuple:
+    return tuple(result.get(field) for field in FIELDS) if result else None
+
+
+def similarity(a, b) -> float:
+    a_text = (a or {}).get('content') or ''
+    b_text = (b or {}).get('content') or ''
+    if a_text == b_text:
+        return 1.0
+    return difflib.SequenceMatcher(None, a_text.split(), b_text.split(), autojunk=False).ratio()
+
+
+def copies():
+    """(name, module, extract(html, parser)) for both extract-text.py copies."""
+    desktop = load_module('desktop_extract_text', os.path.join(SCRIPTS_DIR, 'extract-text.py'))
+    yield 'desktop', desktop, desktop.extract_with_beautifulsoup
+
+    sys.path.insert(0, ELECTRON_SCRIPTS_DIR)
+    import page_extract
+    from page_fetch import FetchedPage
+
+    def electron(html, parser):
+        page = FetchedPage('', '', 200, {'content-type': 'text/html; charset=utf-8'}, html.encode('utf-8'), 0.0)
+        return page_extract.extract_with_beautifulsoup(page, parser=parser)
+
+    yield 'electron', page_extract, electron
+
+
+def main():
+    from soup_backend import DEFAULT_PARSER, PARSERS, parser_for
+
+    available = [name for name in PARSERS if _available(parser_for, name)]
+    parser = argparse.ArgumentParser(description='Benchmark BeautifulSoup parser backends')
+    parser.add_argument('directory', help='Directory of saved .html/.htm pages')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repeats (best is kept)')
+    parser.add_argument('--parsers', nargs='+', choices=available, default=available, help='Backends to time')
+    args = parser.parse_args()
+
+    pages = sorted(name for name in os.listdir(args.directory) if name.lower().endswith(('.html', '.htm')))
+    if not pages:
+        parser.error(f"No .html pages in {args.directory}")
+    default = DEFAULT_PARSER if DEFAULT_PARSER in args.parsers else args.parsers[0]
+
+    print(f"{'page':<24} {'copy':<8} {'KB':>6} {'legacy ms':>9} "
+          + ' '.join(f"{name + ' ms':>15}" for name in args.parsers)
+          + f" {'speedup':>7} {'parity':>6} " + ' '.join(f"{name + ' text':>16}" for name in args.parsers))
+
+    mismatches = 0
+    for copy_name, module, extract in copies():
+        totals = {'legacy': 0.0, **{name: 0.0 for name in args.parsers}}
+        for page_name in pages:
+            with open(os.path.join(args.directory, page_name), encoding='utf-8', errors='replace') as f:
+                html = f.read()
+
+            with pruning_with(module, legacy_prune):
+                legacy = extract(html, 'html.parser')
+                legacy_ms = best_ms(lambda: extract(html, 'html.parser'), args.repeat)
+            results = {name: extract(html, name) for name in args.parsers}
+            timings = {name: best_ms(lambda: extract(html, name), args.repeat) for name in args.parsers}
+
+            parity = fields(extract(html, 'html.parser')) == fields(legacy)
+            mismatches += not parity
+            totals['legacy'] += legacy_ms
+            for name in args.parsers:
+                totals[name] += timings[name]
+
+            print(f"{page_name[:24]:<24} {copy_name:<8} {len(html) / 1024:>6.1f} {legacy_ms:>9.2f} "
+                  + ' '.join(f"{timings[name]:>15.2f}" for name in args.parsers)
+                  + f" {legacy_ms / timings[default]:>6.2f}x {'ok' if parity else 'DIFF':>6} "
+                  + ' '.join(f"{similarity(results[name], legacy):>15.1%} " for name in args.parsers))
+
+        count = len(pages)
+        print(f"{'mean per page':<24} {copy_name:<8} {'':>6} {totals['legacy'] / count:>9.2f} "
+              + ' '.join(f"{totals[name] / count:>15.2f}" for name in args.parsers)
+              + f" {totals['legacy'] / totals[default]:>6.2f}x")
+
+    if mismatches:
+        print(f"PARITY MISMATCH on {mismatches} page(s)")
+    sys.exit(1 if mismatches else 0)
+
+
+def _available(parser_for, name: str) -> bool:
+    try:
+        parser_for(name)
+        return True
+    except ValueError:
+        return False
+
+
+if __name__ == '__main__':
+    main()
@@ -19,6 +19,7 @@ Output (JSON):
     }
 """
 
+import copy
 import sys
 import json
 import re
@@ -32,6 +33,16 @@ try:
 except ImportError:
     HAS_TRAFILATURA = False
 
+# Single-pass extraction uses trafilatura 2.x internals; older versions
+# fall back to separate calls on a shared tree
+try:
+    from trafilatura.core import bare_extraction, determine_returnstring
+    from trafilatura.deduplication import content_fingerprint
+    from trafilatura.settings import Extractor
+    HAS_SINGLE_PASS = True
+except ImportError:
+    HAS_SINGLE_PASS = False
+
 # Try to import beautifulsoup (fallback)
 try:
     from bs4 import BeautifulSoup
@@ -39,9 +50,12 @@ try:
 except ImportError:
     HAS_BS4 = False
 
+from html_text_stream import CHUNK_SIZE, stream_text
+from soup_backend import parser_for, prune
 
-def fetch_url(url: str, timeout: int = 30) -> str:
-    """Fetch URL content with a reasonable user agent."""
+
+def iter_url_chunks(url: str, timeout: int = 30, chunk_size: int = CHUNK_SIZE):
+    """Yield the raw bytes of a URL chunk by chunk, with a reasonable user agent."""
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
@@ -49,17 +63,40 @@ def fetch_url(url: str, timeout: int = 30) -> str:
     }
     request = Request(url, headers=headers)
     with urlopen(request, timeout=timeout) as response:
-        return response.read().decode('utf-8', errors='replace')
+        while True:
+            chunk = response.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
 
 
-def extract_with_trafilatura(html: str, url: str) -> dict:
-    """Extract content using Trafilatura."""
+def fetch_url(url: str, timeout: int = 30) -> str:
+    """Fetch URL content with a reasonable user agent."""
+    return b''.join(iter_url_chunks(url, timeout)).decode('utf-8', errors='replace')
+
+
+def extract_with_trafilatura(html: str, url: str, single_pass: bool = True) -> dict:
+    """
+    Extract content using Trafilatura.
+
+    The page is parsed into one lxml tree. With single_pass (and
+    trafilatura 2.x) the article is extracted once and the text, HTML and
+    metadata are all rendered from that document; otherwise the three
+    trafilatura calls share the parsed tree.
+    """
     if not HAS_TRAFILATURA:
         return None
 
+    tree = trafilatura.load_html(html)
+    if tree is None:
+        return None
+
+    if single_pass and HAS_SINGLE_PASS:
+        return _extract_single_pass(tree, url)
+
     # Extract with metadata
     result = trafilatura.extract(
-        html,
+        tree,
         url=url,
         include_comments=False,
         include_tables=True,
@@ -73,11 +110,11 @@ def extract_with_trafilatura(html: str, url: str) -> dict:
         return None
 
     # Get metadata
-    metadata = trafilatura.extract_metadata(html, url=url)
+    metadata = trafilatura.extract_metadata(tree, default_url=url)
 
     # Also get HTML version
     html_result = trafilatura.extract(
-        html,
+        tree,
         url=url,
         include_comments=False,
         include_tables=True,
@@ -93,17 +130,45 @@ def extract_with_trafilatura(html: str, url: str) -> dict:
     }
 
 
-def extract_with_beautifulsoup(html: str) -> dict:
-    """Extract content using BeautifulSoup (fallback)."""
+def _extract_single_pass(tree, url: str) -> dict:
+    """Run trafilatura's extraction once and render text and HTML from it."""
+    options = Extractor(output_format='txt', comments=False, tables=True, images=False,
+                        links=False, with_metadata=True, url=url)
+    document = bare_extraction(tree, options=options)
+    if not document:
+        return None
+
+    # What trafilatura.extract() adds before rendering text with metadata
+    document.id = None
+    if document.raw_text is not None:
+        document.fingerprint = content_fingerprint(str(document.title) + ' ' + str(document.raw_text))
+
+    # Rendering HTML rewrites the body tree, so it gets its own copy
+    html_options = Extractor(output_format='html', comments=False, tables=True, url=url)
+    html_result = determine_returnstring(copy.deepcopy(document), html_options)
+    result = determine_returnstring(document, options)
+
+    if not result:
+        return None
+
+    return {
+        'title': document.title,
+        'author': document.author,
+        'date': document.date,
+        'content': result,
+        'html': html_result or '',
+    }
+
+
+def extract_with_beautifulsoup(html: str, parser: str = None) -> dict:
+    """Extract content using BeautifulSoup (fallback; parser: see soup_backend.py)."""
     if not HAS_BS4:
         return None
 
-    soup = BeautifulSoup(html, 'html.parser')
+    soup = BeautifulSoup(html, parser_for(parser))
 
-    # Remove scripts, styles, and other non-content elements
-    for tag in soup.find_all(['script', 'style', 'nav', 'header', 'footer',
-                              'aside', 'form', 'iframe', 'noscript']):
-        tag.decompose()
+    # Remove scripts, styles, and other non-content elements (one pass)
+    prune(soup, ['script', 'style', 'nav', 'header', 'footer', 'aside', 'form', 'iframe', 'noscript'])
 
     # Try to find main content area
     main_content = (
@@ -167,23 +232,9 @@ def extract_with_beautifulsoup(html: str) -> dict:
     }
 
 
-def extract_basic(html: str) -> dict:
-    """Basic extraction without any libraries (last resort)."""
-    # Remove all tags
-    text = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL | re.I)
-    text = re.sub(r'<style[^>]*>.*?</style>', '', text, flags=re.DOTALL | re.I)
-    text = re.sub(r'<[^>]+>', ' ', text)
-    text = re.sub(r'&nbsp;', ' ', text)
-    text = re.sub(r'&amp;', '&', text)
-    text = re.sub(r'&lt;', '<', text)
-    text = re.sub(r'&gt;', '>', text)
-    text = re.sub(r'\s+', ' ', text)
-    text = text.strip()
-
-    # Try to extract title from HTML
-    title_match = re.search(r'<title[^>]*>([^<]+)</title>', html, re.I)
-    title = title_match.group(1).strip() if title_match else None
-
+def extract_basic(html) -> dict:
+    """Basic extraction without any libraries (last resort); html may be an iterable of chunks."""
+    title, text = stream_text(html)
     return {
         'title': title,
         'author': None,
@@ -201,6 +252,12 @@ def main():
     url = sys.argv[1]
 
     try:
+        # Without a parser library, stream the page straight into the
+        # basic extractor instead of holding it in memory
+        if not HAS_TRAFILATURA and not HAS_BS4:
+            print(json.dumps(extract_basic(iter_url_chunks(url)), ensure_ascii=False))
+            return
+
         # Fetch the page
         html = fetch_url(url)
 
@@ -215,7 +272,7 @@ def main():
         if not result and HAS_BS4:
             result = extract_with_beautifulsoup(html)
 
-        # 3. Last resort: basic regex extraction
+        # 3. Last resort: basic streaming extraction
         if not result:
             result = extract_basic(html)
 
@@ -0,0 +1,197 @@
+"""
+Streaming HTML-to-text for extract-text.py's last-resort extractor.
+
+extract_basic() used nine full-document re.sub passes, each allocating
+another copy of a possibly multi-MB page. HtmlTextStream is fed the page
+in chunks (straight from the network or a file reader) and produces the
+same text in one pass:
+
+- script and style content is dropped
+- tags become word breaks, comments and doctypes disappear
+- all entities are decoded (the regex version knew four, and decoded
+  &amp;lt; twice)
+- runs of whitespace collapse to one space, across chunk boundaries
+- the first <title> is captured along the way
+
+Only the unfinished tail of a chunk (a split tag, entity or closing
+</script>) is carried over, so memory is the output text plus about one
+chunk, not the page. Unterminated comments are the exception: they are
+held until their --> arrives.
+
+Per CLAUDE.md/lilbits.md: Scripts under 300 LOC, single focused purpose.
+"""
+
+import codecs
+import re
+from html import unescape
+from typing import Iterable, Optional, Tuple, Union
+
+CHUNK_SIZE = 64 * 1024
+
+SKIPPED_TAGS = ('script', 'style')
+
+# Same tag shape the regex extractor removed, plus <!...>/<?...>
+TOKEN_PATTERN = re.compile(r'<[!?][^>]*>|</?[a-zA-Z][^>]*>')
+TAG_START = re.compile(r'<[a-zA-Z/!?]')
+# Markup that changes state; everything between is stripped with one sub()
+SPECIAL_PATTERN = re.compile(r'<!--|<(script|style|title)(?=[\s/>])|</title(?=[\s/>])', re.I)
+SKIP_END = {tag: re.compile(rf'</{tag}[^>]*>', re.I) for tag in SKIPPED_TAGS}
+
+# Longest entity worth holding back for when a chunk ends mid-reference
+MAX_ENTITY = 32
+
+
+class HtmlTextStream:
+    """
+    Incremental HTML to whitespace-collapsed text.
+
+    Feed str chunks with feed() or bytes with feed_bytes(), then close();
+    text and title are complete after close().
+
+    Args:
+        encoding: Charset for feed_bytes()
+    """
+
+    def __init__(self, encoding: str = 'utf-8'):
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        self._tail = ''
+        self._pieces = []
+        self._space = False  # whitespace seen since the last word
+        self._skipping: Optional[str] = None
+        self._in_title = False
+        self._title_parts: Optional[list] = None
+
+    def feed(self, chunk: str):
+        self._tail = self._scan(self._tail + chunk, final=False)
+
+    def feed_bytes(self, chunk: bytes):
+        """Feed raw bytes; multi-byte characters may span chunks."""
+        self.feed(self._decoder.decode(chunk))
+
+    def close(self):
+        self._scan(self._tail + self._decoder.decode(b'', final=True), final=True)
+        self._tail = ''
+
+    @property
+    def text(self) -> str:
+        return ''.join(self._pieces)
+
+    @property
+    def title(self) -> Optional[str]:
+        if self._title_parts is None:
+            return None
+        return ''.join(self._title_parts).strip() or None
+
+    def _scan(self, buffer: str, final: bool) -> str:
+        """Consume buffer; returns the unfinished tail to prepend to the next chunk."""
+        parts = []
+        pos = 0
+        end = len(buffer)
+        while pos < end:
+            if self._skipping:
+                close = SKIP_END[self._skipping].search(buffer, pos)
+                if not close:
+                    # Keep enough to recognise a closing tag split across chunks
+                    if final:
+                        return ''
+                    start = buffer.rfind('<', pos)
+                    return buffer[start:] if start >= 0 and end - start <= 64 else ''
+                pos = close.end()
+                self._skipping = None
+                continue
+
+            special = SPECIAL_PATTERN.search(buffer, pos)
+            stop = special.start() if special else (end if final else self._safe_end(buffer, pos))
+            parts.append(TOKEN_PATTERN.sub(' ', buffer[pos:stop]))
+            if not special:
+                pos = stop
+                break
+
+            pos = self._special(buffer, special, parts, final)
+            if pos is None:
+                self._flush(parts)
+                return buffer[special.start():]  # continues in the next chunk
+
+        self._flush(parts)
+        return buffer[pos:]
+
+    def _safe_end(self, buffer: str, pos: int) -> int:
+        """Where text ending a chunk can be cut without splitting a tag or entity."""
+        end = len(buffer)
+        lt = buffer.rfind('<', pos)
+        if lt >= 0 and buffer.find('>', lt) < 0 and (end - lt < 4 or TAG_START.match(buffer, lt)):
+            end = lt
+        amp = buffer.rfind('&', pos, end)
+        if amp >= 0 and end - amp <= MAX_ENTITY and buffer.find(';', amp, end) < 0:
+            end = amp
+        return end
+
+    def _special(self, buffer: str, special, parts: list, final: bool) -> Optional[int]:
+        """Handle a comment, script/style or title tag; None when it is incomplete."""
+        start = special.start()
+        if special.group(0) == '<!--':
+            close = buffer.find('-->', start + 4)
+            if close < 0:
+                return None if not final else len(buffer)
+            parts.append(' ')
+            return close + 3
+
+        tag = TOKEN_PATTERN.match(buffer, start)
+        if not tag:
+            if not final:
+                return None
+            parts.append(buffer[start:])
+            return len(buffer)
+
+        name = (special.group(1) or '').lower()
+        if name in SKIPPED_TAGS:
+            self._skipping = name  # removed without a word break, as before
+            return tag.end()
+        parts.append(' ')
+        self._flush(parts)
+        if name == 'title' and self._title_parts is None:
+            self._title_parts = []
+            self._in_title = True
+        elif not name:
+            self._in_title = False
+        return tag.end()
+
+    def _flush(self, parts: list):
+        """Decode and collapse collected text into the output, then empty parts."""
+        data = unescape(''.join(parts))
+        parts.clear()
+        if self._in_title:
+            self._title_parts.append(data)
+
+        words = data.split()
+        if not words:
+            self._space = self._space or bool(data)
+            return
+        if self._pieces and (self._space or data[0].isspace()):
+            self._pieces.append(' ')
+        self._pieces.append(' '.join(words))
+        self._space = data[-1].isspace()
+
+
+def stream_text(source: Union[str, bytes, Iterable[Union[str, bytes]]], encoding: str = 'utf-8') -> Tuple[Optional[str], str]:
+    """
+    Title and text of an HTML page, processed chunk by chunk.
+
+    Args:
+        source: The page as one string/bytes, or an iterable of chunks
+        encoding: Charset for bytes input
+
+    Returns:
+        (title or None, whitespace-collapsed text)
+    """
+    parser = HtmlTextStream(encoding)
+    chunks = source
+    if isinstance(source, (str, bytes)):
+        chunks = (source[i:i + CHUNK_SIZE] for i in range(0, len(source), CHUNK_SIZE))
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            parser.feed_bytes(chunk)
+        else:
+            parser.feed(chunk)
+    parser.close()
+    return parser.title, parser.text